@@ -0,0 +1,40 @@
+from fastapi import APIRouter
+from app.services.llm_cache import llm_cache
+from app.services.singleflight import llm_singleflight
+from app.services.llm_scheduler import llm_scheduler
+from app.services.llm_hedging import llm_hedger
+from app.services.llm_retry import llm_retry, openai_breaker
+from app.services.model_router import model_router
+from app.services.user_rate_limit import user_rate_limiter
+from app.services.job_runner import job_runner
+from app.services.idempotency import dedup_stats
+from app.services.session_store import session_store
+from app.services.slack_outbox import slack_outbox
+from app.services.structured_output import structured_output
+from app.services.prefetch import prefetcher
+from app.services.artifacts import session_artifacts
+from app.services.fsm_checkpoint import fsm_checkpointer
+
+router = APIRouter()
+
+@router.get("/metrics")
+async def metrics():
+    # 운영 중 상태 확인용 카운터
+    return {
+        "llm_cache": llm_cache.get_stats(),
+        "llm_singleflight": llm_singleflight.get_stats(),
+        "llm_scheduler": llm_scheduler.get_stats(),
+        "llm_hedging": llm_hedger.get_stats(),
+        "llm_retry": llm_retry.get_stats(),
+        "openai_breaker": openai_breaker.get_stats(),
+        "model_router": model_router.get_stats(),
+        "user_rate_limit": user_rate_limiter.get_stats(),
+        "jobs": job_runner.get_stats(),
+        "slack_dedup": dedup_stats,
+        "sessions": session_store.get_stats(),
+        "slack_outbox": slack_outbox.get_stats(),
+        "structured_output": structured_output.get_stats(),
+        "prefetch": prefetcher.get_stats(),
+        "artifacts": session_artifacts.get_stats(),
+        "fsm_checkpoints": fsm_checkpointer.get_stats()
+    }
@@ -1,9 +1,11 @@
 from slack_bolt.async_app import AsyncApp
-from app.core.config import SLACK_BOT_TOKEN, SLACK_SIGNING_SECRET
+from app.core.config import SLACK_SIGNING_SECRET
+from app.services.http_clients import slack_client
 
 # Slack 앱 초기화 - 인터랙티브 메시지 처리 가능하도록 설정
+# (Web API 호출은 공용 연결 풀을 쓰는 slack_client 사용)
 slack_app = AsyncApp(
-    token=SLACK_BOT_TOKEN,
+    client=slack_client,
     signing_secret=SLACK_SIGNING_SECRET,
     process_before_response=True,
     ignoring_self_events_enabled=True
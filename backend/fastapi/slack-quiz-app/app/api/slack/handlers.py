@@ -1,24 +1,30 @@
-from app.services.study_mode import run_network_learning_fsm, process_level_test_answers, study_advanced_topic, start_interview_session, get_next_interview_question, answer_user_question
+from app.services.study_mode import run_network_learning_fsm, process_level_test_answers, prepare_next_steps, study_advanced_topic, start_interview_session, get_next_interview_question, answer_user_question
 from app.api.slack.app import slack_app
+import asyncio
 import json
 import random
 import re
-import os
-from slack_sdk.web.async_client import AsyncWebClient
 from typing import List, Dict, Any, cast, Tuple
-from app.chains.network_graph_fsm import run_fsm, NetworkGraphState
-from app.services.study_mode import run_network_learning_fsm as original_run_network_learning_fsm
+from app.chains.network_graph_fsm import run_fsm, NetworkGraphState, stream_quiz_questions, create_interview_questions, extract_topic_tags, stream_tag_explanations
+from app.core.config import TAG_EXPLAIN_ALL, TAG_EXPLAIN_ORDERED
+from app.services.llm_scheduler import current_user_id
+from app.services.user_rate_limit import user_rate_limiter
+from app.services.job_runner import job_runner
+from app.services.idempotency import is_duplicate_event, is_duplicate_action
+from app.services.session_store import session_store
+from app.services.slack_outbox import slack_outbox
+from app.services.message_composer import MessageComposer, section
+from app.services.slack_stream import SlackStreamWriter
+from app.services.http_clients import slack_client
+from app.services.prefetch import prefetcher
+from app.services.artifacts import session_artifacts, artifact_key, stored_artifact
+from app.services.fsm_checkpoint import fsm_checkpointer
+import math
 import logging
 
 # 로깅 설정
 logger = logging.getLogger(__name__)
 
-# 클라이언트 인스턴스 생성
-slack_client = AsyncWebClient(token=os.environ.get("SLACK_BOT_TOKEN"))
-
-# 사용자별 상태 저장
-user_state = {}
-
 # 유효한 주제 정의 (주제 = [태그 리스트])
 VALID_TOPICS = {
     "네트워크": [
@@ -50,6 +56,295 @@ class LearningMode:
     INTERVIEW = "interview"
     NONE = "none"
 
+# 수준 테스트/퀴즈 문제 하나를 표시하는 블록 (문제, 보기, 버튼)
+def question_blocks(i, q):
+    if q["type"] == "OX":
+        # OX 문제는 버튼으로 처리
+        return [
+            section(f"*{i+1}. [OX 문제]*\n{q['question_text']}"),
+            {
+                "type": "actions",
+                "block_id": f"ox_question_{i}",
+                "elements": [
+                    {
+                        "type": "button",
+                        "text": {
+                            "type": "plain_text",
+                            "text": "O (맞음)",
+                            "emoji": True
+                        },
+                        "style": "primary",
+                        "value": f"ox_{i}_O",
+                        "action_id": f"ox_answer_{i}_O"
+                    },
+                    {
+                        "type": "button",
+                        "text": {
+                            "type": "plain_text",
+                            "text": "X (틀림)",
+                            "emoji": True
+                        },
+                        "style": "danger",
+                        "value": f"ox_{i}_X",
+                        "action_id": f"ox_answer_{i}_X"
+                    }
+                ]
+            }
+        ]
+
+    if q["type"] == "객관식":
+        # 객관식도 버튼으로 처리 (문제, 보기, 선택 버튼)
+        blocks = [section(f"*{i+1}. [객관식 문제]*\n{q['question_text']}")]
+        option_buttons = []
+        for j, opt in enumerate(q["options"]):
+            option_letter = chr(65 + j)  # A, B, C, D...
+            blocks.append(section(f"*{option_letter}.* {opt}"))
+            option_buttons.append({
+                "type": "button",
+                "text": {
+                    "type": "plain_text",
+                    "text": f"{option_letter}",
+                    "emoji": True
+                },
+                "value": f"mc_{i}_{option_letter}",
+                "action_id": f"mc_answer_{i}_{option_letter}"
+            })
+        blocks.append({
+            "type": "actions",
+            "block_id": f"mc_question_{i}",
+            "elements": option_buttons
+        })
+        return blocks
+
+    # 주관식
+    return [
+        section(f"*{i+1}. [주관식 문제]*\n{q['question_text']}"),
+        section("아래에 답변을 자유롭게 작성해주세요.")
+    ]
+
+# 기본 개념 학습 실행 (설명은 스트리밍 메시지로 보여주고 나머지 단계만 반환)
+# user를 주면 추출한 태그를 세션에 저장해서 다시 학습할 때 재사용
+async def stream_basic_learning(channel, topic, user=None):
+    if TAG_EXPLAIN_ALL:
+        return await fan_out_basic_learning(channel, topic, user)
+
+    explanation_prefix = "📚 기본 개념 설명:\n"
+    stream = SlackStreamWriter(
+        channel,
+        prefix=explanation_prefix,
+        placeholder="기본 개념을 준비 중입니다... 잠시만 기다려주세요."
+    )
+    await stream.start()
+
+    steps = await run_network_learning_fsm(topic, on_token=stream.append, user=user)
+
+    explanation = next((step for step in steps if step.startswith(explanation_prefix)), None)
+    if explanation is None:
+        await stream.finish("❌ 기본 개념 설명을 생성하지 못했습니다.")
+        return steps
+
+    await stream.finish(explanation[len(explanation_prefix):])
+    return [step for step in steps if step is not explanation]
+
+# 수준이 정해진 뒤 기본 개념 학습과 다음 단계 준비(세부 주제, 저장한 수준의 면접 질문)를 동시에 실행
+# 준비에 실패해도 학습은 그대로 진행 (면접을 시작할 때 다시 생성)
+async def start_basic_learning(channel, topic, user, user_level):
+    steps, prepared = await asyncio.gather(
+        stream_basic_learning(channel, topic, user),
+        prepare_next_steps(topic, user_level, user),
+        return_exceptions=True
+    )
+    if isinstance(steps, BaseException):
+        raise steps
+    if isinstance(prepared, BaseException):
+        logger.warning(f"다음 단계 준비 실패 ({user}): {str(prepared)}")
+    return steps
+
+# 기본 개념 학습 실행 (모든 키워드를 동시에 설명하고 완성되는 대로 키워드별 메시지로 전송, 나머지 단계만 반환)
+async def fan_out_basic_learning(channel, topic, user=None):
+    say = slack_outbox.sayer(channel)
+    await say(f"🔍 *{topic}*의 주요 개념을 설명합니다. 완성되는 대로 하나씩 보내드릴게요...")
+
+    tags = await session_artifacts.get_or_create(user, "tags", artifact_key(topic), lambda: extract_topic_tags(topic))
+    if not tags:
+        await say("❌ 기본 개념 설명을 생성하지 못했습니다.")
+        return []
+
+    async for index, explanation in stream_tag_explanations(tags, ordered=TAG_EXPLAIN_ORDERED):
+        composer = MessageComposer()
+        composer.text(f"📚 *[{index + 1}/{len(tags)}] {tags[index]}*\n{explanation}")
+        await composer.send(say)
+
+    return [f"🧠 주요 키워드: {', '.join(tags)}"]
+
+# 수준 테스트 문제 생성 (동적 생성 버전, 문제 하나가 완성될 때마다 반환)
+# fallback이 False면 생성에 실패해도 기본 문제를 반환하지 않음
+async def stream_test_questions(topic, fallback=True):
+    from app.services.openai_service import get_completion
+    from app.services.structured_output import structured_output, LEVEL_TEST_SCHEMA
+    from app.prompts.fsm_prompts import level_test_prompt
+
+    # 프롬프트 형식 사용하여 동적으로 문제 생성
+    prompt = level_test_prompt.format(topic=topic)
+
+    count = 0
+    try:
+        # OpenAI API 스트리밍 응답에서 문제 객체가 닫히는 대로 형식을 검증해서 꺼냄
+        async for q in structured_output.stream(
+            LEVEL_TEST_SCHEMA,
+            prompt,
+            lambda on_token: get_completion(prompt=prompt, temperature=0.8, on_token=on_token, template=LEVEL_TEST_SCHEMA.name)
+        ):
+            q["question_text"] = q.get("question", "")  # 질문 텍스트 필드 통일
+
+            # OX 문제 처리
+            if q.get("type") == "OX":
+                q["correct_answer"] = q.get("answer", "O")
+
+            # 객관식 문제 처리
+            elif q.get("type") == "객관식":
+                q["correct_answer"] = q.get("answer", "A")
+
+                # 보기 옵션 매핑
+                options = {}
+                if "options" in q and isinstance(q["options"], dict):
+                    options = q["options"]
+                elif "options" in q and isinstance(q["options"], list):
+                    # 리스트를 딕셔너리로 변환
+                    for idx, opt_text in enumerate(q["options"]):
+                        opt_key = chr(65 + idx)  # A, B, C, D...
+                        options[opt_key] = opt_text
+                    q["options"] = options
+
+                # 주관식은 그대로 유지
+
+            count += 1
+            yield q
+    except Exception as e:
+        print(f"문제 생성 오류: {str(e)}")
+
+    # 이미 보낸 문제가 있으면 그대로 진행
+    if count or not fallback:
+        return
+
+    # 오류 시 기본 문제 생성
+    for q in [
+        {
+            "type": "OX",
+            "question_text": f"{topic}의 기본 개념을 이해하고 있나요?",
+            "correct_answer": "O",
+            "level": "입문"
+        },
+        {
+            "type": "OX",
+            "question_text": f"{topic}의 심화 개념을 이해하고 있나요?",
+            "correct_answer": "X",
+            "level": "중급"
+        },
+        {
+            "type": "객관식",
+            "question_text": f"{topic}의 주요 용어는 무엇인가요?",
+            "options": {
+                "A": "기본 용어",
+                "B": "중급 용어",
+                "C": "고급 용어",
+                "D": "모두 다"
+            },
+            "correct_answer": "D",
+            "level": "중급"
+        },
+        {
+            "type": "객관식",
+            "question_text": f"{topic}의 핵심 원리는 무엇인가요?",
+            "options": {
+                "A": "핵심 원리 1",
+                "B": "핵심 원리 2",
+                "C": "핵심 원리 3",
+                "D": "위의 모든 것"
+            },
+            "correct_answer": "A",
+            "level": "고급"
+        }
+    ]:
+        yield q
+
+# 퀴즈 생성에 사용할 FSM 상태
+def quiz_state(topic, tags):
+    return {
+        "topic": topic,
+        "tags": tags,
+        "mode": "quiz",
+        "questions": [],
+        "current_index": 0,
+        "explanation": "",
+        "user_question": "",
+        "level_test_questions": [],
+        "level_test_responses": [],
+        "user_level": "beginner",
+        "subtopics": [],
+        "selected_subtopic": "",
+        "interview_questions": [],
+        "current_interview_index": 0
+    }
+
+# 면접 질문에 사용할 사용자 수준 (수준을 확인하지 않았으면 중급)
+def interview_level(session):
+    return session.get("user_level") or "intermediate"
+
+# 다음 단계 미리 생성 작업 (세션을 받아 결과 목록 반환, 실패하면 빈 목록)
+# 세션에 이미 같은 조건으로 만든 결과물이 있으면 LLM을 호출하지 않고 그대로 사용
+async def prefetch_level_test(session):
+    stored = stored_artifact(session, "level_test", level_test_key(session))
+    if stored:
+        return stored
+    return [q async for q in stream_test_questions(session["topic"], fallback=False)]
+
+async def prefetch_quiz(session):
+    stored = stored_artifact(session, "quiz", quiz_key(session))
+    if stored:
+        return stored
+    questions = []
+    async for question in stream_quiz_questions(cast(NetworkGraphState, quiz_state(session["topic"], session.get("tags") or []))):
+        question["question_text"] = question.get("question", "")  # 질문 텍스트 필드 통일
+        questions.append(question)
+    return questions
+
+async def prefetch_interview(session):
+    stored = stored_artifact(session, "interview", interview_key(session))
+    if stored:
+        return stored
+    return await create_interview_questions(session["topic"], "", interview_level(session))
+
+# 결과물을 만들 때 사용한 세션 조건 (미리 생성과 세션 결과물 저장에 같은 키 사용)
+def level_test_key(session):
+    return artifact_key(session.get("topic", ""))
+
+def quiz_key(session):
+    return artifact_key(session.get("topic", ""), ",".join(session.get("tags") or []))
+
+def interview_key(session):
+    # 세부 주제 없이 시작하는 면접 (start_interview_session의 기본값과 같은 키)
+    return artifact_key(session.get("topic", ""), "", interview_level(session))
+
+# 주제를 고르면 수준 테스트, 기본 학습이 끝나면 퀴즈, 퀴즈를 시작하면 면접 질문을 미리 생성
+prefetcher.rule("selecting_level_check", "level_test", level_test_key, prefetch_level_test)
+prefetcher.rule("learning_completed", "quiz", quiz_key, prefetch_quiz)
+prefetcher.rule(LearningMode.QUIZ, "interview", interview_key, prefetch_interview)
+prefetcher.rule("after_quiz", "interview", interview_key, prefetch_interview)
+
+# LLM 호출 전 사용자별 요청 한도 확인
+async def is_rate_limited(user, reply):
+    """
+    사용자의 LLM 요청 한도를 확인합니다.
+    한도를 넘었으면 요청을 대기열에 넣지 않고 바로 안내 메시지를 보낸 뒤 True를 반환합니다.
+    """
+    if user_rate_limiter.try_acquire(user):
+        return False
+
+    wait_seconds = math.ceil(user_rate_limiter.retry_after(user))
+    await reply(f"⏳ 요청이 너무 많습니다. {wait_seconds}초 후에 다시 시도해주세요.")
+    return True
+
 @slack_app.command("/기상미션")
 async def handle_command(ack, respond):
     await ack()
@@ -57,12 +352,36 @@ async def handle_command(ack, respond):
 
 @slack_app.event("message")
 async def handle_message(body, say):
-    text = body["event"]["text"].strip()
-    user = body["event"]["user"]
+    # Slack 재전송(X-Slack-Retry-Num)으로 같은 이벤트가 다시 오면 무시
+    if await is_duplicate_event(body):
+        return
+
+    # 메시지 수정/삭제, 봇 메시지, 파일 공유 등 subtype 이벤트와 사용자가 없는 이벤트는 처리하지 않음
+    event = body.get("event", {})
+    user = event.get("user")
+    if event.get("subtype") or not user or not event.get("text"):
+        return
+
+    # 바로 응답(ack)하고 실제 처리는 백그라운드 작업으로 실행 (Slack 3초 제한 대응)
+    job_runner.submit(f"message:{user}", lambda: process_message(body, say), on_error=say, key=user)
+
+async def process_message(body, say):
+    event = body.get("event", {})
+    text = (event.get("text") or "").strip()
+    user = event.get("user")
+    # 메시지는 채널별 전송 큐에 넣고 바로 다음 단계 진행
+    say = slack_outbox.sayer(event.get("channel"))
+    # 이 요청에서 발생하는 LLM 호출을 사용자별로 공정하게 스케줄링하기 위함
+    current_user_id.set(user)
+
+    # 사용자 학습 세션 (변경은 session_store를 통해서만 반영)
+    session = await session_store.get(user)
 
     # 1. 공부시작 - 주제 선택 화면 표시
     if text.lower() == "공부시작":
-        user_state[user] = {"mode": LearningMode.SELECTING_TOPIC}
+        prefetcher.cancel(user)
+        await fsm_checkpointer.reset(user)
+        await session_store.set(user, {"mode": LearningMode.SELECTING_TOPIC})
 
         await say(
             blocks=[
@@ -95,14 +414,14 @@ async def handle_message(body, say):
         return
 
     # 2. 주제 선택 단계에서 사용자가 주제 입력
-    if user_state.get(user, {}).get("mode") == LearningMode.SELECTING_TOPIC:
+    if session.get("mode") == LearningMode.SELECTING_TOPIC:
         if text not in VALID_TOPICS:
             await say(f"❗ 잘못된 주제입니다. 가능한 주제: {', '.join(VALID_TOPICS.keys())}")
             return
 
         topic = text
         # 학습 단계로 상태 변경
-        user_state[user] = {
+        session = {
             "mode": "selecting_level_check",
             "topic": topic,
             "tags": [],
@@ -112,6 +431,9 @@ async def handle_message(body, say):
             "selected_subtopic": "",
             "interview_index": 0
         }
+        await session_store.set(user, session)
+        # 테스트를 고를 경우에 대비해 수준 테스트 문제를 미리 생성
+        prefetcher.on_transition(user, session)
 
         # 레벨 체크 방식 선택 요청
         await say(
@@ -145,12 +467,12 @@ async def handle_message(body, say):
         return
 
     # 3. 레벨 체크 방식 선택
-    if user_state.get(user, {}).get("mode") == "selecting_level_check":
-        topic = user_state[user]["topic"]
+    if session.get("mode") == "selecting_level_check":
+        topic = session["topic"]
 
         if text == "1" or "자가평가" in text or "직접" in text:
-            # 자가평가 모드로 전환
-            user_state[user]["mode"] = "self_assessment"
+            # 자가평가 모드로 전환 (미리 생성 중인 수준 테스트는 취소)
+            prefetcher.on_transition(user, await session_store.patch(user, mode="self_assessment"))
 
             await say(
                 blocks=[
@@ -177,252 +499,44 @@ async def handle_message(body, say):
             return
 
         elif text == "2" or "테스트" in text:
-            # 테스트 모드로 전환
-            user_state[user]["mode"] = LearningMode.LEVEL_TEST
+            if await is_rate_limited(user, say):
+                return
 
-            # 테스트 시작 메시지
-            await say("📝 *수준 테스트를 시작합니다*")
-            await say("테스트는 OX 문제 2개, 객관식 문제 2개, 주관식 문제 1개로 구성됩니다.")
-            await say("🔍 테스트 문제를 생성하고 있습니다...")
-
-            # 백그라운드에서 테스트 문제 생성
-            import asyncio
-
-            # 테스트 문제 생성 함수 정의 (동적 생성 버전)
-            async def generate_test_questions(topic):
-                from app.services.openai_service import get_completion
-                from app.prompts.fsm_prompts import level_test_prompt
-                import json
-
-                # 프롬프트 형식 사용하여 동적으로 문제 생성
-                prompt = level_test_prompt.format(topic=topic)
-
-                try:
-                    # OpenAI API로 문제 생성
-                    response = await get_completion(prompt=prompt, temperature=0.8)
-
-                    # JSON 파싱
-                    questions = json.loads(response)
-
-                    # 객관식 문제에 대해 보기 정보 추가
-                    for i, q in enumerate(questions):
-                        q["question_text"] = q.get("question", "")  # 질문 텍스트 필드 통일
-
-                        # OX 문제 처리
-                        if q.get("type") == "OX":
-                            q["correct_answer"] = q.get("answer", "O")
-
-                        # 객관식 문제 처리
-                        elif q.get("type") == "객관식":
-                            q["correct_answer"] = q.get("answer", "A")
-
-                            # 보기 옵션 매핑
-                            options = {}
-                            if "options" in q and isinstance(q["options"], dict):
-                                options = q["options"]
-                            elif "options" in q and isinstance(q["options"], list):
-                                # 리스트를 딕셔너리로 변환
-                                for idx, opt_text in enumerate(q["options"]):
-                                    opt_key = chr(65 + idx)  # A, B, C, D...
-                                    options[opt_key] = opt_text
-                                q["options"] = options
-
-                            # 주관식은 그대로 유지
-
-                    return questions
-                except Exception as e:
-                    print(f"문제 생성 오류: {str(e)}")
-
-                    # 오류 시 기본 문제 생성
-                    return [
-                        {
-                            "type": "OX",
-                            "question_text": f"{topic}의 기본 개념을 이해하고 있나요?",
-                            "correct_answer": "O",
-                            "level": "입문"
-                        },
-                        {
-                            "type": "OX",
-                            "question_text": f"{topic}의 심화 개념을 이해하고 있나요?",
-                            "correct_answer": "X",
-                            "level": "중급"
-                        },
-                        {
-                            "type": "객관식",
-                            "question_text": f"{topic}의 주요 용어는 무엇인가요?",
-                            "options": {
-                                "A": "기본 용어",
-                                "B": "중급 용어",
-                                "C": "고급 용어",
-                                "D": "모두 다"
-                            },
-                            "correct_answer": "D",
-                            "level": "중급"
-                        },
-                        {
-                            "type": "객관식",
-                            "question_text": f"{topic}의 핵심 원리는 무엇인가요?",
-                            "options": {
-                                "A": "핵심 원리 1",
-                                "B": "핵심 원리 2",
-                                "C": "핵심 원리 3",
-                                "D": "위의 모든 것"
-                            },
-                            "correct_answer": "A",
-                            "level": "고급"
-                        }
-                    ]
-
-            # 비동기적으로 문제 생성 (실제로는 미리 준비된 문제 사용)
-            await asyncio.sleep(1)  # 실제 생성처럼 약간의 지연
-            questions = await generate_test_questions(topic)
-
-            # 문제 저장
-            user_state[user]["test_questions"] = questions
-
-            # 문제 출력 (OX 2개, 객관식 2개, 주관식 1개)
-            for i, q in enumerate(questions):
-                if q["type"] == "OX":
-                    # OX 문제는 버튼으로 처리
-                    await say(
-                        blocks=[
-                            {
-                                "type": "section",
-                                "text": {
-                                    "type": "mrkdwn",
-                                    "text": f"*{i+1}. [OX 문제]*\n{q['question_text']}"
-                                }
-                            },
-                            {
-                                "type": "actions",
-                                "block_id": f"ox_question_{i}",
-                                "elements": [
-                                    {
-                                        "type": "button",
-                                        "text": {
-                                            "type": "plain_text",
-                                            "text": "O (맞음)",
-                                            "emoji": True
-                                        },
-                                        "style": "primary",
-                                        "value": f"ox_{i}_O",
-                                        "action_id": f"ox_answer_{i}_O"
-                                    },
-                                    {
-                                        "type": "button",
-                                        "text": {
-                                            "type": "plain_text",
-                                            "text": "X (틀림)",
-                                            "emoji": True
-                                        },
-                                        "style": "danger",
-                                        "value": f"ox_{i}_X",
-                                        "action_id": f"ox_answer_{i}_X"
-                                    }
-                                ]
-                            }
-                        ]
-                    )
-                elif q["type"] == "객관식":
-                    # 객관식도 버튼으로 처리
-                    option_buttons = []
-                    for j, opt in enumerate(q["options"]):
-                        option_letter = chr(65 + j)  # A, B, C, D...
-                        option_buttons.append({
-                            "type": "button",
-                            "text": {
-                                "type": "plain_text",
-                                "text": f"{option_letter}",
-                                "emoji": True
-                            },
-                            "value": f"mc_{i}_{option_letter}",
-                            "action_id": f"mc_answer_{i}_{option_letter}"
-                        })
+            # 테스트 모드로 전환
+            await session_store.patch(user, mode=LearningMode.LEVEL_TEST)
+
+            # 테스트 시작 메시지 (한 메시지로 전송)
+            intro = MessageComposer()
+            intro.text("📝 *수준 테스트를 시작합니다*")
+            intro.text("테스트는 OX 문제 2개, 객관식 문제 2개, 주관식 문제 1개로 구성됩니다.")
+            intro.text("🔍 테스트 문제를 생성하고 있습니다...")
+            await intro.send(say)
+
+            # 문제 출력 (OX 2개, 객관식 2개, 주관식 1개) - 미리 생성한 문제가 있으면 바로 사용하고,
+            # 없으면 나머지 문제가 생성되는 동안 완성된 문제부터 전송
+            questions = []
+            composer = MessageComposer()
+            prefetched = await session_artifacts.get(user, "level_test", level_test_key(session)) or await prefetcher.take(user, "level_test")
+            if prefetched:
+                for q in prefetched:
+                    composer.blocks(question_blocks(len(questions), q))
+                    questions.append(q)
+            else:
+                async for q in stream_test_questions(topic):
+                    composer.blocks(question_blocks(len(questions), q))
+                    await composer.send(say)
+                    questions.append(q)
 
-                    await say(
-                        blocks=[
-                            {
-                                "type": "section",
-                                "text": {
-                                    "type": "mrkdwn",
-                                    "text": f"*{i+1}. [객관식 문제]*\n{q['question_text']}"
-                                }
-                            }
-                        ]
-                    )
-
-                    # 각 객관식 옵션을 별도로 표시
-                    for j, opt in enumerate(q["options"]):
-                        option_letter = chr(65 + j)
-                        await say(
-                            blocks=[
-                                {
-                                    "type": "section",
-                                    "text": {
-                                        "type": "mrkdwn",
-                                        "text": f"*{option_letter}.* {opt}"
-                                    }
-                                }
-                            ]
-                        )
-
-                    # 객관식 선택 버튼 표시
-                    await say(
-                        blocks=[
-                            {
-                                "type": "actions",
-                                "block_id": f"mc_question_{i}",
-                                "elements": option_buttons
-                            }
-                        ]
-                    )
-                else:
-                    # 주관식 메시지 개선
-                    await say(
-                        blocks=[
-                            {
-                                "type": "section",
-                                "text": {
-                                    "type": "mrkdwn",
-                                    "text": f"*{i+1}. [주관식 문제]*\n{q['question_text']}"
-                                }
-                            },
-                            {
-                                "type": "section",
-                                "text": {
-                                    "type": "mrkdwn",
-                                    "text": "아래에 답변을 자유롭게 작성해주세요."
-                                }
-                            }
-                        ]
-                    )
+            # 문제 저장 (같은 주제로 다시 테스트하면 재사용)
+            await session_artifacts.put(user, "level_test", level_test_key(session), questions)
 
             # 답변 안내 메시지 개선
-            await say(
-                blocks=[
-                    {
-                        "type": "section",
-                        "text": {
-                            "type": "mrkdwn",
-                            "text": "*📝 답변 방법*"
-                        }
-                    },
-                    {
-                        "type": "section",
-                        "text": {
-                            "type": "mrkdwn",
-                            "text": "1. OX 문제: 위 버튼을 클릭하여 응답하세요.\n2. 객관식: '3번: C' 또는 '3: C' 형식으로 입력하세요.\n3. 주관식: '5번: 답변 내용' 형식으로 입력하세요."
-                        }
-                    },
-                    {
-                        "type": "section",
-                        "text": {
-                            "type": "mrkdwn",
-                            "text": "모든 답변을 마치면 '답변 제출' 또는 '제출완료'라고 입력하세요."
-                        }
-                    }
-                ]
-            )
+            composer.blocks([
+                section("*📝 답변 방법*"),
+                section("1. OX 문제: 위 버튼을 클릭하여 응답하세요.\n2. 객관식: '3번: C' 또는 '3: C' 형식으로 입력하세요.\n3. 주관식: '5번: 답변 내용' 형식으로 입력하세요."),
+                section("모든 답변을 마치면 '답변 제출' 또는 '제출완료'라고 입력하세요.")
+            ])
+            await composer.send(say)
             return
 
         else:
@@ -430,8 +544,8 @@ async def handle_message(body, say):
             return
 
     # 4. 자가평가 응답 처리
-    if user_state.get(user, {}).get("mode") == "self_assessment":
-        topic = user_state[user]["topic"]
+    if session.get("mode") == "self_assessment":
+        topic = session["topic"]
 
         level_map = {
             "초급": "beginner",
@@ -440,54 +554,46 @@ async def handle_message(body, say):
         }
 
         if text.lower() in ["초급", "중급", "고급"]:
+            if await is_rate_limited(user, say):
+                return
+
             user_level = level_map.get(text.lower(), "beginner")
-            user_state[user]["user_level"] = user_level
+            await session_store.patch(user, user_level=user_level)
 
-            # 사용자 수준에 맞는 학습 시작
-            await say(f"✅ *{text}* 수준으로 설정되었습니다. {topic} 학습을 시작합니다!")
+            # 사용자 수준에 맞는 학습 시작 (안내 메시지는 한 메시지로 전송)
+            intro = MessageComposer()
+            intro.text(f"✅ *{text}* 수준으로 설정되었습니다. {topic} 학습을 시작합니다!")
 
             # 수준별 다른 메시지 추가
             if text.lower() == "초급":
-                await say("🔰 기초 개념부터 차근차근 설명해 드리겠습니다.")
+                intro.text("🔰 기초 개념부터 차근차근 설명해 드리겠습니다.")
             elif text.lower() == "중급":
-                await say("🏆 기본 개념은 빠르게 살펴보고 심화 내용을 중점적으로 학습하겠습니다.")
+                intro.text("🏆 기본 개념은 빠르게 살펴보고 심화 내용을 중점적으로 학습하겠습니다.")
             else:  # 고급
-                await say("🎓 전문적인 내용 위주로 학습을 진행하겠습니다.")
-
-            # 학습 준비 메시지
-            await say("📚 기본 개념을 준비 중입니다... 잠시만 기다려주세요.")
+                intro.text("🎓 전문적인 내용 위주로 학습을 진행하겠습니다.")
+            await intro.send(say)
 
-            # FSM 실행하여 기본 개념 설명 (백그라운드에서 처리)
-            steps = await original_run_network_learning_fsm(topic)
+            # FSM 실행하여 기본 개념 설명 (설명은 생성되는 대로 스트리밍으로 표시)
+            steps = await start_basic_learning(body["event"]["channel"], topic, user, user_level)
 
             # 태그 정보 저장
             for step in steps:
                 if "주요 키워드" in step:
                     tags = [tag.strip() for tag in step.split("🧠 주요 키워드:")[1].split(",")]
-                    user_state[user]["tags"] = tags
+                    await session_store.patch(user, tags=tags)
 
-            # 순차적으로 메시지 전송 (한 번에 몇 개씩 묶어서 전송)
-            batch_size = 1  # 한 번에 하나의 메시지만 보내도록 수정
+            # 학습 내용과 완료 안내를 Block Kit 한도 안에서 최소한의 메시지로 전송
             filtered_steps = [step for step in steps if "수준 테스트" not in step and "세부 학습 주제" not in step]
-
-            for i in range(0, len(filtered_steps), batch_size):
-                batch = filtered_steps[i:i+batch_size]
-                for message in batch:
-                    # 이모지 처리
-                    if message.startswith("🧠") or message.startswith("📚") or message.startswith("📋"):
-                        # 각 이모지 줄은 별도로 전송
-                        await say(message)
-                    else:
-                        # 일반 텍스트는 그대로 전송
-                        await say(message)
-                    import asyncio
-                    await asyncio.sleep(0.5)  # 메시지 간 약간의 지연
+            composer = MessageComposer()
+            for message in filtered_steps:
+                composer.text(message)
 
             # 학습 완료 안내
-            await say("✅ 기본 개념 학습이 완료되었습니다. 더 공부하고 싶으시면 '공부시작'을 다시 입력하시거나 '질문 [주제] [질문내용]' 형식으로 질문해주세요.")
+            composer.text("✅ 기본 개념 학습이 완료되었습니다. 더 공부하고 싶으시면 '공부시작'을 다시 입력하시거나 '질문 [주제] [질문내용]' 형식으로 질문해주세요.")
+            await composer.send(say)
 
-            # 상태 변경
-            user_state[user]["mode"] = "learning_completed"
+            # 상태 변경 (다음 단계인 퀴즈를 미리 생성)
+            prefetcher.on_transition(user, await session_store.patch(user, mode="learning_completed"))
             return
 
         else:
@@ -495,20 +601,23 @@ async def handle_message(body, say):
             return
 
     # 5. 테스트 응답 처리
-    if user_state.get(user, {}).get("mode") == LearningMode.LEVEL_TEST and (text.lower() == "답변 제출" or text.lower() == "제출완료" or "번:" in text):
-        topic = user_state[user]["topic"]
+    if session.get("mode") == LearningMode.LEVEL_TEST and (text.lower() == "답변 제출" or text.lower() == "제출완료" or "번:" in text):
+        topic = session["topic"]
+
+        if await is_rate_limited(user, say):
+            return
 
         # 테스트 응답 파싱
         answers = []
 
         # 버튼으로 저장된 OX 답변 먼저 처리
-        if "user_ox_answers" in user_state.get(user, {}):
-            for idx, ans in user_state[user]["user_ox_answers"].items():
+        if "user_ox_answers" in session:
+            for idx, ans in session["user_ox_answers"].items():
                 answers.append({"question_index": int(idx), "user_answer": ans})
 
         # 버튼으로 저장된 객관식 답변 처리
-        if "user_mc_answers" in user_state.get(user, {}):
-            for idx, ans in user_state[user]["user_mc_answers"].items():
+        if "user_mc_answers" in session:
+            for idx, ans in session["user_mc_answers"].items():
                 answers.append({"question_index": int(idx), "user_answer": ans})
 
         try:
@@ -587,7 +696,7 @@ async def handle_message(body, say):
             correct_answers = []
 
             # 각 문제별 정답과 해설을 별도의 메시지로 처리
-            for i, q in enumerate(user_state[user]["test_questions"]):
+            for i, q in enumerate(session["test_questions"]):
                 answer_msg = ""
 
                 # 사용자 답변 확인
@@ -674,7 +783,7 @@ async def handle_message(body, say):
 
             # 정답 수 다시 계산 (실제 채점 결과 기준)
             score = len(correct_answers)
-            total = len(user_state[user]["test_questions"])
+            total = len(session["test_questions"])
 
             # 수준 평가
             percentage = (score / total) * 100
@@ -722,42 +831,29 @@ async def handle_message(body, say):
             )
 
             # 사용자 수준 저장
-            user_state[user]["user_level"] = level
+            await session_store.patch(user, user_level=level)
 
-            # 학습 준비 메시지
-            await say("📚 기본 개념을 준비 중입니다... 잠시만 기다려주세요.")
-
-            # FSM 실행하여 기본 개념 설명 (백그라운드에서 처리)
-            steps = await original_run_network_learning_fsm(topic)
+            # FSM 실행하여 기본 개념 설명 (설명은 생성되는 대로 스트리밍으로 표시)
+            steps = await start_basic_learning(body["event"]["channel"], topic, user, level)
 
             # 태그 정보 저장
             for step in steps:
                 if "주요 키워드" in step:
                     tags = [tag.strip() for tag in step.split("🧠 주요 키워드:")[1].split(",")]
-                    user_state[user]["tags"] = tags
+                    await session_store.patch(user, tags=tags)
 
-            # 순차적으로 메시지 전송 (한 번에 몇 개씩 묶어서 전송)
-            batch_size = 1  # 한 번에 하나의 메시지만 보내도록 수정
+            # 학습 내용과 완료 안내를 Block Kit 한도 안에서 최소한의 메시지로 전송
             filtered_steps = [step for step in steps if "수준 테스트" not in step and "세부 학습 주제" not in step]
-
-            for i in range(0, len(filtered_steps), batch_size):
-                batch = filtered_steps[i:i+batch_size]
-                for message in batch:
-                    # 이모지 처리
-                    if message.startswith("🧠") or message.startswith("📚") or message.startswith("📋"):
-                        # 각 이모지 줄은 별도로 전송
-                        await say(message)
-                    else:
-                        # 일반 텍스트는 그대로 전송
-                        await say(message)
-                    import asyncio
-                    await asyncio.sleep(0.5)  # 메시지 간 약간의 지연
+            composer = MessageComposer()
+            for message in filtered_steps:
+                composer.text(message)
 
             # 학습 완료 안내
-            await say("✅ 기본 개념 학습이 완료되었습니다. 더 공부하고 싶으시면 '공부시작'을 다시 입력하시거나 '질문 [주제] [질문내용]' 형식으로 질문해주세요.")
+            composer.text("✅ 기본 개념 학습이 완료되었습니다. 더 공부하고 싶으시면 '공부시작'을 다시 입력하시거나 '질문 [주제] [질문내용]' 형식으로 질문해주세요.")
+            await composer.send(say)
 
-            # 상태 변경
-            user_state[user]["mode"] = "learning_completed"
+            # 상태 변경 (다음 단계인 퀴즈를 미리 생성)
+            prefetcher.on_transition(user, await session_store.patch(user, mode="learning_completed"))
             return
 
         except Exception as e:
@@ -765,207 +861,80 @@ async def handle_message(body, say):
             return
 
     # 6. 학습 완료 후 선택지 처리
-    if user_state.get(user, {}).get("mode") == "learning_completed":
-        topic = user_state[user]["topic"]
+    if session.get("mode") == "learning_completed":
+        topic = session["topic"]
 
         if text == "1" or "퀴즈" in text:
+            if await is_rate_limited(user, say):
+                return
+
             # 퀴즈 모드로 전환
-            user_state[user]["mode"] = LearningMode.QUIZ
+            await session_store.patch(user, mode=LearningMode.QUIZ)
             await say("📝 *퀴즈를 시작합니다*")
 
-            # 여기서 퀴즈 생성 함수 호출
-            from app.chains.network_graph_fsm import generate_quiz, NetworkGraphState
-            from typing import Dict, Any, cast
-
-            state: Dict[str, Any] = {
-                "topic": topic,
-                "tags": user_state[user].get("tags", []),
-                "mode": "quiz",
-                "questions": [],
-                "current_index": 0,
-                "explanation": "",
-                "user_question": "",
-                "level_test_questions": [],
-                "level_test_responses": [],
-                "user_level": "beginner",
-                "subtopics": [],
-                "selected_subtopic": "",
-                "interview_questions": [],
-                "current_interview_index": 0
-            }
-
-            result = generate_quiz(cast(NetworkGraphState, state))
-
-            # 퀴즈 출력
-            await say(
-                blocks=[
-                    {
-                        "type": "section",
-                        "text": {
-                            "type": "mrkdwn",
-                            "text": "*📝 다음 문제들에 답해보세요:*"
-                        }
-                    }
-                ]
-            )
-            for i, question in enumerate(result["questions"]):
-                if question["type"] == "OX":
-                    # OX 문제는 버튼으로 처리
-                    await say(
-                        blocks=[
-                            {
-                                "type": "section",
-                                "text": {
-                                    "type": "mrkdwn",
-                                    "text": f"*{i+1}. [OX 문제]*\n{question['question_text']}"
-                                }
-                            },
-                            {
-                                "type": "actions",
-                                "block_id": f"ox_question_{i}",
-                                "elements": [
-                                    {
-                                        "type": "button",
-                                        "text": {
-                                            "type": "plain_text",
-                                            "text": "O (맞음)",
-                                            "emoji": True
-                                        },
-                                        "style": "primary",
-                                        "value": f"ox_{i}_O",
-                                        "action_id": f"ox_answer_{i}_O"
-                                    },
-                                    {
-                                        "type": "button",
-                                        "text": {
-                                            "type": "plain_text",
-                                            "text": "X (틀림)",
-                                            "emoji": True
-                                        },
-                                        "style": "danger",
-                                        "value": f"ox_{i}_X",
-                                        "action_id": f"ox_answer_{i}_X"
-                                    }
-                                ]
-                            }
-                        ]
-                    )
-                elif question["type"] == "객관식":
-                    # 객관식도 버튼으로 처리
-                    option_buttons = []
-                    for j, opt in enumerate(question["options"]):
-                        option_letter = chr(65 + j)  # A, B, C, D...
-                        option_buttons.append({
-                            "type": "button",
-                            "text": {
-                                "type": "plain_text",
-                                "text": f"{option_letter}",
-                                "emoji": True
-                            },
-                            "value": f"mc_{i}_{option_letter}",
-                            "action_id": f"mc_answer_{i}_{option_letter}"
-                        })
-
-                    await say(
-                        blocks=[
-                            {
-                                "type": "section",
-                                "text": {
-                                    "type": "mrkdwn",
-                                    "text": f"*{i+1}. [객관식 문제]*\n{question['question_text']}"
-                                }
-                            }
-                        ]
-                    )
-
-                    # 각 객관식 옵션을 별도로 표시
-                    for j, opt in enumerate(question["options"]):
-                        option_letter = chr(65 + j)
-                        await say(
-                            blocks=[
-                                {
-                                    "type": "section",
-                                    "text": {
-                                        "type": "mrkdwn",
-                                        "text": f"*{option_letter}.* {opt}"
-                                    }
-                                }
-                            ]
-                        )
+            # 퀴즈 출력 (미리 생성한 퀴즈가 있으면 바로 사용하고, 없으면 나머지 문제가 생성되는 동안 완성된 문제부터 전송)
+            questions = []
+            composer = MessageComposer()
+            composer.text("*📝 다음 문제들에 답해보세요:*")
+            prefetched = await session_artifacts.get(user, "quiz", quiz_key(session)) or await prefetcher.take(user, "quiz")
+            if prefetched:
+                for question in prefetched:
+                    composer.blocks(question_blocks(len(questions), question))
+                    questions.append(question)
+            else:
+                try:
+                    state = quiz_state(topic, session.get("tags", []))
+                    async for question in stream_quiz_questions(cast(NetworkGraphState, state)):
+                        question["question_text"] = question.get("question", "")  # 질문 텍스트 필드 통일
+                        composer.blocks(question_blocks(len(questions), question))
+                        await composer.send(say)
+                        questions.append(question)
+                except Exception as e:
+                    logger.error(f"퀴즈 생성 오류: {str(e)}")
 
-                    # 객관식 선택 버튼 표시
-                    await say(
-                        blocks=[
-                            {
-                                "type": "actions",
-                                "block_id": f"mc_question_{i}",
-                                "elements": option_buttons
-                            }
-                        ]
-                    )
-                else:
-                    # 주관식 메시지 개선
-                    await say(
-                        blocks=[
-                            {
-                                "type": "section",
-                                "text": {
-                                    "type": "mrkdwn",
-                                    "text": f"*{i+1}. [주관식 문제]*\n{question['question_text']}"
-                                }
-                            },
-                            {
-                                "type": "section",
-                                "text": {
-                                    "type": "mrkdwn",
-                                    "text": "아래에 답변을 자유롭게 작성해주세요."
-                                }
-                            }
-                        ]
-                    )
+            generated = bool(questions)
+            if not generated:
+                # 생성 실패 시 기본 질문
+                question_text = f"{topic}에 대한 간단한 질문입니다."
+                questions = [{"type": "OX", "question": question_text, "question_text": question_text, "answer": "O"}]
+                composer.blocks(question_blocks(0, questions[0]))
 
             # 퀴즈 답변 안내
-            await say(
-                blocks=[
-                    {
-                        "type": "section",
-                        "text": {
-                            "type": "mrkdwn",
-                            "text": "*📝 답변 방법*"
-                        }
-                    },
-                    {
-                        "type": "section",
-                        "text": {
-                            "type": "mrkdwn",
-                            "text": "1. OX 문제: 위 버튼을 클릭하여 응답하세요.\n2. 객관식: '2번: C' 형식으로 입력하세요.\n3. 주관식: '3번: 답변 내용' 형식으로 입력하세요."
-                        }
-                    },
-                    {
-                        "type": "section",
-                        "text": {
-                            "type": "mrkdwn",
-                            "text": "모든 답변을 마치면 '정답 확인'이라고 입력하세요."
-                        }
-                    }
-                ]
-            )
-            user_state[user]["quiz_questions"] = result["questions"]
+            composer.blocks([
+                section("*📝 답변 방법*"),
+                section("1. OX 문제: 위 버튼을 클릭하여 응답하세요.\n2. 객관식: '2번: C' 형식으로 입력하세요.\n3. 주관식: '3번: 답변 내용' 형식으로 입력하세요."),
+                section("모든 답변을 마치면 '정답 확인'이라고 입력하세요.")
+            ])
+            await composer.send(say)
+            # 퀴즈 저장 (기본 질문은 다음에 다시 생성하도록 결과물로 기록하지 않음)
+            # 퀴즈를 푸는 동안 면접 질문을 미리 생성
+            if generated:
+                session = await session_artifacts.put(user, "quiz", quiz_key(session), questions)
+            else:
+                session = await session_store.patch(user, quiz_questions=questions)
+            prefetcher.on_transition(user, session)
             return
 
         elif text == "2" or "질문" in text:
-            await say("💬 특정 개념에 대해 질문하실 수 있습니다.")
-            await say("'질문 [주제] [질문내용]' 형식으로 입력해주세요. 예: '질문 OSI 7계층 각 계층의 역할은 무엇인가요?'")
+            guide = MessageComposer()
+            guide.text("💬 특정 개념에 대해 질문하실 수 있습니다.")
+            guide.text("'질문 [주제] [질문내용]' 형식으로 입력해주세요. 예: '질문 OSI 7계층 각 계층의 역할은 무엇인가요?'")
+            await guide.send(say)
             return
 
         elif text == "3" or "면접" in text:
-            # 면접 질문 모드로 전환
-            steps = await start_interview_session(topic)
-            user_state[user]["mode"] = LearningMode.INTERVIEW
-            user_state[user]["interview_index"] = 0
+            if await is_rate_limited(user, say):
+                return
 
+            # 면접 질문 모드로 전환 (미리 생성한 질문이 있으면 사용)
+            questions = await prefetcher.take(user, "interview")
+            steps = await start_interview_session(topic, user_level=interview_level(session), questions=questions, user=user)
+            prefetcher.on_transition(user, await session_store.patch(user, mode=LearningMode.INTERVIEW, interview_index=0))
+
+            composer = MessageComposer()
             for step in steps:
-                await say(step)
+                composer.text(step)
+            await composer.send(say)
             return
 
         else:
@@ -973,59 +942,50 @@ async def handle_message(body, say):
             return
 
     # 7. 정답 확인 요청
-    if user_state.get(user, {}).get("mode") == LearningMode.QUIZ and text == "정답 확인":
-        await say(
-            blocks=[
-                {
-                    "type": "section",
-                    "text": {
-                        "type": "mrkdwn",
-                        "text": "📝 *퀴즈 정답입니다*"
-                    }
-                }
-            ]
-        )
+    if session.get("mode") == LearningMode.QUIZ and text == "정답 확인":
+        # 정답, 문제별 결과, 다음 선택지를 가능한 한 메시지로 전송
+        composer = MessageComposer()
+        composer.text("📝 *퀴즈 정답입니다*")
 
-        for i, question in enumerate(user_state[user].get("quiz_questions", [])):
+        for i, question in enumerate(session.get("quiz_questions", [])):
             if question["type"] == "OX":
                 # OX 문제 정답 표시 개선
                 correct_answer = question["answer"]
 
                 # 사용자 답변 확인 (버튼 또는 텍스트 입력)
                 user_answer = ""
-                if "user_quiz_ox_answers" in user_state.get(user, {}) and i in user_state[user]["user_quiz_ox_answers"]:
-                    user_answer = user_state[user]["user_quiz_ox_answers"][i]
+                # 버튼 답변은 문자열 인덱스로 저장됨
+                if str(i) in session.get("user_quiz_ox_answers", {}):
+                    user_answer = session["user_quiz_ox_answers"][str(i)]
 
                 is_correct = user_answer == correct_answer
 
                 result_icon = "✅" if is_correct else "❌"
                 result_text = "정답입니다!" if is_correct else "오답입니다."
 
-                await say(
-                    blocks=[
-                        {
-                            "type": "section",
-                            "text": {
-                                "type": "mrkdwn",
-                                "text": f"*{i+1}. [OX 문제]* {question['question_text']}"
-                            }
-                        },
-                        {
-                            "type": "section",
-                            "text": {
-                                "type": "mrkdwn",
-                                "text": f"*정답: {correct_answer}*"
-                            }
-                        },
-                        {
-                            "type": "section",
-                            "text": {
-                                "type": "mrkdwn",
-                                "text": f"{result_icon} {result_text}" + (f" 입력하신 답변: {user_answer}" if user_answer else "")
-                            }
+                composer.blocks([
+                    {
+                        "type": "section",
+                        "text": {
+                            "type": "mrkdwn",
+                            "text": f"*{i+1}. [OX 문제]* {question['question_text']}"
                         }
-                    ]
-                )
+                    },
+                    {
+                        "type": "section",
+                        "text": {
+                            "type": "mrkdwn",
+                            "text": f"*정답: {correct_answer}*"
+                        }
+                    },
+                    {
+                        "type": "section",
+                        "text": {
+                            "type": "mrkdwn",
+                            "text": f"{result_icon} {result_text}" + (f" 입력하신 답변: {user_answer}" if user_answer else "")
+                        }
+                    }
+                ])
             elif question["type"] == "객관식":
                 # 객관식 정답 개선
                 correct_answer_idx = ord(question["answer"]) - ord('A')
@@ -1039,110 +999,112 @@ async def handle_message(body, say):
                     else:
                         options_text.append(f"{option_letter}. {opt}")
 
-                await say(
-                    blocks=[
-                        {
-                            "type": "section",
-                            "text": {
-                                "type": "mrkdwn",
-                                "text": f"*{i+1}. [객관식 문제]* {question['question_text']}"
-                            }
-                        },
-                        {
-                            "type": "section",
-                            "text": {
-                                "type": "mrkdwn",
-                                "text": "*정답:*\n" + "\n".join(options_text)
-                            }
+                composer.blocks([
+                    {
+                        "type": "section",
+                        "text": {
+                            "type": "mrkdwn",
+                            "text": f"*{i+1}. [객관식 문제]* {question['question_text']}"
                         }
-                    ]
-                )
+                    },
+                    {
+                        "type": "section",
+                        "text": {
+                            "type": "mrkdwn",
+                            "text": "*정답:*\n" + "\n".join(options_text)
+                        }
+                    }
+                ])
             else:
                 # 주관식 정답 개선
-                await say(
-                    blocks=[
-                        {
-                            "type": "section",
-                            "text": {
-                                "type": "mrkdwn",
-                                "text": f"*{i+1}. [주관식 문제]* {question['question_text']}"
-                            }
-                        },
-                        {
-                            "type": "section",
-                            "text": {
-                                "type": "mrkdwn",
-                                "text": f"*모범 답안:* {question['answer']}"
-                            }
+                composer.blocks([
+                    {
+                        "type": "section",
+                        "text": {
+                            "type": "mrkdwn",
+                            "text": f"*{i+1}. [주관식 문제]* {question['question_text']}"
                         }
-                    ]
-                )
+                    },
+                    {
+                        "type": "section",
+                        "text": {
+                            "type": "mrkdwn",
+                            "text": f"*모범 답안:* {question['answer']}"
+                        }
+                    }
+                ])
 
         # 면접 연습 권유 메시지 개선
-        await say(
-            blocks=[
-                {
-                    "type": "section",
-                    "text": {
-                        "type": "mrkdwn",
-                        "text": "🎉 *퀴즈가 끝났습니다. 다음으로 무엇을 하시겠습니까?*"
-                    }
-                },
-                {
-                    "type": "actions",
-                    "elements": [
-                        {
-                            "type": "button",
-                            "text": {
-                                "type": "plain_text",
-                                "text": "1️⃣ 면접 질문 연습",
-                                "emoji": True
-                            },
-                            "value": "interview_practice",
-                            "action_id": "select_interview_practice"
+        composer.blocks([
+            {
+                "type": "section",
+                "text": {
+                    "type": "mrkdwn",
+                    "text": "🎉 *퀴즈가 끝났습니다. 다음으로 무엇을 하시겠습니까?*"
+                }
+            },
+            {
+                "type": "actions",
+                "elements": [
+                    {
+                        "type": "button",
+                        "text": {
+                            "type": "plain_text",
+                            "text": "1️⃣ 면접 질문 연습",
+                            "emoji": True
                         },
-                        {
-                            "type": "button",
-                            "text": {
-                                "type": "plain_text",
-                                "text": "2️⃣ 새 주제 공부",
-                                "emoji": True
-                            },
-                            "value": "new_topic",
-                            "action_id": "select_new_topic"
+                        "value": "interview_practice",
+                        "action_id": "select_interview_practice"
+                    },
+                    {
+                        "type": "button",
+                        "text": {
+                            "type": "plain_text",
+                            "text": "2️⃣ 새 주제 공부",
+                            "emoji": True
                         },
-                        {
-                            "type": "button",
-                            "text": {
-                                "type": "plain_text",
-                                "text": "3️⃣ 질문하기",
-                                "emoji": True
-                            },
-                            "value": "ask_question",
-                            "action_id": "select_ask_question"
-                        }
-                    ]
-                }
-            ]
-        )
-        user_state[user]["mode"] = "after_quiz"
+                        "value": "new_topic",
+                        "action_id": "select_new_topic"
+                    },
+                    {
+                        "type": "button",
+                        "text": {
+                            "type": "plain_text",
+                            "text": "3️⃣ 질문하기",
+                            "emoji": True
+                        },
+                        "value": "ask_question",
+                        "action_id": "select_ask_question"
+                    }
+                ]
+            }
+        ])
+        await composer.send(say)
+        prefetcher.on_transition(user, await session_store.patch(user, mode="after_quiz"))
         return
 
     # 8. 퀴즈 후 선택지 처리
-    if user_state.get(user, {}).get("mode") == "after_quiz":
+    if session.get("mode") == "after_quiz":
         if text == "1" or "면접" in text:
-            topic = user_state[user]["topic"]
-            steps = await start_interview_session(topic)
-            user_state[user]["mode"] = LearningMode.INTERVIEW
-            user_state[user]["interview_index"] = 0
+            if await is_rate_limited(user, say):
+                return
+
+            topic = session["topic"]
+            questions = await prefetcher.take(user, "interview")
+            steps = await start_interview_session(topic, user_level=interview_level(session), questions=questions, user=user)
+            prefetcher.on_transition(user, await session_store.patch(user, mode=LearningMode.INTERVIEW, interview_index=0))
 
+            composer = MessageComposer()
             for step in steps:
-                await say(step)
+                composer.text(step)
+            await composer.send(say)
             return
 
         elif text == "2" or "새 주제" in text or "새주제" in text:
             # 주제 선택으로 돌아가기
-            user_state[user] = {"mode": LearningMode.SELECTING_TOPIC}
+            prefetcher.cancel(user)
+            await fsm_checkpointer.reset(user)
+            await session_store.set(user, {"mode": LearningMode.SELECTING_TOPIC})
 
             await say(
                 blocks=[
@@ -1206,8 +1168,10 @@ async def handle_message(body, say):
             return
 
         elif text == "3" or "질문" in text:
-            await say("💬 특정 개념에 대해 질문하실 수 있습니다.")
-            await say("'질문 [주제] [질문내용]' 형식으로 입력해주세요. 예: '질문 OSI 7계층 각 계층의 역할은 무엇인가요?'")
+            guide = MessageComposer()
+            guide.text("💬 특정 개념에 대해 질문하실 수 있습니다.")
+            guide.text("'질문 [주제] [질문내용]' 형식으로 입력해주세요. 예: '질문 OSI 7계층 각 계층의 역할은 무엇인가요?'")
+            await guide.send(say)
             return
 
         else:
@@ -1219,43 +1183,33 @@ async def handle_message(body, say):
         parts = text.split(" ", 2)
         tag_name = parts[1]
         question = parts[2]
-        topic = user_state.get(user, {}).get("topic", "네트워크")  # 기본값 설정
+        topic = session.get("topic", "네트워크")  # 기본값 설정
 
         # 태그 인덱스 찾기
-        tags = user_state.get(user, {}).get("tags", [])
+        tags = session.get("tags", [])
 
         if not tags:
             # 태그가 없으면 기본 태그 생성
             tags = ["OSI 7계층", "TCP/IP", "HTTP", "DNS", "라우팅"]
-            user_state[user]["tags"] = tags
+            await session_store.patch(user, tags=tags)
 
         try:
             tag_index = next((i for i, tag in enumerate(tags) if tag.lower() == tag_name.lower()), 0)
         except:
             tag_index = 0
 
-        # 즉시 응답
-        await say(f"🤔 '{tag_name}'에 대한 질문에 답변을 준비하고 있습니다...")
-
-        # 질문 처리 (백그라운드)
-        answer = await answer_user_question(topic, tag_index, question)
-
-        # 결과 반환 (응답이 길다면 여러 메시지로 나눠서 전송)
-        max_length = 2000
-        if len(answer) <= max_length:
-            await say(f"📝 *{tag_name}*에 대한 질문: '{question}'\n\n{answer}")
-        else:
-            # 긴 응답 분할 전송
-            await say(f"📝 *{tag_name}*에 대한 질문: '{question}'\n")
-
-            parts = []
-            for i in range(0, len(answer), max_length):
-                parts.append(answer[i:i+max_length])
+        if await is_rate_limited(user, say):
+            return
 
-            for i, part in enumerate(parts):
-                await say(f"[{i+1}/{len(parts)}] {part}")
-                import asyncio
-                await asyncio.sleep(0.5)
+        # 자리표시 메시지를 먼저 보내고 생성되는 답변을 스트리밍으로 표시 (길면 이어지는 메시지로 나눠서 전송)
+        stream = SlackStreamWriter(
+            body["event"]["channel"],
+            prefix=f"📝 *{tag_name}*에 대한 질문: '{question}'\n\n",
+            placeholder=f"🤔 '{tag_name}'에 대한 질문에 답변을 준비하고 있습니다..."
+        )
+        await stream.start()
+        answer = await answer_user_question(topic, tag_index, question, on_token=stream.append)
+        await stream.finish(answer)
 
         # 추가 질문 안내
         await say("더 질문하시려면 같은 형식으로 입력해주세요: '질문 [주제] [질문내용]'")
@@ -1311,12 +1265,28 @@ def similar(a, b):
     jaccard = intersection / union
     return jaccard >= 0.3  # 30% 이상 유사하면 유사한 것으로 판단
 
+# 버튼 답변 저장용 세션 update 함수
+def set_answer(field, question_idx, answer):
+    """세션의 답변 맵(field)에 question_idx 번 문제의 답변을 저장하는 함수를 반환합니다."""
+    def _mutate(session):
+        session.setdefault(field, {})[str(question_idx)] = answer
+    return _mutate
+
 # OX 버튼 핸들러 수정
 @slack_app.action(re.compile("ox_answer_(\d+)_([OX])"))
 async def handle_ox_button(ack, body, action, respond):
-    try:
-        await ack()
+    await ack()
+
+    # 같은 버튼 중복 클릭 무시
+    if await is_duplicate_action(body, action):
+        return
+
+    # 같은 사용자의 다른 버튼/메시지 이벤트와 순서대로 처리 (답변 유실 방지)
+    user = body["user"]["id"]
+    job_runner.submit(f"ox_answer:{user}", lambda: process_ox_button(body, action, respond), on_error=respond, key=user)
 
+async def process_ox_button(body, action, respond):
+    try:
         # 액션 ID에서 정보 추출
         match = re.match(r"ox_answer_(\d+)_([OX])", action["action_id"])
         if not match:
@@ -1331,14 +1301,11 @@ async def handle_ox_button(ack, body, action, respond):
         channel = body.get("channel", {}).get("id")
 
         # 현재 사용자 모드 확인
-        current_mode = user_state.get(user, {}).get("mode", None)
+        current_mode = (await session_store.get(user)).get("mode", None)
 
         if current_mode == LearningMode.LEVEL_TEST:
             # 수준 테스트 모드일 경우 OX 답변 저장
-            if "user_ox_answers" not in user_state.get(user, {}):
-                user_state[user]["user_ox_answers"] = {}
-
-            user_state[user]["user_ox_answers"][str(question_idx)] = answer
+            await session_store.update(user, set_answer("user_ox_answers", question_idx, answer))
 
             # 버튼 클릭 확인 메시지 (임시 메시지)
             await slack_client.chat_postEphemeral(
@@ -1376,10 +1343,7 @@ async def handle_ox_button(ack, body, action, respond):
 
         elif current_mode == LearningMode.QUIZ:
             # 퀴즈 모드일 경우 OX 답변 저장
-            if "user_quiz_ox_answers" not in user_state.get(user, {}):
-                user_state[user]["user_quiz_ox_answers"] = {}
-
-            user_state[user]["user_quiz_ox_answers"][str(question_idx)] = answer
+            await session_store.update(user, set_answer("user_quiz_ox_answers", question_idx, answer))
 
             # 버튼 클릭 확인 메시지 (임시 메시지)
             await slack_client.chat_postEphemeral(
@@ -1429,9 +1393,18 @@ async def handle_ox_button(ack, body, action, respond):
 # 객관식 버튼 핸들러 수정
 @slack_app.action(re.compile("mc_answer_(\d+)_([A-D])"))
 async def handle_mc_button(ack, body, action, respond):
-    try:
-        await ack()
+    await ack()
 
+    # 같은 버튼 중복 클릭 무시
+    if await is_duplicate_action(body, action):
+        return
+
+    # 같은 사용자의 다른 버튼/메시지 이벤트와 순서대로 처리 (답변 유실 방지)
+    user = body["user"]["id"]
+    job_runner.submit(f"mc_answer:{user}", lambda: process_mc_button(body, action, respond), on_error=respond, key=user)
+
+async def process_mc_button(body, action, respond):
+    try:
         # 액션 ID에서 정보 추출
         match = re.match(r"mc_answer_(\d+)_([A-D])", action["action_id"])
         if not match:
@@ -1446,14 +1419,11 @@ async def handle_mc_button(ack, body, action, respond):
         channel = body.get("channel", {}).get("id")
 
         # 현재 사용자 모드 확인
-        current_mode = user_state.get(user, {}).get("mode", None)
+        current_mode = (await session_store.get(user)).get("mode", None)
 
         if current_mode == LearningMode.LEVEL_TEST:
             # 수준 테스트 모드일 경우 객관식 답변 저장
-            if "user_mc_answers" not in user_state.get(user, {}):
-                user_state[user]["user_mc_answers"] = {}
-
-            user_state[user]["user_mc_answers"][str(question_idx)] = answer
+            await session_store.update(user, set_answer("user_mc_answers", question_idx, answer))
 
             # 버튼 클릭 확인 메시지 (임시 메시지)
             await slack_client.chat_postEphemeral(
@@ -1491,10 +1461,7 @@ async def handle_mc_button(ack, body, action, respond):
 
         elif current_mode == LearningMode.QUIZ:
             # 퀴즈 모드의 객관식 답변 저장
-            if "user_quiz_mc_answers" not in user_state.get(user, {}):
-                user_state[user]["user_quiz_mc_answers"] = {}
-
-            user_state[user]["user_quiz_mc_answers"][str(question_idx)] = answer
+            await session_store.update(user, set_answer("user_quiz_mc_answers", question_idx, answer))
 
             # 버튼 클릭 확인 메시지 (임시 메시지)
             await slack_client.chat_postEphemeral(
@@ -1542,25 +1509,46 @@ async def handle_mc_button(ack, body, action, respond):
 
 # 면접 연습 및 새 주제 버튼 핸들러 추가
 @slack_app.action("select_interview_practice")
-async def handle_interview_practice(ack, body, say):
+async def handle_interview_practice(ack, body, action, say):
     await ack()
+    if await is_duplicate_action(body, action):
+        return
+    user = body["user"]["id"]
+    job_runner.submit(f"interview_practice:{user}", lambda: process_interview_practice(body, say), on_error=say, key=user)
+
+async def process_interview_practice(body, say):
     user = body["user"]["id"]
-    topic = user_state.get(user, {}).get("topic", "네트워크")
+    say = slack_outbox.sayer(body["channel"]["id"])
+    session = await session_store.get(user)
+    topic = session.get("topic", "네트워크")
+    current_user_id.set(user)
 
-    steps = await start_interview_session(topic)
-    user_state[user]["mode"] = LearningMode.INTERVIEW
-    user_state[user]["interview_index"] = 0
+    if await is_rate_limited(user, say):
+        return
+
+    questions = await prefetcher.take(user, "interview")
+    steps = await start_interview_session(topic, user_level=interview_level(session), questions=questions, user=user)
+    prefetcher.on_transition(user, await session_store.patch(user, mode=LearningMode.INTERVIEW, interview_index=0))
 
+    composer = MessageComposer()
     for step in steps:
-        await say(step)
+        composer.text(step)
+    await composer.send(say)
 
 @slack_app.action("select_new_topic")
 async def handle_new_topic(ack, body, say):
     await ack()
     user = body["user"]["id"]
+    job_runner.submit(f"new_topic:{user}", lambda: process_new_topic(body, say), on_error=say, key=user)
+
+async def process_new_topic(body, say):
+    user = body["user"]["id"]
+    say = slack_outbox.sayer(body["channel"]["id"])
 
     # 주제 선택으로 돌아가기
-    user_state[user] = {"mode": LearningMode.SELECTING_TOPIC}
+    prefetcher.cancel(user)
+    await fsm_checkpointer.reset(user)
+    await session_store.set(user, {"mode": LearningMode.SELECTING_TOPIC})
 
     await say(
         blocks=[
@@ -1647,6 +1635,13 @@ async def handle_ask_question(ack, body, say):
 async def handle_topic_selection(ack, body, action):
     await ack()
 
+    async def report_error(text):
+        slack_outbox.post(channel=body["channel"]["id"], text=text)
+
+    user = body["user"]["id"]
+    job_runner.submit(f"topic_selection:{user}", lambda: process_topic_selection(body, action), on_error=report_error, key=user)
+
+async def process_topic_selection(body, action):
     # 액션 ID에서 주제 추출
     match = re.match(r"topic_(.+)", action["action_id"])
     if match:
@@ -1665,9 +1660,11 @@ async def handle_topic_selection(ack, body, action):
         topic = topic_mapping.get(topic_key, "네트워크")
 
         # 기존 핸들러와 동일한 로직 실행
-        user_state[user] = {"mode": LearningMode.SELECTING_LEVEL, "topic": topic}
+        prefetcher.cancel(user)
+        await fsm_checkpointer.reset(user)
+        await session_store.set(user, {"mode": LearningMode.SELECTING_LEVEL, "topic": topic})
 
-        await slack_client.chat_postMessage(
+        slack_outbox.post(
             channel=body["channel"]["id"],
             blocks=[
                 {
@@ -1729,105 +1726,94 @@ async def handle_topic_selection(ack, body, action):
 @slack_app.action(re.compile("level_(.+)"))
 async def handle_level_selection(ack, body, action):
     await ack()
+    if await is_duplicate_action(body, action):
+        return
+
+    async def report_error(text):
+        slack_outbox.post(channel=body["channel"]["id"], text=text)
 
+    user = body["user"]["id"]
+    job_runner.submit(f"level_selection:{user}", lambda: process_level_selection(body, action), on_error=report_error, key=user)
+
+async def process_level_selection(body, action):
     # 액션 ID에서 레벨 추출
     match = re.match(r"level_(.+)", action["action_id"])
     if match:
         level = match.group(1)
 
         user = body["user"]["id"]
-        topic = user_state.get(user, {}).get("topic", "네트워크")
+        topic = (await session_store.get(user)).get("topic", "네트워크")
+        current_user_id.set(user)
+
+        async def reply(text):
+            slack_outbox.post(channel=body["channel"]["id"], text=text)
+
+        if level != "test" and await is_rate_limited(user, reply):
+            return
+
+        say = slack_outbox.sayer(body["channel"]["id"])
 
         if level == "test":
             # 테스트 모드로 전환
-            user_state[user]["mode"] = LearningMode.LEVEL_TEST
+            await session_store.patch(user, mode=LearningMode.LEVEL_TEST)
 
-            # 테스트 시작 메시지
-            await slack_client.chat_postMessage(
-                channel=body["channel"]["id"],
-                text="📝 *수준 테스트를 시작합니다*"
-            )
-            await slack_client.chat_postMessage(
-                channel=body["channel"]["id"],
-                text="테스트는 OX 문제 2개, 객관식 문제 2개, 주관식 문제 1개로 구성됩니다."
-            )
-            await slack_client.chat_postMessage(
-                channel=body["channel"]["id"],
-                text="🔍 테스트 문제를 생성하고 있습니다..."
-            )
+            # 테스트 시작 메시지 (한 메시지로 전송)
+            intro = MessageComposer()
+            intro.text("📝 *수준 테스트를 시작합니다*")
+            intro.text("테스트는 OX 문제 2개, 객관식 문제 2개, 주관식 문제 1개로 구성됩니다.")
+            intro.text("🔍 테스트 문제를 생성하고 있습니다...")
+            await intro.send(say)
 
             # 테스트 문제 생성 및 표시 로직 호출
             # (여기서 generate_test_questions 함수를 호출하는 로직이 필요하지만, 위 코드에 없어 실제 구현은 생략)
         else:
             # 선택된 레벨로 설정
             level_display = {"beginner": "초급", "intermediate": "중급", "advanced": "고급"}.get(level, "초급")
-            user_state[user]["user_level"] = level
+            await session_store.patch(user, user_level=level)
 
-            await slack_client.chat_postMessage(
-                channel=body["channel"]["id"],
-                text=f"✅ *{level_display}* 수준으로 설정되었습니다. {topic} 학습을 시작합니다!"
-            )
+            intro = MessageComposer()
+            intro.text(f"✅ *{level_display}* 수준으로 설정되었습니다. {topic} 학습을 시작합니다!")
 
             # 수준별 다른 메시지 추가
             if level == "beginner":
-                await slack_client.chat_postMessage(
-                    channel=body["channel"]["id"],
-                    text="🔰 기초 개념부터 차근차근 설명해 드리겠습니다."
-                )
+                intro.text("🔰 기초 개념부터 차근차근 설명해 드리겠습니다.")
             elif level == "intermediate":
-                await slack_client.chat_postMessage(
-                    channel=body["channel"]["id"],
-                    text="🏆 기본 개념은 빠르게 살펴보고 심화 내용을 중점적으로 학습하겠습니다."
-                )
+                intro.text("🏆 기본 개념은 빠르게 살펴보고 심화 내용을 중점적으로 학습하겠습니다.")
             else:  # advanced
-                await slack_client.chat_postMessage(
-                    channel=body["channel"]["id"],
-                    text="🎓 전문적인 내용 위주로 학습을 진행하겠습니다."
-                )
+                intro.text("🎓 전문적인 내용 위주로 학습을 진행하겠습니다.")
+            await intro.send(say)
 
-            # 학습 준비 메시지
-            await slack_client.chat_postMessage(
-                channel=body["channel"]["id"],
-                text="📚 기본 개념을 준비 중입니다... 잠시만 기다려주세요."
-            )
-
-            # 실제 학습 시작 (기존 코드의 로직을 재활용)
-            steps = await run_network_learning_fsm(topic)
+            # 실제 학습 시작 (기존 코드의 로직을 재활용, 설명은 생성되는 대로 스트리밍으로 표시)
+            steps = await start_basic_learning(body["channel"]["id"], topic, user, level)
 
-            # 기존 코드와 같이 메시지 전송
+            # 학습 내용과 완료 안내를 Block Kit 한도 안에서 최소한의 메시지로 전송
+            composer = MessageComposer()
             for step in steps:
-                if step.startswith("🧠") or step.startswith("📚") or step.startswith("📋"):
-                    await slack_client.chat_postMessage(
-                        channel=body["channel"]["id"],
-                        text=step
-                    )
-                else:
-                    await slack_client.chat_postMessage(
-                        channel=body["channel"]["id"],
-                        text=step
-                    )
-                import asyncio
-                await asyncio.sleep(0.5)
+                composer.text(step)
 
             # 학습 완료 안내
-            await slack_client.chat_postMessage(
-                channel=body["channel"]["id"],
-                text="✅ 기본 개념 학습이 완료되었습니다. 더 공부하고 싶으시면 '공부시작'을 다시 입력하시거나 '질문 [주제] [질문내용]' 형식으로 질문해주세요."
-            )
+            composer.text("✅ 기본 개념 학습이 완료되었습니다. 더 공부하고 싶으시면 '공부시작'을 다시 입력하시거나 '질문 [주제] [질문내용]' 형식으로 질문해주세요.")
+            await composer.send(say)
 
-            # 상태 변경
-            user_state[user]["mode"] = "learning_completed"
+            # 상태 변경 (다음 단계인 퀴즈를 미리 생성)
+            prefetcher.on_transition(user, await session_store.patch(user, mode="learning_completed"))
 
 # 테스트 완료 응답 처리 부분 수정
 @slack_app.action("test_done")
-async def handle_test_done(ack, body, respond):
+async def handle_test_done(ack, body, action, respond):
     await ack()
+    if await is_duplicate_action(body, action):
+        return
+    user = body["user"]["id"]
+    job_runner.submit(f"test_done:{user}", lambda: process_test_done(body, respond), on_error=respond, key=user)
 
+async def process_test_done(body, respond):
     user = body["user"]["id"]
     channel = body.get("channel", {}).get("id")
 
     # 테스트 문제와 정답
-    test_questions = user_state.get(user, {}).get("test_questions", [])
+    session = await session_store.get(user)
+    test_questions = session.get("test_questions", [])
 
     if not test_questions:
         await respond("테스트 문제가 없습니다. 다시 테스트를 시작해주세요.")
@@ -1837,15 +1823,15 @@ async def handle_test_done(ack, body, respond):
     answers = []
 
     # 버튼으로 저장된 OX 답변 처리
-    if "user_ox_answers" in user_state.get(user, {}):
-        for q_idx, ans in user_state[user]["user_ox_answers"].items():
+    if "user_ox_answers" in session:
+        for q_idx, ans in session["user_ox_answers"].items():
             q_idx = int(q_idx)
             if q_idx < len(test_questions):
                 answers.append(ans)
 
     # 버튼으로 저장된 객관식 답변 처리
-    if "user_mc_answers" in user_state.get(user, {}):
-        for q_idx, ans in user_state[user]["user_mc_answers"].items():
+    if "user_mc_answers" in session:
+        for q_idx, ans in session["user_mc_answers"].items():
             q_idx = int(q_idx)
             if q_idx < len(test_questions):
                 answers.append(ans)
@@ -1966,21 +1952,20 @@ async def handle_test_done(ack, body, respond):
             })
 
         # 결과 표시
-        await slack_client.chat_postMessage(
+        slack_outbox.post(
             channel=channel,
             blocks=result_blocks,
             text="테스트 결과입니다."
         )
 
-        # 사용자 상태 업데이트
-        user_state[user]["level"] = user_level
-        user_state[user]["mode"] = LearningMode.NONE
+        # 사용자 상태 업데이트 및 테스트 응답 데이터 초기화
+        def finish_test(session):
+            session["level"] = user_level
+            session["mode"] = LearningMode.NONE
+            session.pop("user_ox_answers", None)
+            session.pop("user_mc_answers", None)
 
-        # 테스트 응답 데이터 초기화
-        if "user_ox_answers" in user_state[user]:
-            del user_state[user]["user_ox_answers"]
-        if "user_mc_answers" in user_state[user]:
-            del user_state[user]["user_mc_answers"]
+        await session_store.update(user, finish_test)
 
     except Exception as e:
         logger.error(f"테스트 결과 처리 중 오류: {str(e)}")
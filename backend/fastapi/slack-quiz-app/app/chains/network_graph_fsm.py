@@ -1,12 +1,21 @@
 from langgraph.graph import StateGraph, START, END
-from typing import TypedDict, Literal, List, Dict, Any, cast, Union, Type
+from typing import TypedDict, Literal, List, Dict, Any, cast, Union, Type, Optional, Callable, AsyncIterator, Tuple, Annotated
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import PromptTemplate
-from app.prompts.fsm_prompts import tag_extraction_prompt, concept_explanation_prompt, level_test_prompt, subtopic_extraction_prompt, advanced_topic_prompt, interview_questions_prompt
+from app.prompts.fsm_prompts import PROMPT_VERSION, tag_extraction_prompt, concept_explanation_prompt, level_test_prompt, subtopic_extraction_prompt, advanced_topic_prompt, interview_questions_prompt
 import os
-from app.core.config import OPENAI_API_KEY  # api_key 설정을 위해 config에서 가져옴
-import json
+from app.core.config import OPENAI_API_KEY, TAG_EXPLAIN_CONCURRENCY  # api_key 설정을 위해 config에서 가져옴
+from app.services.llm_cache import llm_cache
+from app.services.singleflight import llm_singleflight
+from app.services.llm_scheduler import llm_scheduler, Priority, estimate_tokens
+from app.services.llm_hedging import llm_hedger, hedge_key
+from app.services.llm_retry import llm_retry, openai_breaker
+from app.services.model_router import model_router
+from app.services.http_clients import openai_http
+from app.services.fsm_checkpoint import fsm_checkpointer
+from app.services.structured_output import structured_output, QUIZ_SCHEMA, LEVEL_TEST_SCHEMA, SUBTOPIC_SCHEMA, INTERVIEW_SCHEMA
 import asyncio
+from contextvars import ContextVar
 
 # API 키 설정 (None이 아닌 경우에만)
 if OPENAI_API_KEY:
@@ -15,7 +24,92 @@ else:
     # 환경 변수에 API 키가 없는 경우 기본 키 설정 (실제 사용 시 교체 필요)
     os.environ["OPENAI_API_KEY"] = "your-openai-api-key-here"
 
-llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.3)
+LLM_TEMPERATURE = 0.3
+
+# 모델별 LangChain 클라이언트 (모델은 템플릿별로 모델 라우터가 선택)
+_llms: Dict[str, ChatOpenAI] = {}
+
+def get_llm(model: str) -> ChatOpenAI:
+    llm = _llms.get(model)
+    if llm is None:
+        # 재시도는 공용 재시도 정책(llm_retry)에서 처리하므로 LangChain 자체 재시도는 끔
+        # 연결은 OpenAI SDK 직접 호출과 같은 공용 연결 풀을 사용
+        llm = _llms[model] = ChatOpenAI(
+            model=model,
+            temperature=LLM_TEMPERATURE,
+            max_retries=0,
+            http_async_client=openai_http
+        )
+    return llm
+
+async def call_llm(
+    prompt: str,
+    priority: int = Priority.INTERACTIVE,
+    on_token: Optional[Callable[[str], None]] = None,
+    template: Optional[str] = None
+) -> str:
+    """
+    FSM 노드 공용 LLM 호출 함수. 동일한 프롬프트는 응답 캐시에서 바로 반환하고,
+    동시에 진행 중인 동일한 프롬프트는 하나의 요청으로 합칩니다.
+    실제 호출은 전역 호출 한도 스케줄러를 거칩니다.
+    on_token을 주면 스트리밍으로 생성하면서 조각마다 호출합니다.
+    (캐시 적중이나 합쳐진 요청이면 호출되지 않으므로 최종 결과는 반환값을 사용할 것)
+    스트리밍이 아닌 호출은 템플릿(template)별 응답 시간 기준으로 느리면 헤징합니다.
+    모델은 모델 라우터가 템플릿별 라우팅 표와 최근 응답 시간/오류 비율을 보고 선택합니다.
+    """
+    model = model_router.choose(template)
+    llm = get_llm(model)
+
+    async def _invoke() -> str:
+        async with llm_scheduler.slot(estimate_tokens(prompt), priority):
+            response = await model_router.track(template, model, lambda: llm.ainvoke(prompt))
+            return str(response.content if hasattr(response, 'content') else response)
+
+    emitted = False
+
+    async def _generate() -> str:
+        nonlocal emitted
+        parts = []
+        async for chunk in llm.astream(prompt):
+            content = str(chunk.content if hasattr(chunk, 'content') else chunk)
+            if content:
+                parts.append(content)
+                emitted = True
+                on_token(content)
+        return "".join(parts)
+
+    async def _stream() -> str:
+        async with llm_scheduler.slot(estimate_tokens(prompt), priority):
+            return await model_router.track(template, model, _generate)
+
+    async def _request() -> str:
+        # OpenAI SDK 직접 호출과 같은 재시도 정책/회로 차단기 사용
+        if on_token is None:
+            return await llm_retry.run(
+                lambda: llm_hedger.run(hedge_key(template, model), _invoke),
+                breaker=openai_breaker
+            )
+        # 스트리밍 조각을 이미 보냈으면 다시 시도하지 않음
+        return await llm_retry.run(_stream, breaker=openai_breaker, can_retry=lambda: not emitted)
+
+    key = llm_cache.make_key(model, prompt, LLM_TEMPERATURE, None, PROMPT_VERSION)
+
+    async def _compute() -> str:
+        return await llm_singleflight.do(key, _request)
+
+    return await llm_cache.get_or_set(key, _compute)
+
+# 목록 필드 리듀서: 목록을 주면 통째로 바꾸고, {번호: 항목}을 주면 그 항목만 바꿈
+def update_items(
+    current: List[Dict[str, Any]],
+    update: Union[List[Dict[str, Any]], Dict[int, Dict[str, Any]]]
+) -> List[Dict[str, Any]]:
+    if isinstance(update, dict):
+        items = list(current)
+        for index, item in update.items():
+            items[index] = item
+        return items
+    return update
 
 class NetworkGraphState(TypedDict):
     topic: str
@@ -24,25 +118,23 @@ class NetworkGraphState(TypedDict):
     explanation: str
     questions: List[Dict[str, Any]]
     user_question: str
-    mode: Literal["explain", "question", "quiz", "level_test", "subtopic_selection", "advanced_topic", "interview"]
+    mode: Literal["explain", "question", "quiz", "level_test", "prepare_next", "subtopic_selection", "advanced_topic", "interview"]
     level_test_questions: List[Dict[str, Any]]
     level_test_responses: List[Dict[str, Any]]
     user_level: str
     subtopics: List[Dict[str, str]]
     selected_subtopic: str
-    interview_questions: List[Dict[str, Any]]
+    interview_questions: Annotated[List[Dict[str, Any]], update_items]
     current_interview_index: int
 
-def extract_tags(state: NetworkGraphState) -> NetworkGraphState:
-    topic = state["topic"]
-    response = llm.invoke(tag_extraction_prompt.format(topic=topic))
-    response_text = response.content if hasattr(response, 'content') else str(response)
-    tags = [line.strip("-• ").strip() for line in response_text.splitlines() if line.strip()]
+# 노드가 반환하는 상태 변경분 (바뀐 필드만 담고, 그래프가 리듀서로 상태에 반영)
+StateUpdate = Dict[str, Any]
 
-    # NetworkGraphState 타입으로 명시적 캐스팅
-    return cast(NetworkGraphState, {
+# 새 주제의 초기 상태 (values로 일부 필드 지정)
+def new_state(topic: str, **values: Any) -> NetworkGraphState:
+    state: Dict[str, Any] = {
         "topic": topic,
-        "tags": tags,
+        "tags": [],
         "current_index": 0,
         "explanation": "",
         "questions": [],
@@ -55,77 +147,127 @@ def extract_tags(state: NetworkGraphState) -> NetworkGraphState:
         "selected_subtopic": "",
         "interview_questions": [],
         "current_interview_index": 0
-    })
-
-def explain_current_tag(state: NetworkGraphState) -> NetworkGraphState:
+    }
+    state.update(values)
+    return cast(NetworkGraphState, state)
+
+# 주제의 핵심 키워드(태그) 목록 추출
+async def extract_topic_tags(topic: str) -> List[str]:
+    response_text = await call_llm(tag_extraction_prompt.format(topic=topic), template="tag_extraction")
+    return [line.strip("-• ").strip() for line in response_text.splitlines() if line.strip()]
+
+async def extract_tags(state: NetworkGraphState) -> StateUpdate:
+    tags = await extract_topic_tags(state["topic"])
+    return {"tags": tags, "current_index": 0, "explanation": ""}
+
+async def explain_current_tag(
+    state: NetworkGraphState,
+    on_token: Optional[Callable[[str], None]] = None
+) -> StateUpdate:
     tag = state["tags"][state["current_index"]]
-    response = llm.invoke(concept_explanation_prompt.format(tag=tag))
-    response_text = response.content if hasattr(response, 'content') else str(response)
-    return cast(NetworkGraphState, {**state, "explanation": response_text})
+    response_text = await call_llm(concept_explanation_prompt.format(tag=tag), on_token=on_token, template="concept_explanation")
+    return {"explanation": response_text}
+
+async def stream_tag_explanations(
+    tags: List[str],
+    ordered: bool = False,
+    concurrency: int = TAG_EXPLAIN_CONCURRENCY
+) -> AsyncIterator[Tuple[int, str]]:
+    """
+    모든 태그의 설명을 최대 concurrency개까지 동시에 생성하면서 완성되는 대로 (태그 번호, 설명)을 반환합니다.
+    ordered=True면 태그 순서대로 반환합니다. (앞 태그가 끝날 때까지 뒤 태그 결과는 기다림)
+    태그 설명은 LLM 응답 캐시에 저장되므로 같은 주제를 공부하는 다른 세션은 바로 받아갑니다.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
 
-def next_tag(state: NetworkGraphState) -> NetworkGraphState:
-    return cast(NetworkGraphState, {**state, "current_index": state["current_index"] + 1, "explanation": ""})
+    async def _explain(index: int) -> Tuple[int, str]:
+        async with semaphore:
+            try:
+                return index, await call_llm(concept_explanation_prompt.format(tag=tags[index]), template="concept_explanation")
+            except Exception as e:
+                # 태그 하나가 실패해도 나머지 설명은 계속 전송
+                return index, f"❌ 설명을 생성하지 못했습니다: {str(e)}"
 
-def answer_user_question(state: NetworkGraphState) -> NetworkGraphState:
+    tasks = [asyncio.ensure_future(_explain(index)) for index in range(len(tags))]
+    try:
+        for next_result in (tasks if ordered else asyncio.as_completed(tasks)):
+            yield await next_result
+    finally:
+        # 중간에 소비를 멈추면 남은 생성을 정리
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+def next_tag(state: NetworkGraphState) -> StateUpdate:
+    return {"current_index": state["current_index"] + 1, "explanation": ""}
+
+async def answer_user_question(state: NetworkGraphState) -> StateUpdate:
     from app.prompts.fsm_prompts import user_question_prompt
 
     question = state["user_question"]
     tag = state["tags"][state["current_index"]]
     topic = state["topic"]
 
-    response = llm.invoke(user_question_prompt.format(
+    response_text = await call_llm(user_question_prompt.format(
         topic=topic, tag=tag, question=question
-    ))
-
-    response_text = response.content if hasattr(response, 'content') else str(response)
-    return cast(NetworkGraphState, {**state, "explanation": response_text, "mode": "explain"})
+    ), template="user_question")
+    return {"explanation": response_text, "mode": "explain"}
 
-def generate_quiz(state: NetworkGraphState) -> NetworkGraphState:
+async def stream_quiz_questions(state: NetworkGraphState) -> AsyncIterator[Dict[str, Any]]:
+    """퀴즈 문제를 생성하면서 문제 하나가 완성될 때마다 (형식을 검증해서) 반환합니다."""
     from app.prompts.fsm_prompts import quiz_generation_prompt
 
-    topic = state["topic"]
-    tags = state["tags"]
+    prompt = quiz_generation_prompt.format(topic=state["topic"], tags=", ".join(state["tags"]))
+    async for question in structured_output.stream(
+        QUIZ_SCHEMA, prompt, lambda on_token: call_llm(prompt, on_token=on_token, template=QUIZ_SCHEMA.name)
+    ):
+        yield question
 
-    response = llm.invoke(quiz_generation_prompt.format(
-        topic=topic, tags=", ".join(tags)
-    ))
+async def generate_quiz(state: NetworkGraphState) -> StateUpdate:
+    topic = state["topic"]
 
     # 퀴즈 형식: [{"type": "객관식", "question": "...", "options": [...], "answer": "..."}, ...]
-    import json
     try:
-        # content가 있는지 확인하고 문자열로 처리
-        content = response.content if hasattr(response, 'content') else str(response)
-        questions = json.loads(str(content))  # 확실하게 문자열 변환
+        questions = [question async for question in stream_quiz_questions(state)]
     except Exception as e:
+        questions = []
+    if not questions:
         # 파싱 오류시 기본 질문
         questions = [{"type": "OX", "question": f"{topic}에 대한 간단한 질문입니다.", "answer": "O"}]
 
-    return cast(NetworkGraphState, {**state, "questions": questions, "mode": "quiz"})
+    return {"questions": questions, "mode": "quiz"}
+
+# 수준 테스트 문제를 생성하면서 문제 하나가 완성될 때마다 반환
+async def stream_level_test_questions(state: NetworkGraphState) -> AsyncIterator[Dict[str, Any]]:
+    prompt = level_test_prompt.format(topic=state["topic"])
+    async for question in structured_output.stream(
+        LEVEL_TEST_SCHEMA, prompt, lambda on_token: call_llm(prompt, on_token=on_token, template=LEVEL_TEST_SCHEMA.name)
+    ):
+        yield question
 
 # 새로 추가된 함수: 사용자 수준 테스트 문제 생성
-def generate_level_test(state: NetworkGraphState) -> NetworkGraphState:
+async def generate_level_test(state: NetworkGraphState) -> StateUpdate:
     topic = state["topic"]
 
     # 수준 테스트 문제 생성
-    response = llm.invoke(level_test_prompt.format(topic=topic))
-    response_text = response.content if hasattr(response, 'content') else str(response)
-
     try:
-        questions = json.loads(str(response_text))
+        questions = [question async for question in stream_level_test_questions(state)]
     except Exception as e:
+        questions = []
+    if not questions:
         # 파싱 오류시 기본 질문
         questions = [
             {"type": "OX", "question": f"{topic}의 기본 개념에 대한 질문입니다.", "answer": "O", "level": "기본", "topic": "기본 개념"},
             {"type": "OX", "question": f"{topic}의 중급 개념에 대한 질문입니다.", "answer": "X", "level": "중급", "topic": "중급 개념"}
         ]
 
-    return cast(NetworkGraphState, {**state, "level_test_questions": questions, "mode": "level_test"})
+    return {"level_test_questions": questions, "mode": "level_test"}
 
 # 사용자 수준 평가 함수
-def evaluate_user_level(state: NetworkGraphState) -> NetworkGraphState:
+def evaluate_user_level(state: NetworkGraphState) -> StateUpdate:
     responses = state["level_test_responses"]
     if not responses:
-        return cast(NetworkGraphState, {**state, "user_level": "beginner"})
+        return {"user_level": "beginner"}
 
     # 정답 수 계산
     correct_count = 0
@@ -145,82 +287,74 @@ def evaluate_user_level(state: NetworkGraphState) -> NetworkGraphState:
     else:
         user_level = "beginner"
 
-    return cast(NetworkGraphState, {**state, "user_level": user_level, "mode": "subtopic_selection"})
+    return {"user_level": user_level, "mode": "subtopic_selection"}
 
 # 세부 주제 추출 함수
-def extract_subtopics(state: NetworkGraphState) -> NetworkGraphState:
+async def extract_subtopics(state: NetworkGraphState) -> StateUpdate:
     topic = state["topic"]
 
-    # 세부 주제 추출
-    response = llm.invoke(subtopic_extraction_prompt.format(topic=topic))
-    response_text = response.content if hasattr(response, 'content') else str(response)
+    # 세부 주제 추출 (함수 호출 형식으로 받아서 검증)
+    subtopics = await structured_output.complete(
+        SUBTOPIC_SCHEMA, subtopic_extraction_prompt.format(topic=topic), temperature=LLM_TEMPERATURE
+    )
 
-    try:
-        subtopics = json.loads(str(response_text))
-    except Exception as e:
+    if not subtopics:
         # 파싱 오류시 기본 주제
         subtopics = [
             {"title": f"{topic} 기본", "description": "기본 개념 설명"},
             {"title": f"{topic} 심화", "description": "심화 개념 설명"}
         ]
 
-    return cast(NetworkGraphState, {**state, "subtopics": subtopics})
+    return {"subtopics": subtopics}
 
 # 심화 주제 학습 함수
-def explain_advanced_topic(state: NetworkGraphState) -> NetworkGraphState:
+async def explain_advanced_topic(
+    state: NetworkGraphState,
+    on_token: Optional[Callable[[str], None]] = None
+) -> StateUpdate:
     topic = state["topic"]
     subtopic = state["selected_subtopic"]
     user_level = state["user_level"]
 
     # 심화 주제 설명
-    response = llm.invoke(advanced_topic_prompt.format(
+    response_text = await call_llm(advanced_topic_prompt.format(
         topic=topic,
         subtopic=subtopic,
         level=user_level
-    ))
-    response_text = response.content if hasattr(response, 'content') else str(response)
+    ), on_token=on_token, template="advanced_topic")
+
+    return {"explanation": response_text, "mode": "advanced_topic"}
 
-    return cast(NetworkGraphState, {**state, "explanation": response_text, "mode": "advanced_topic"})
+# 면접 질문 목록 생성 (함수 호출 형식으로 받아서 검증, 실패하면 빈 목록)
+async def create_interview_questions(topic: str, subtopic: str, user_level: str) -> List[Dict[str, Any]]:
+    return await structured_output.complete(
+        INTERVIEW_SCHEMA,
+        interview_questions_prompt.format(topic=topic, subtopic=subtopic or topic, level=user_level),
+        temperature=LLM_TEMPERATURE
+    )
 
 # 면접 질문 생성 함수
-def generate_interview_questions(state: NetworkGraphState) -> NetworkGraphState:
+async def generate_interview_questions(state: NetworkGraphState) -> StateUpdate:
     topic = state["topic"]
-    subtopic = state["selected_subtopic"] if state["selected_subtopic"] else topic
-    user_level = state["user_level"]
 
-    # 면접 질문 생성
-    response = llm.invoke(interview_questions_prompt.format(
-        topic=topic,
-        subtopic=subtopic,
-        level=user_level
-    ))
-    response_text = response.content if hasattr(response, 'content') else str(response)
+    questions = await create_interview_questions(topic, state["selected_subtopic"], state["user_level"])
 
-    try:
-        questions = json.loads(str(response_text))
-    except Exception as e:
+    if not questions:
         # 파싱 오류시 기본 질문
         questions = [
             {"basic": f"{topic}의 주요 개념은 무엇인가요?", "followup": ["왜 중요한가요?"], "answer": "기본 개념 설명"},
             {"advanced": f"{topic}을 실무에 어떻게 적용할 수 있나요?", "answer": "실무 적용 방법"}
         ]
 
-    return cast(NetworkGraphState, {
-        **state,
-        "interview_questions": questions,
-        "current_interview_index": 0,
-        "mode": "interview"
-    })
+    # 몇 번째 질문부터 볼지(current_interview_index)와 mode는 단계를 요청할 때 지정
+    return {"interview_questions": questions}
 
 # 다음 면접 질문으로 이동
-def next_interview_question(state: NetworkGraphState) -> NetworkGraphState:
-    return cast(NetworkGraphState, {
-        **state,
-        "current_interview_index": state["current_interview_index"] + 1
-    })
+def next_interview_question(state: NetworkGraphState) -> StateUpdate:
+    return {"current_interview_index": state["current_interview_index"] + 1}
 
 # 인터뷰 질문 가져오기
-def get_interview_question(state: NetworkGraphState) -> NetworkGraphState:
+def get_interview_question(state: NetworkGraphState) -> StateUpdate:
     """
     현재 인덱스의 인터뷰 질문을 가져옵니다.
     """
@@ -228,10 +362,12 @@ def get_interview_question(state: NetworkGraphState) -> NetworkGraphState:
 
     # 인덱스가 범위를 벗어난 경우 처리
     if index >= len(state["interview_questions"]):
-        return state
+        return {}
 
-    # 현재 질문 정보 추출
+    # 현재 질문 정보 추출 (이미 형식을 통일한 질문이면 바꿀 것 없음)
     current_question = state["interview_questions"][index]
+    if "question" in current_question:
+        return {}
 
     # 기본 질문이 'basic' 키에 있고, 심화 질문이 'advanced' 키에 있는 경우 처리
     if "basic" in current_question:
@@ -247,121 +383,178 @@ def get_interview_question(state: NetworkGraphState) -> NetworkGraphState:
         "answer": current_question.get("answer", "")
     }
 
-    # 해당 인덱스의 질문 업데이트
-    interview_questions = state["interview_questions"].copy()
-    interview_questions[index] = {**current_question, **updated_question}
-
-    return cast(NetworkGraphState, {
-        **state,
-        "interview_questions": interview_questions
-    })
+    # 해당 인덱스의 질문만 업데이트 (목록 교체는 update_items 리듀서가 처리)
+    return {"interview_questions": {index: {**current_question, **updated_question}}}
 
+# 학습 단계(mode)별로 아직 실행하지 않은 노드부터 시작 (체크포인트에 결과가 있으면 이전 노드는 건너뜀)
 # 타입 힌팅 없이 조건부 라우팅 함수 정의 (LangGraph는 이 함수의 반환 타입을 자체적으로 처리함)
 def decide_next_step(state):
-    # 모드에 따라 다음 단계 결정
-    if state["mode"] == "question":
-        return "answer_question"
+    mode = state["mode"]
 
-    if state["mode"] == "quiz":
+    # 기본 개념 설명 / 사용자 질문 답변은 태그가 필요
+    if mode in ("explain", "question"):
+        if not state["tags"]:
+            return "extract_tags"
+        return "explain_tag" if mode == "explain" else "answer_question"
+
+    if mode == "quiz":
         return "generate_quiz"
 
-    if state["mode"] == "level_test":
-        return "generate_level_test"
+    # 수준 테스트 채점 (채점은 사용자 답변만 사용하므로 테스트는 다시 만들지 않음, 추천할 세부 주제가 없으면 먼저 추출)
+    if mode == "level_test":
+        return "evaluate_user_level" if state["subtopics"] else "extract_subtopics"
+
+    # 수준이 정해진 뒤 다음 단계 준비 (세부 주제와 그 수준의 면접 질문 중 없는 것을 동시에 생성)
+    # 두 노드는 서로 다른 필드만 바꾸므로 동시에 실행해도 충돌하지 않음
+    if mode == "prepare_next":
+        branches = [
+            node for node, field in (("extract_subtopics", "subtopics"), ("generate_interview_questions", "interview_questions"))
+            if not state[field]
+        ]
+        return branches or END
+
+    # 세부 주제 목록만 필요한 경우
+    if mode == "subtopic_selection":
+        return END if state["subtopics"] else "extract_subtopics"
 
-    if state["mode"] == "subtopic_selection":
-        # 세부 주제가 없으면 추출
+    # 심화 학습 (세부 주제 목록이 없으면 먼저 추출)
+    if mode == "advanced_topic":
         if not state["subtopics"]:
             return "extract_subtopics"
-        # 세부 주제가 선택되었으면 심화 학습
-        if state["selected_subtopic"]:
-            return "explain_advanced_topic"
+        return "explain_advanced_topic"
 
-    if state["mode"] == "advanced_topic":
-        # 심화 학습 후 퀴즈로
-        if state.get("explanation"):
-            return "generate_quiz"
+    # 면접 질문 (질문 목록이 없으면 먼저 생성)
+    if mode == "interview":
+        if not state["interview_questions"]:
+            return "generate_interview_questions"
+        return "get_interview_question"
 
-    if state["mode"] == "interview":
-        return "generate_interview_questions"
+    return END
 
-    # 모든 태그를 설명했으면 수준 테스트로
-    if state["current_index"] >= len(state["tags"]):
-        return "generate_level_test"
+# 태그를 추출한 뒤 (추출에 실패하면 종료)
+def after_extract_tags(state):
+    return decide_next_step(state) if state["tags"] else END
 
-    # 그 외에는 계속 설명
-    return "explain_tag"
+# 세부 주제를 추출한 뒤 (수준 테스트 채점 중이면 채점으로 합류, 심화 학습 중이고 주제를 골랐으면 설명)
+def after_extract_subtopics(state):
+    if state["mode"] == "level_test":
+        return "evaluate_user_level"
+    if state["mode"] == "advanced_topic" and state["selected_subtopic"]:
+        return "explain_advanced_topic"
+    return END
+
+# 면접 질문을 생성한 뒤 (다음 단계 준비 중이면 생성만 하고 종료)
+def after_generate_interview_questions(state):
+    return END if state["mode"] == "prepare_next" else "get_interview_question"
+
+# 그래프 노드는 state만 받으므로 스트리밍 콜백은 컨텍스트로 전달 (run_step에서 설정)
+current_on_token: ContextVar[Optional[Callable[[str], None]]] = ContextVar("current_on_token", default=None)
+
+async def explain_tag_node(state: NetworkGraphState) -> StateUpdate:
+    return await explain_current_tag(state, on_token=current_on_token.get())
+
+async def explain_advanced_topic_node(state: NetworkGraphState) -> StateUpdate:
+    return await explain_advanced_topic(state, on_token=current_on_token.get())
 
 graph = StateGraph(state_schema=NetworkGraphState)
 graph.add_node("extract_tags", extract_tags)
-graph.add_node("explain_tag", explain_current_tag)
-graph.add_node("next_tag", next_tag)
+graph.add_node("explain_tag", explain_tag_node)
 graph.add_node("answer_question", answer_user_question)
 graph.add_node("generate_quiz", generate_quiz)
-graph.add_node("generate_level_test", generate_level_test)
 graph.add_node("evaluate_user_level", evaluate_user_level)
 graph.add_node("extract_subtopics", extract_subtopics)
-graph.add_node("explain_advanced_topic", explain_advanced_topic)
+graph.add_node("explain_advanced_topic", explain_advanced_topic_node)
 graph.add_node("generate_interview_questions", generate_interview_questions)
-graph.add_node("next_interview_question", next_interview_question)
+graph.add_node("get_interview_question", get_interview_question)
 
-# 진입점 설정
-graph.set_entry_point("extract_tags")
+# 진입점: 요청한 단계에 맞는 노드로 이동
+graph.add_conditional_edges(START, decide_next_step)
 
 # 상태 전이 로직
-graph.add_conditional_edges(
-    "extract_tags",
-    decide_next_step
-)
-
-graph.add_conditional_edges(
-    "next_tag",
-    decide_next_step
-)
-
-# 기존 엣지
-graph.add_edge("explain_tag", "next_tag")
-graph.add_edge("answer_question", "next_tag")
-
-# 새로운 엣지
-graph.add_edge("generate_level_test", "evaluate_user_level")
-graph.add_edge("evaluate_user_level", "extract_subtopics")
-graph.add_edge("extract_subtopics", "explain_advanced_topic")
-graph.add_edge("explain_advanced_topic", "generate_quiz")
-graph.add_edge("generate_quiz", "generate_interview_questions")
-graph.add_edge("generate_interview_questions", "next_interview_question")
-graph.add_edge("next_interview_question", END)
+graph.add_conditional_edges("extract_tags", after_extract_tags)
+graph.add_edge("explain_tag", END)
+graph.add_edge("answer_question", END)
+graph.add_edge("generate_quiz", END)
+
+graph.add_conditional_edges("extract_subtopics", after_extract_subtopics)
+graph.add_edge("evaluate_user_level", END)
+graph.add_edge("explain_advanced_topic", END)
+
+graph.add_conditional_edges("generate_interview_questions", after_generate_interview_questions)
+graph.add_edge("get_interview_question", END)
 
+# LLM 노드가 모두 async 함수이므로 컴파일된 그래프는 ainvoke/astream으로 실행해야 함
+# 체크포인터 없이 한 번 실행하고 끝나는 그래프 (사용자를 모르는 호출용)
 network_graph_fsm = graph.compile()
 
+# 사용자별 체크포인터를 쓰는 그래프 (체크포인터가 바뀌면 다시 컴파일)
+_study_graph: Optional[Tuple[Any, Any]] = None
+
+def get_study_graph() -> Any:
+    global _study_graph
+    saver = fsm_checkpointer.saver
+    if _study_graph is None or _study_graph[0] is not saver:
+        _study_graph = (saver, graph.compile(checkpointer=saver))
+    return _study_graph[1]
+
+async def run_step(
+    user: Optional[str],
+    topic: str,
+    on_token: Optional[Callable[[str], None]] = None,
+    **values: Any
+) -> NetworkGraphState:
+    """
+    학습 흐름의 한 단계(values["mode"])를 컴파일된 그래프로 실행하고 최종 상태를 반환합니다.
+    values에는 이번 단계에서 바꿀 상태 필드(mode, 사용자 답변 등)만 넘깁니다.
+
+    - user가 있으면 Slack 사용자 ID를 thread_id로 체크포인트에 저장된 상태에서 이어서 실행합니다.
+      이미 만든 태그, 세부 주제, 면접 질문이 있으면 그 노드는 다시 실행하지 않습니다.
+    - 저장된 상태의 주제가 다르면 (새 주제 학습) 이전 체크포인트를 지우고 새로 시작합니다.
+    - 체크포인트는 단계가 끝날 때 한 번만 저장하고 사용자별로 마지막 것만 남깁니다.
+      (중간에 실패하면 이전 단계 상태에서 다시 실행)
+    - 같은 사용자의 단계는 작업 실행기(job_runner)에서 순서대로 실행되므로 동시에 실행되지 않습니다.
+    - user가 없으면 저장하지 않고 한 번만 실행합니다.
+    """
+    on_token_reset = current_on_token.set(on_token)
+    try:
+        if not user:
+            return cast(NetworkGraphState, await network_graph_fsm.ainvoke(new_state(topic, **values)))
+
+        study_graph = get_study_graph()
+        config = {"configurable": {"thread_id": user}}
+        saved = (await study_graph.aget_state(config)).values
+
+        if saved.get("topic") == topic:
+            fsm_checkpointer.count("resumed")
+            inputs: Dict[str, Any] = values
+        else:
+            if saved:
+                await fsm_checkpointer.reset(user)
+            fsm_checkpointer.count("started")
+            inputs = new_state(topic, **values)
+
+        state = await study_graph.ainvoke(inputs, config, durability="exit")
+        await fsm_checkpointer.prune(user)
+        return cast(NetworkGraphState, state)
+    finally:
+        current_on_token.reset(on_token_reset)
+
 # 네트워크 FSM 실행 함수 (핵심 함수)
-async def run_fsm(topic: str) -> NetworkGraphState:
+async def run_fsm(
+    topic: str,
+    on_token: Optional[Callable[[str], None]] = None,
+    tags: Optional[List[str]] = None,
+    user: Optional[str] = None
+) -> NetworkGraphState:
     """
     주어진 주제에 대한 네트워크 학습 FSM을 실행하고 최종 상태를 반환합니다.
+    on_token을 주면 기본 개념 설명을 스트리밍으로 생성하면서 조각마다 호출합니다.
+    tags를 주면 (이미 추출한 태그) 태그 추출을 건너뜁니다.
+    user를 주면 사용자의 학습 흐름 체크포인트에서 이어서 실행합니다.
     """
-    # 초기 상태 설정
-    initial_state: NetworkGraphState = {
-        "topic": topic,
-        "tags": [],
-        "current_index": 0,
-        "explanation": "",
-        "questions": [],
-        "user_question": "",
-        "mode": "explain",
-        "level_test_questions": [],
-        "level_test_responses": [],
-        "user_level": "beginner",
-        "subtopics": [],
-        "selected_subtopic": "",
-        "interview_questions": [],
-        "current_interview_index": 0
-    }
-
-    # 순차적으로 FSM 단계 실행
-    state = extract_tags(initial_state)
-
-    # 기본 개념 설명 (첫 번째 태그만)
-    if state["tags"]:
-        state = explain_current_tag(state)
+    values: Dict[str, Any] = {"mode": "explain", "current_index": 0, "explanation": ""}
+    if tags:
+        values["tags"] = tags
 
-    # 태그 추출 및 기본 설명까지만 진행하고 반환
-    return state
\ No newline at end of file
+    # 태그 추출 및 기본 설명(첫 번째 태그만)까지만 진행하고 반환
+    return await run_step(user, topic, on_token=on_token, **values)
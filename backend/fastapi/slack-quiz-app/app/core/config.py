@@ -5,4 +5,87 @@ load_dotenv()
 
 SLACK_BOT_TOKEN = os.getenv("SLACK_BOT_TOKEN")
 SLACK_SIGNING_SECRET = os.getenv("SLACK_SIGNING_SECRET")
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
\ No newline at end of file
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+
+# LLM 응답 캐시 설정
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024"))
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", "86400"))  # 신선한 응답으로 취급하는 시간(초)
+LLM_CACHE_STALE_TTL = float(os.getenv("LLM_CACHE_STALE_TTL", "3600"))  # TTL 이후 오래된 응답을 내주며 갱신하는 시간(초)
+LLM_CACHE_DB_PATH = os.getenv("LLM_CACHE_DB_PATH")  # 지정하면 SQLite 디스크 캐시 사용
+
+# OpenAI 호출 한도 설정 (계정 한도보다 약간 낮게 잡을 것)
+LLM_RPM_LIMIT = int(os.getenv("LLM_RPM_LIMIT", "500"))  # 분당 요청 수
+LLM_TPM_LIMIT = int(os.getenv("LLM_TPM_LIMIT", "200000"))  # 분당 토큰 수
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))  # 동시 요청 수
+LLM_BACKGROUND_RESERVE = float(os.getenv("LLM_BACKGROUND_RESERVE", "0.2"))  # 백그라운드 작업이 남겨둬야 하는 예산과 동시 요청 수 비율
+
+# 느린 LLM 요청 헤징 설정
+LLM_HEDGE_ENABLED = os.getenv("LLM_HEDGE_ENABLED", "true").lower() == "true"
+LLM_HEDGE_QUANTILE = float(os.getenv("LLM_HEDGE_QUANTILE", "0.9"))  # 이 분위수 응답 시간이 지나면 요청을 하나 더 보냄
+LLM_HEDGE_BUDGET = float(os.getenv("LLM_HEDGE_BUDGET", "0.05"))  # 전체 요청 대비 추가 요청 비율 상한
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))  # 헤징을 시작하기 전에 필요한 응답 시간 기록 수
+LLM_HEDGE_MIN_DELAY = float(os.getenv("LLM_HEDGE_MIN_DELAY", "1"))  # 추가 요청 전 최소 대기 시간(초)
+
+# LLM 호출 재시도/회로 차단 설정
+LLM_RETRY_MAX_ATTEMPTS = int(os.getenv("LLM_RETRY_MAX_ATTEMPTS", "3"))  # 요청 하나의 최대 시도 횟수
+LLM_RETRY_BASE_DELAY = float(os.getenv("LLM_RETRY_BASE_DELAY", "1"))  # 재시도 최소 대기 시간(초)
+LLM_RETRY_MAX_DELAY = float(os.getenv("LLM_RETRY_MAX_DELAY", "20"))  # 재시도 최대 대기 시간(초)
+LLM_BREAKER_FAILURE_THRESHOLD = int(os.getenv("LLM_BREAKER_FAILURE_THRESHOLD", "5"))  # 회로를 여는 연속 실패 수
+LLM_BREAKER_RESET_TIMEOUT = float(os.getenv("LLM_BREAKER_RESET_TIMEOUT", "30"))  # 회로를 연 뒤 다시 시도해보기까지의 시간(초)
+
+# 템플릿별 모델 라우팅 설정
+MODEL_ROUTES = os.getenv("MODEL_ROUTES")  # 기본 라우팅 표를 덮어쓸 JSON (템플릿 -> primary/fallbacks/max_p95/max_error_rate)
+MODEL_HEAVY = os.getenv("MODEL_HEAVY", "gpt-4o")  # 품질이 필요한 템플릿에 쓸 무거운 모델
+MODEL_HEAVY_TEMPLATES = os.getenv("MODEL_HEAVY_TEMPLATES", "")  # 무거운 모델을 우선 사용할 템플릿 (쉼표 구분, 기본값은 없음)
+MODEL_ROUTER_WINDOW = float(os.getenv("MODEL_ROUTER_WINDOW", "300"))  # 모델 상태를 판단할 최근 기록 범위(초)
+MODEL_ROUTER_MIN_SAMPLES = int(os.getenv("MODEL_ROUTER_MIN_SAMPLES", "10"))  # 상태 판단에 필요한 최소 기록 수
+
+# 공용 HTTP 연결 풀 설정 (OpenAI SDK와 LangChain이 하나, Slack SDK가 하나를 함께 사용)
+OPENAI_HTTP_MAX_CONNECTIONS = int(os.getenv("OPENAI_HTTP_MAX_CONNECTIONS", "100"))  # OpenAI 최대 동시 연결 수
+OPENAI_HTTP_MAX_KEEPALIVE = int(os.getenv("OPENAI_HTTP_MAX_KEEPALIVE", "20"))  # 재사용을 위해 열어두는 OpenAI 연결 수
+SLACK_HTTP_MAX_CONNECTIONS = int(os.getenv("SLACK_HTTP_MAX_CONNECTIONS", "50"))  # Slack API 최대 동시 연결 수
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))  # 쉬고 있는 연결을 닫기까지의 시간(초)
+
+# 사용자별 LLM 요청 한도 (토큰 버킷)
+USER_LLM_BURST = float(os.getenv("USER_LLM_BURST", "5"))  # 연속으로 보낼 수 있는 요청 수
+USER_LLM_REFILL_PER_MINUTE = float(os.getenv("USER_LLM_REFILL_PER_MINUTE", "6"))  # 분당 회복되는 요청 수
+
+# 백그라운드 작업 실행 설정
+JOB_MAX_WORKERS = int(os.getenv("JOB_MAX_WORKERS", "32"))  # 동시에 실행할 작업 수
+JOB_MAX_PENDING = int(os.getenv("JOB_MAX_PENDING", "1000"))  # 실행 대기 중인 작업 최대 수
+JOB_TIMEOUT = float(os.getenv("JOB_TIMEOUT", "180"))  # 작업 하나의 최대 실행 시간(초)
+
+# Slack 재전송/중복 클릭 방지 설정
+EVENT_DEDUP_TTL = float(os.getenv("EVENT_DEDUP_TTL", "3600"))  # 이벤트 ID 기억 시간(초)
+ACTION_DEDUP_TTL = float(os.getenv("ACTION_DEDUP_TTL", "30"))  # 같은 버튼 중복 클릭 무시 시간(초)
+DEDUP_MAX_ENTRIES = int(os.getenv("DEDUP_MAX_ENTRIES", "100000"))
+DEDUP_DB_PATH = os.getenv("DEDUP_DB_PATH")  # 지정하면 여러 워커가 공유하는 SQLite 저장소 사용
+
+# 사용자 학습 세션 저장소 설정
+SESSION_BACKEND = os.getenv("SESSION_BACKEND", "memory")  # memory / sqlite / redis
+SESSION_DB_PATH = os.getenv("SESSION_DB_PATH", "sessions.db")
+SESSION_REDIS_URL = os.getenv("SESSION_REDIS_URL", "redis://localhost:6379/0")
+SESSION_IDLE_TTL = int(os.getenv("SESSION_IDLE_TTL", "86400"))  # 마지막 활동 후 세션 유지 시간(초)
+SESSION_MAX_ENTRIES = int(os.getenv("SESSION_MAX_ENTRIES", "50000"))  # 메모리 저장소 최대 세션 수
+SESSION_MAX_BYTES = int(os.getenv("SESSION_MAX_BYTES", "268435456"))  # 메모리 저장소 세션 크기 합 한도(바이트, 추정치 기준 256MiB)
+
+# Slack 메시지 전송 큐 설정
+SLACK_CHANNEL_RATE = float(os.getenv("SLACK_CHANNEL_RATE", "1"))  # 채널당 초당 메시지 수 (Slack 권장 한도)
+SLACK_CHANNEL_BURST = float(os.getenv("SLACK_CHANNEL_BURST", "3"))  # 채널당 연속으로 보낼 수 있는 메시지 수
+SLACK_COALESCE_MAX_CHARS = int(os.getenv("SLACK_COALESCE_MAX_CHARS", "2800"))  # 하나로 합칠 텍스트 메시지의 최대 길이 합
+SLACK_STREAM_UPDATE_INTERVAL = float(os.getenv("SLACK_STREAM_UPDATE_INTERVAL", "1"))  # 스트리밍 응답 메시지 수정 간격(초)
+SLACK_STREAM_MESSAGE_CHARS = int(os.getenv("SLACK_STREAM_MESSAGE_CHARS", "3000"))  # 스트리밍 응답 메시지 하나의 최대 길이
+
+# 다음 학습 단계 미리 생성 설정
+PREFETCH_ENABLED = os.getenv("PREFETCH_ENABLED", "true").lower() == "true"
+PREFETCH_MAX_CONCURRENT = int(os.getenv("PREFETCH_MAX_CONCURRENT", "50"))  # 동시에 진행할 미리 생성 작업 수
+PREFETCH_TIMEOUT = float(os.getenv("PREFETCH_TIMEOUT", "120"))  # 미리 생성 작업 하나의 최대 실행 시간(초)
+
+# 기본 학습 키워드 설명 설정
+TAG_EXPLAIN_ALL = os.getenv("TAG_EXPLAIN_ALL", "false").lower() == "true"  # 첫 키워드만이 아니라 모든 키워드를 설명
+TAG_EXPLAIN_ORDERED = os.getenv("TAG_EXPLAIN_ORDERED", "true").lower() == "true"  # 완성 순서 대신 키워드 순서대로 전송
+TAG_EXPLAIN_CONCURRENCY = int(os.getenv("TAG_EXPLAIN_CONCURRENCY", "4"))  # 요청 하나에서 동시에 생성할 설명 수
+
+# 학습 흐름(LangGraph) 체크포인트 설정 (Slack 사용자 ID별로 진행 중인 학습 상태 저장)
+FSM_CHECKPOINT_BACKEND = os.getenv("FSM_CHECKPOINT_BACKEND", "memory")  # memory / sqlite
+FSM_CHECKPOINT_DB_PATH = os.getenv("FSM_CHECKPOINT_DB_PATH", "fsm_checkpoints.db")
@@ -1,6 +1,30 @@
 from fastapi import FastAPI
-from app.api import slack_router
+from app.api import slack_router, metrics_router
 import app.api.slack.handlers  # 이 줄이 없으면 핸들러 등록 안 됨!
+from app.services.job_runner import job_runner
+from app.services.slack_outbox import slack_outbox
+from app.services.http_clients import start_http_clients, close_http_clients
+from app.services.fsm_checkpoint import fsm_checkpointer
+from app.services.session_store import session_store
 
 app = FastAPI()
-app.include_router(slack_router.router)
\ No newline at end of file
+app.include_router(slack_router.router)
+app.include_router(metrics_router.router)
+
+@app.on_event("startup")
+async def startup():
+    # OpenAI/LangChain/Slack이 함께 쓰는 keep-alive 연결 풀 준비
+    await start_http_clients()
+    # 사용자별 학습 흐름 체크포인트 저장소 준비 (sqlite 설정이면 재시작 후에도 이어서 진행)
+    await fsm_checkpointer.start()
+    # 세션이 만료되거나 밀려난 사용자의 학습 흐름 체크포인트도 함께 정리
+    session_store.on_expire(fsm_checkpointer.discard)
+
+@app.on_event("shutdown")
+async def shutdown():
+    # 진행 중인 백그라운드 작업 정리 후 남은 메시지 전송
+    await job_runner.shutdown()
+    await slack_outbox.flush()
+    await fsm_checkpointer.close()
+    # 모든 전송이 끝난 뒤 연결 풀 정리
+    await close_http_clients()
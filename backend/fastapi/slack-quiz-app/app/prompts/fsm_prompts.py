@@ -1,5 +1,8 @@
 from langchain_core.prompts import PromptTemplate
 
+# 프롬프트 문구를 수정하면 이 값을 올려서 기존 LLM 응답 캐시를 무효화합니다
+PROMPT_VERSION = "1"
+
 tag_extraction_prompt = PromptTemplate.from_template(
     """'{topic}'에 대해 컴퓨터공학적으로 반드시 알아야 할 핵심 개념 키워드를 5~7개 정도 뽑아줘.
 순수 키워드 리스트만 출력해줘. 설명은 포함하지 마."""
@@ -157,4 +160,19 @@ answer_evaluation_prompt = PromptTemplate.from_template(
 }}
 
 JSON 형식만 정확히 출력하고 다른 설명은 포함하지 마세요."""
-)
\ No newline at end of file
+)
+# 구조화된 출력 중 형식이 잘못된 항목 하나만 다시 요청하는 프롬프트
+structured_repair_prompt = PromptTemplate.from_template(
+    """아래 요청에 대한 응답 중 한 항목이 요구된 형식에 맞지 않습니다.
+
+[원래 요청]
+{prompt}
+
+[잘못된 항목]
+{fragment}
+
+[문제점]
+{error}
+
+이 항목 하나만 요구된 형식에 맞게 고쳐서 {function_name} 함수로 제출해주세요. 다른 항목은 다시 만들지 마세요."""
+)
@@ -0,0 +1,103 @@
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.services.session_store import session_store
+from app.services.singleflight import SingleFlight
+
+# 학습 결과물 종류 -> 저장할 세션 필드 (핸들러가 채점 등에 쓰는 기존 필드를 그대로 사용)
+ARTIFACT_FIELDS = {
+    "tags": "tags",
+    "level_test": "test_questions",
+    "subtopics": "subtopics",
+    "interview": "interview_questions",
+    "quiz": "quiz_questions"
+}
+
+# 결과물을 만들 때 사용한 입력을 기록하는 세션 필드 (kind -> key)
+KEYS_FIELD = "artifact_keys"
+
+
+def artifact_key(*parts: Any) -> str:
+    """결과물을 만들 때 사용한 입력으로 키를 만듭니다. (예: artifact_key(topic, subtopic, level))"""
+    return "|".join(str(part) for part in parts)
+
+
+def stored_artifact(session: Dict[str, Any], kind: str, key: str) -> Optional[Any]:
+    """세션 dict에서 key로 만든 kind 결과물을 꺼냅니다. (없으면 None)"""
+    value = session.get(ARTIFACT_FIELDS[kind])
+    if value and (session.get(KEYS_FIELD) or {}).get(kind) == key:
+        return value
+    return None
+
+
+class SessionArtifacts:
+    """
+    세션 단위로 FSM 결과물(태그, 수준 테스트, 세부 주제, 면접 질문, 퀴즈)을 한 번만 생성하고 재사용합니다.
+
+    - 결과물은 세션 필드에 저장하고, 만들 때 사용한 입력(key, 예: 주제와 수준)을 artifact_keys에 함께 기록합니다.
+    - 같은 kind를 같은 key로 다시 요청하면 LLM을 호출하지 않고 저장된 값을 반환합니다.
+      (다음 면접 질문, 수준 테스트 채점, 심화 주제 선택이 처음 보여준 목록을 그대로 사용)
+    - 주제를 바꾸면 세션이 새로 만들어지므로 결과물도 함께 정리됩니다.
+    - user가 없으면 저장하지 않고 매번 생성합니다.
+    """
+
+    def __init__(self):
+        self._flights = SingleFlight()
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    async def get(self, user: Optional[str], kind: str, key: str) -> Optional[Any]:
+        """저장된 결과물을 반환합니다. 없거나 다른 입력으로 만든 결과물이면 None."""
+        if not user:
+            return None
+
+        value = stored_artifact(await session_store.get(user), kind, key)
+        if value is not None:
+            self._count(kind, "hits")
+        return value
+
+    async def put(self, user: Optional[str], kind: str, key: str, value: Any) -> Dict[str, Any]:
+        """결과물을 세션에 저장하고 저장된 세션을 반환합니다."""
+        if not user:
+            return {}
+
+        def _mutate(session: Dict[str, Any]) -> None:
+            session[ARTIFACT_FIELDS[kind]] = value
+            session[KEYS_FIELD] = {**(session.get(KEYS_FIELD) or {}), kind: key}
+
+        return await session_store.update(user, _mutate)
+
+    async def get_or_create(
+        self,
+        user: Optional[str],
+        kind: str,
+        key: str,
+        create: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        저장된 결과물이 있으면 반환하고, 없으면 create()로 만들어서 저장한 뒤 반환합니다.
+        같은 사용자의 같은 결과물을 동시에 요청하면 한 번만 생성합니다.
+        """
+        value = await self.get(user, kind, key)
+        if value is not None:
+            return value
+
+        async def _create() -> Any:
+            created = await create()
+            self._count(kind, "created")
+            if created:
+                await self.put(user, kind, key, created)
+            return created
+
+        if not user:
+            return await _create()
+        return await self._flights.do(f"{user}:{kind}:{key}", _create)
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        return {kind: dict(counts) for kind, counts in self.stats.items()}
+
+    def _count(self, kind: str, name: str) -> None:
+        counts = self.stats.setdefault(kind, {"hits": 0, "created": 0})
+        counts[name] += 1
+
+
+# 프로세스 전역 세션 결과물 저장소
+session_artifacts = SessionArtifacts()
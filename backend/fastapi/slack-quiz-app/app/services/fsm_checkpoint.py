@@ -0,0 +1,130 @@
+import asyncio
+import logging
+from typing import Any, Dict, Optional, Set
+
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.memory import MemorySaver
+
+from app.core.config import FSM_CHECKPOINT_BACKEND, FSM_CHECKPOINT_DB_PATH
+
+logger = logging.getLogger(__name__)
+
+
+class FSMCheckpointer:
+    """
+    학습 흐름(LangGraph) 체크포인터를 관리합니다. thread_id는 Slack 사용자 ID입니다.
+
+    - memory: 프로세스 메모리에 저장 (재시작하면 진행 중인 흐름이 사라짐, 기본값)
+    - sqlite: SQLite 파일에 저장 (재시작 후에도 이어서 진행, langgraph-checkpoint-sqlite 필요)
+    이어서 실행할 때는 마지막 체크포인트만 필요하므로 단계가 끝날 때마다 이전 체크포인트를 지웁니다.
+    (지우지 않으면 단계마다 전체 상태가 하나씩 쌓임)
+    사용자 세션이 만료되거나 밀려나면 discard()로 그 사용자의 체크포인트도 지웁니다.
+    SQLite 연결은 이벤트 루프 안에서 열어야 하므로 start()를 호출하기 전까지는 메모리 체크포인터를 사용합니다.
+    """
+
+    def __init__(self, backend: str = FSM_CHECKPOINT_BACKEND, db_path: str = FSM_CHECKPOINT_DB_PATH):
+        self.backend = backend
+        self.db_path = db_path
+        self.saver: BaseCheckpointSaver = MemorySaver()
+        self._conn: Optional[Any] = None
+        self._deleting: Set[asyncio.Task] = set()
+        self.stats: Dict[str, int] = {
+            "started": 0,
+            "resumed": 0,
+            "reset": 0,
+            "discarded": 0
+        }
+
+    async def start(self) -> None:
+        """FastAPI 시작 시 호출합니다. sqlite 설정이면 SQLite 체크포인터로 바꿉니다."""
+        if self.backend != "sqlite" or self._conn is not None:
+            return
+
+        try:
+            import aiosqlite
+            from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+        except ImportError:
+            logger.error("langgraph-checkpoint-sqlite가 설치되지 않아 메모리 체크포인터를 사용합니다.")
+            return
+
+        self._conn = await aiosqlite.connect(self.db_path)
+        await self._conn.execute("PRAGMA journal_mode=WAL")
+        saver = AsyncSqliteSaver(self._conn)
+        await saver.setup()
+        self.saver = saver
+        logger.info(f"학습 흐름 체크포인터 시작: sqlite ({self.db_path})")
+
+    async def close(self) -> None:
+        """FastAPI 종료 시 호출합니다."""
+        if self._conn is not None:
+            await self._conn.close()
+            self._conn = None
+            self.saver = MemorySaver()
+
+    async def reset(self, user: str) -> None:
+        """사용자의 체크포인트를 모두 지웁니다. (새 주제를 시작할 때)"""
+        await self.saver.adelete_thread(user)
+        self.stats["reset"] += 1
+
+    def discard(self, user: str) -> None:
+        """
+        세션이 만료되거나 밀려난 사용자의 체크포인트를 지웁니다. (세션 저장소의 동기 콜백)
+        sqlite는 이벤트 루프를 막지 않도록 백그라운드에서 지웁니다.
+        """
+        self.stats["discarded"] += 1
+        if self._conn is None:
+            self.saver.delete_thread(user)
+            return
+
+        task = asyncio.ensure_future(self.saver.adelete_thread(user))
+        self._deleting.add(task)
+        task.add_done_callback(self._deleting.discard)
+
+    async def prune(self, user: str) -> None:
+        """사용자의 마지막 체크포인트만 남기고 지웁니다."""
+        if self._conn is None:
+            await self._prune_memory(user)
+            return
+
+        # checkpoint_id는 시간 순서로 증가하는 UUID
+        for table in ("writes", "checkpoints"):
+            await self._conn.execute(
+                f"DELETE FROM {table} WHERE thread_id = ? AND checkpoint_id < "
+                "(SELECT MAX(checkpoint_id) FROM checkpoints WHERE thread_id = ?)",
+                (user, user)
+            )
+        await self._conn.commit()
+
+    async def _prune_memory(self, user: str) -> None:
+        # MemorySaver 저장 구조에서 이전 체크포인트와 그 체크포인트만 쓰던 채널 값, 쓰기 기록을 지움
+        # (마지막 체크포인트의 채널 값은 다시 직렬화하지 않고 그대로 둠)
+        saver = self.saver
+        serde = saver.serde
+        for ns, checkpoints in saver.storage.get(user, {}).items():
+            if len(checkpoints) <= 1:
+                continue
+
+            latest_id = max(checkpoints)
+            latest, metadata, _ = checkpoints[latest_id]
+            versions = serde.loads_typed(latest)["channel_versions"]
+            for checkpoint_id, (checkpoint, _, _) in list(checkpoints.items()):
+                if checkpoint_id == latest_id:
+                    continue
+                for channel, version in serde.loads_typed(checkpoint)["channel_versions"].items():
+                    if versions.get(channel) != version:
+                        saver.blobs.pop((user, ns, channel, version), None)
+                saver.writes.pop((user, ns, checkpoint_id), None)
+                del checkpoints[checkpoint_id]
+
+            # 이전 체크포인트가 없으므로 부모도 없음
+            checkpoints[latest_id] = (latest, metadata, None)
+
+    def count(self, name: str) -> None:
+        self.stats[name] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "backend": "sqlite" if self._conn is not None else "memory"}
+
+
+# 프로세스 전역 학습 흐름 체크포인터
+fsm_checkpointer = FSMCheckpointer()
@@ -0,0 +1,68 @@
+import logging
+from typing import Optional
+
+import aiohttp
+import httpx
+from openai import AsyncOpenAI
+from slack_sdk.web.async_client import AsyncWebClient
+
+from app.core.config import (
+    OPENAI_API_KEY,
+    SLACK_BOT_TOKEN,
+    OPENAI_HTTP_MAX_CONNECTIONS,
+    OPENAI_HTTP_MAX_KEEPALIVE,
+    SLACK_HTTP_MAX_CONNECTIONS,
+    HTTP_KEEPALIVE_EXPIRY
+)
+
+logger = logging.getLogger(__name__)
+
+# OpenAI 연결 풀 (OpenAI SDK 직접 호출과 모델별 LangChain 클라이언트가 함께 사용)
+# 연결은 첫 요청 때 열리고 keep-alive로 재사용됩니다.
+openai_http = httpx.AsyncClient(
+    limits=httpx.Limits(
+        max_connections=OPENAI_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=OPENAI_HTTP_MAX_KEEPALIVE,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+    ),
+    timeout=httpx.Timeout(60.0, connect=5.0)
+)
+
+# 재시도는 공용 재시도 정책(llm_retry)에서 처리하므로 SDK 자체 재시도는 끔
+openai_client = AsyncOpenAI(api_key=OPENAI_API_KEY, max_retries=0, http_client=openai_http)
+
+# Slack Web API 클라이언트 (Bolt 앱, 핸들러, 전송 큐가 함께 사용)
+# session이 없으면 Slack SDK가 요청마다 새 연결을 만들므로 시작 시 공용 세션을 연결합니다.
+slack_client = AsyncWebClient(token=SLACK_BOT_TOKEN)
+
+_slack_session: Optional[aiohttp.ClientSession] = None
+
+
+async def start_http_clients() -> None:
+    """FastAPI 시작 시 호출합니다. Slack 공용 세션(연결 풀)을 만듭니다."""
+    global _slack_session
+    if _slack_session is not None and not _slack_session.closed:
+        return
+
+    # aiohttp 세션은 실행 중인 이벤트 루프 안에서 만들어야 함
+    _slack_session = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(
+            limit=SLACK_HTTP_MAX_CONNECTIONS,
+            keepalive_timeout=HTTP_KEEPALIVE_EXPIRY,
+            ttl_dns_cache=300
+        )
+    )
+    slack_client.session = _slack_session
+    logger.info("공용 HTTP 연결 풀 시작")
+
+
+async def close_http_clients() -> None:
+    """FastAPI 종료 시 호출합니다. 열려 있는 연결을 모두 닫습니다."""
+    global _slack_session
+    if _slack_session is not None:
+        slack_client.session = None
+        await _slack_session.close()
+        _slack_session = None
+
+    await openai_http.aclose()
+    logger.info("공용 HTTP 연결 풀 종료")
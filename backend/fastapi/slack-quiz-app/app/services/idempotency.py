@@ -0,0 +1,133 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from app.core.config import (
+    EVENT_DEDUP_TTL,
+    ACTION_DEDUP_TTL,
+    DEDUP_MAX_ENTRIES,
+    DEDUP_DB_PATH
+)
+
+
+class MemoryDedupStore:
+    """프로세스 메모리에 키를 TTL 동안 기억하는 중복 방지 저장소 (최대 개수 제한)"""
+
+    def __init__(self, max_entries: int = DEDUP_MAX_ENTRIES):
+        self.max_entries = max_entries
+        # key -> 만료 시각
+        self._entries: "OrderedDict[str, float]" = OrderedDict()
+
+    async def claim(self, key: str, ttl: float) -> bool:
+        """
+        키를 처음 보는 경우에만 True를 반환하고 기록합니다.
+        TTL 안에 같은 키가 다시 오면 False를 반환합니다.
+        """
+        now = time.time()
+        expires_at = self._entries.get(key)
+        if expires_at is not None and expires_at > now:
+            return False
+
+        self._entries[key] = now + ttl
+        self._entries.move_to_end(key)
+        self._evict(now)
+        return True
+
+    def _evict(self, now: float) -> None:
+        # 오래된 항목부터 만료된 것 정리
+        while self._entries:
+            expires_at = next(iter(self._entries.values()))
+            if expires_at > now and len(self._entries) <= self.max_entries:
+                break
+            self._entries.popitem(last=False)
+
+
+class SQLiteDedupStore:
+    """여러 uvicorn 워커가 같은 파일을 공유할 수 있는 SQLite 중복 방지 저장소"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    async def claim(self, key: str, ttl: float) -> bool:
+        return await asyncio.to_thread(self._claim, key, ttl)
+
+    def _get_db(self) -> sqlite3.Connection:
+        if self._db is None:
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False, timeout=5)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS slack_dedup (key TEXT PRIMARY KEY, expires_at REAL NOT NULL)"
+            )
+            self._db.commit()
+        return self._db
+
+    def _claim(self, key: str, ttl: float) -> bool:
+        now = time.time()
+        with self._lock:
+            db = self._get_db()
+            # 만료된 키는 지우고 다시 기록할 수 있게 함
+            db.execute("DELETE FROM slack_dedup WHERE key = ? AND expires_at <= ?", (key, now))
+            cursor = db.execute(
+                "INSERT OR IGNORE INTO slack_dedup (key, expires_at) VALUES (?, ?)",
+                (key, now + ttl)
+            )
+            db.commit()
+            return cursor.rowcount == 1
+
+
+def create_dedup_store():
+    if DEDUP_DB_PATH:
+        return SQLiteDedupStore(DEDUP_DB_PATH)
+    return MemoryDedupStore()
+
+
+dedup_store = create_dedup_store()
+
+dedup_stats: Dict[str, int] = {
+    "events_processed": 0,
+    "events_duplicated": 0,
+    "actions_processed": 0,
+    "actions_duplicated": 0
+}
+
+
+async def is_duplicate_event(body: Dict[str, Any]) -> bool:
+    """
+    Slack 이벤트가 이미 처리된 것인지 확인합니다. (재전송 시 같은 event_id로 옴)
+    처음 보는 이벤트면 기록하고 False를 반환합니다.
+    """
+    event_id = body.get("event_id")
+    if not event_id:
+        return False
+
+    if await dedup_store.claim(f"event:{event_id}", EVENT_DEDUP_TTL):
+        dedup_stats["events_processed"] += 1
+        return False
+
+    dedup_stats["events_duplicated"] += 1
+    return True
+
+
+async def is_duplicate_action(body: Dict[str, Any], action: Dict[str, Any]) -> bool:
+    """
+    같은 사용자가 같은 메시지의 같은 버튼을 짧은 시간 안에 다시 누른 것인지 확인합니다.
+    처음 누른 것이면 기록하고 False를 반환합니다.
+    """
+    user = body.get("user", {}).get("id", "")
+    message_ts = (
+        body.get("container", {}).get("message_ts")
+        or body.get("message", {}).get("ts")
+        or ""
+    )
+    key = f"action:{user}:{action.get('action_id', '')}:{message_ts}"
+
+    if await dedup_store.claim(key, ACTION_DEDUP_TTL):
+        dedup_stats["actions_processed"] += 1
+        return False
+
+    dedup_stats["actions_duplicated"] += 1
+    return True
@@ -0,0 +1,175 @@
+import asyncio
+import itertools
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from app.core.config import JOB_MAX_WORKERS, JOB_MAX_PENDING, JOB_TIMEOUT
+from app.services.llm_retry import CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+# 작업 실패 시 사용자에게 알리는 콜백 (오류 메시지를 받아서 전송)
+ErrorReporter = Callable[[str], Awaitable[Any]]
+
+
+class JobRunner:
+    """
+    Slack 핸들러가 바로 응답(ack)하고 오래 걸리는 작업은 백그라운드에서 실행하도록 돕습니다.
+
+    - 동시에 실행되는 작업 수를 max_workers로 제한
+    - 작업마다 timeout 적용
+    - 실패하거나 시간 초과되면 on_error 콜백으로 사용자에게 알림
+    - 같은 key(사용자 ID)로 등록된 작업은 사용자별 메일박스에서 등록 순서대로 하나씩 실행하고,
+      다른 key의 작업은 병렬로 실행 (메일박스는 마지막 작업이 끝나면 바로 정리)
+    """
+
+    def __init__(
+        self,
+        max_workers: int = JOB_MAX_WORKERS,
+        max_pending: int = JOB_MAX_PENDING,
+        timeout: float = JOB_TIMEOUT
+    ):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._tasks: Set[asyncio.Task] = set()
+        # key -> 메일박스에 마지막으로 등록된 작업 (다음 작업은 이 작업이 끝난 뒤 시작)
+        self._mailboxes: Dict[str, asyncio.Task] = {}
+        self._ids = itertools.count(1)
+        self._running = 0
+
+        self.stats: Dict[str, int] = {
+            "submitted": 0,
+            "rejected": 0,
+            "completed": 0,
+            "failed": 0,
+            "timed_out": 0
+        }
+
+    def submit(
+        self,
+        name: str,
+        job: Callable[[], Awaitable[Any]],
+        on_error: Optional[ErrorReporter] = None,
+        timeout: Optional[float] = None,
+        key: Optional[str] = None
+    ) -> Optional[asyncio.Task]:
+        """
+        작업을 백그라운드에서 실행하도록 등록하고 바로 반환합니다.
+
+        Args:
+            name: 로그에 남길 작업 이름
+            job: 실행할 코루틴 함수
+            on_error: 실패/시간 초과 시 사용자에게 알릴 콜백
+            timeout: 작업 타임아웃(초), 없으면 기본값 사용
+            key: 순서를 보장할 단위 (보통 Slack 사용자 ID), 없으면 바로 실행
+
+        Returns:
+            등록된 asyncio.Task (대기 작업이 너무 많아 거절된 경우 None)
+        """
+        if len(self._tasks) >= self.max_pending:
+            self.stats["rejected"] += 1
+            logger.warning(f"작업 대기열이 가득 차서 거절: {name}")
+            if on_error is not None:
+                self._spawn(self._report(on_error, "⏳ 지금 요청이 많아 처리하지 못했습니다. 잠시 후 다시 시도해주세요."))
+            return None
+
+        job_id = next(self._ids)
+        self.stats["submitted"] += 1
+        previous = self._mailboxes.get(key) if key is not None else None
+        task = self._spawn(self._run(f"{name}#{job_id}", job, on_error, timeout or self.timeout, previous))
+
+        if key is not None:
+            self._mailboxes[key] = task
+            task.add_done_callback(lambda done: self._release(key, done))
+        return task
+
+    async def shutdown(self, grace_period: float = 10.0) -> None:
+        """실행 중인 작업을 grace_period 동안 기다린 뒤 남은 작업은 취소합니다."""
+        if not self._tasks:
+            return
+
+        _, pending = await asyncio.wait(set(self._tasks), timeout=grace_period)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            **self.stats,
+            "running": self._running,
+            "pending": len(self._tasks) - self._running,
+            "mailboxes": len(self._mailboxes)
+        }
+
+    def _spawn(self, coro: Awaitable[Any]) -> asyncio.Task:
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def _release(self, key: str, task: asyncio.Task) -> None:
+        # 뒤에 등록된 작업이 없으면 유휴 메일박스 정리
+        if self._mailboxes.get(key) is task:
+            del self._mailboxes[key]
+
+    async def _run(
+        self,
+        name: str,
+        job: Callable[[], Awaitable[Any]],
+        on_error: Optional[ErrorReporter],
+        timeout: float,
+        previous: Optional[asyncio.Task] = None
+    ) -> None:
+        # 같은 메일박스의 앞선 작업이 끝날 때까지 대기 (실패/취소 여부와 무관, 워커 슬롯은 점유하지 않음)
+        if previous is not None:
+            await asyncio.wait({previous})
+
+        # 세마포어는 이벤트 루프 안에서 생성해야 함
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+
+        async with self._semaphore:
+            self._running += 1
+            started_at = time.monotonic()
+            try:
+                await asyncio.wait_for(job(), timeout=timeout)
+                self.stats["completed"] += 1
+
+            except asyncio.TimeoutError:
+                self.stats["timed_out"] += 1
+                logger.error(f"작업 시간 초과: {name} ({timeout}초)")
+                if on_error is not None:
+                    await self._report(on_error, "⌛ 처리 시간이 너무 오래 걸려 중단되었습니다. 다시 시도해주세요.")
+
+            except asyncio.CancelledError:
+                raise
+
+            except CircuitOpenError:
+                self.stats["failed"] += 1
+                logger.warning(f"작업 실패 (LLM 호출 차단 중): {name}")
+                if on_error is not None:
+                    await self._report(on_error, "🚧 AI 응답 서비스가 일시적으로 불안정합니다. 잠시 후 다시 시도해주세요.")
+
+            except Exception as e:
+                self.stats["failed"] += 1
+                logger.exception(f"작업 실패: {name}")
+                if on_error is not None:
+                    await self._report(on_error, f"❗ 요청을 처리하는 중 오류가 발생했습니다: {str(e)}")
+
+            finally:
+                self._running -= 1
+                logger.debug(f"작업 종료: {name} ({time.monotonic() - started_at:.2f}초)")
+
+    async def _report(self, on_error: ErrorReporter, message: str) -> None:
+        try:
+            await on_error(message)
+        except Exception as e:
+            logger.error(f"오류 알림 전송 실패: {str(e)}")
+
+
+# 프로세스 전역 작업 실행기
+job_runner = JobRunner()
@@ -0,0 +1,190 @@
+import asyncio
+import json
+import logging
+import re
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+TokenCallback = Callable[[str], None]
+
+_DONE = object()
+
+_FENCE = re.compile(r"```(?:json)?", re.IGNORECASE)
+_TRAILING_COMMA = re.compile(r",(\s*[\]}])")
+
+
+class InvalidElement:
+    """해석할 수 없었던 배열 원소의 원문 (keep_invalid=True일 때 반환)"""
+
+    __slots__ = ("text",)
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+def loads_lenient(text: str) -> Any:
+    """
+    LLM 출력에서 흔한 형식 오류를 고쳐서 JSON을 해석합니다. 고칠 수 없으면 ValueError를 발생시킵니다.
+
+    - ```json 코드 블록 표시와 앞뒤 설명 문장 제거
+    - 닫는 괄호 바로 앞의 쉼표 제거
+    - 중간에 잘린 배열은 완성된 원소까지만 사용
+    """
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+
+    body = _FENCE.sub("", text)
+    starts = [index for index in (body.find("["), body.find("{")) if index != -1]
+    if not starts:
+        raise ValueError("JSON 값을 찾을 수 없습니다.")
+    body = body[min(starts):]
+    end = max(body.rfind("]"), body.rfind("}"))
+
+    for candidate in (body[:end + 1], _TRAILING_COMMA.sub(r"\1", body[:end + 1])):
+        try:
+            return json.loads(candidate)
+        except ValueError:
+            continue
+
+    if body.startswith("["):
+        items = JsonArrayStream().feed(body)
+        if items:
+            return items
+    raise ValueError("JSON 형식 오류를 고칠 수 없습니다.")
+
+
+class JsonArrayStream:
+    """
+    LLM이 생성 중인 JSON 배열을 조각 단위로 받아, 완성된 객체 원소를 바로 꺼내는 파서입니다.
+
+    - 첫 '[' 앞의 텍스트(```json 같은 코드 블록 표시 등)는 무시합니다.
+    - 문자열 안의 괄호와 이스케이프를 구분하므로 문제 내용에 괄호가 있어도 안전합니다.
+    - 원소 하나가 닫히는 순간 json.loads로 변환합니다. 닫는 괄호 앞 쉼표는 고쳐서 해석하고,
+      그래도 잘못된 원소는 건너뜁니다. (keep_invalid=True면 InvalidElement로 반환)
+
+    사용 예:
+        parser = JsonArrayStream()
+        for chunk in chunks:
+            for item in parser.feed(chunk):
+                ...
+    """
+
+    def __init__(self, keep_invalid: bool = False):
+        self.keep_invalid = keep_invalid
+        self._element: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._started = False
+        self.done = False
+        self.count = 0
+        self.repaired = 0
+        self.failed = 0
+
+    @property
+    def started(self) -> bool:
+        return self._started
+
+    def feed(self, chunk: str) -> List[Any]:
+        """조각을 추가하고, 이번 조각으로 완성된 원소 목록을 반환합니다."""
+        items = []
+        for ch in chunk:
+            if self.done:
+                break
+
+            if not self._started:
+                if ch == "[":
+                    self._started = True
+                    self._depth = 1
+                continue
+
+            if self._depth > 1:
+                self._element.append(ch)
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+
+            # 배열 바로 아래의 문자열 원소 안 괄호도 구조로 보지 않도록 모든 깊이에서 문자열을 추적
+            if ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                if self._depth == 1:
+                    self._element = [ch]
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 1:
+                    item = self._parse("".join(self._element))
+                    if item is not None:
+                        items.append(item)
+                    self._element = []
+                elif self._depth == 0:
+                    self.done = True
+        return items
+
+    def _parse(self, text: str) -> Any:
+        try:
+            item = json.loads(text)
+        except ValueError:
+            try:
+                item = json.loads(_TRAILING_COMMA.sub(r"\1", text))
+                self.repaired += 1
+            except ValueError:
+                self.failed += 1
+                logger.warning(f"JSON 배열 원소 파싱 실패: {text[:100]}")
+                return InvalidElement(text) if self.keep_invalid else None
+        self.count += 1
+        return item
+
+
+async def stream_json_array(
+    request: Callable[[TokenCallback], Awaitable[str]],
+    parser: Optional[JsonArrayStream] = None
+) -> AsyncIterator[Any]:
+    """
+    LLM 요청의 스트리밍 응답을 JSON 배열로 해석하면서 원소가 완성될 때마다 반환합니다.
+
+    Args:
+        request: on_token 콜백을 받아 LLM을 호출하고 전체 응답을 반환하는 코루틴 함수
+            (예: lambda on_token: call_llm(prompt, on_token=on_token))
+        parser: 사용할 파서 (옵션이나 처리 결과 카운터를 확인할 때 전달)
+
+    캐시 적중 등으로 조각이 오지 않은 경우에는 전체 응답을 한 번에 해석합니다.
+    LLM 호출의 예외는 그대로 전달됩니다.
+    """
+    parser = parser or JsonArrayStream()
+    queue: asyncio.Queue = asyncio.Queue()
+    received = False
+
+    def on_token(chunk: str) -> None:
+        nonlocal received
+        received = True
+        for item in parser.feed(chunk):
+            queue.put_nowait(item)
+
+    task = asyncio.ensure_future(request(on_token))
+    task.add_done_callback(lambda _: queue.put_nowait(_DONE))
+    try:
+        while True:
+            item = await queue.get()
+            if item is _DONE:
+                break
+            yield item
+
+        text = task.result()
+        if not received:
+            for item in parser.feed(str(text)):
+                yield item
+    finally:
+        # 중간에 소비를 멈추면 진행 중인 요청을 정리
+        if not task.done():
+            task.cancel()
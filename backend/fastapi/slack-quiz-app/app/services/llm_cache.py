@@ -0,0 +1,244 @@
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from app.core.config import (
+    LLM_CACHE_MAX_ENTRIES,
+    LLM_CACHE_TTL,
+    LLM_CACHE_STALE_TTL,
+    LLM_CACHE_DB_PATH
+)
+from app.services.llm_retry import CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+
+class LLMCache:
+    """
+    LLM 응답을 프롬프트 내용 기준으로 캐싱합니다.
+
+    - 메모리 LRU 계층 (최대 개수 + TTL 제한)
+    - 선택적인 SQLite 디스크 계층 (재시작 후에도 유지)
+    - TTL이 지난 응답은 stale_ttl 동안 그대로 내주고 백그라운드에서 갱신 (stale-while-revalidate)
+    """
+
+    def __init__(
+        self,
+        max_entries: int = LLM_CACHE_MAX_ENTRIES,
+        ttl: float = LLM_CACHE_TTL,
+        stale_ttl: float = LLM_CACHE_STALE_TTL,
+        db_path: Optional[str] = LLM_CACHE_DB_PATH
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.db_path = db_path
+
+        # key -> (저장 시각, 직렬화된 값)
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._refreshing: Set[str] = set()
+        self._background_tasks: Set[asyncio.Task] = set()
+
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+
+        self.stats: Dict[str, int] = {
+            "hits": 0,
+            "stale_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "degraded_hits": 0,
+            "refreshes": 0
+        }
+
+    @staticmethod
+    def make_key(
+        model: str,
+        prompt: str,
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        template_version: str,
+        extra: Any = None
+    ) -> str:
+        """
+        캐시 키를 생성합니다. 요청 결과에 영향을 주는 값들을 모두 해시에 포함합니다.
+
+        Args:
+            model: 모델 이름
+            prompt: 렌더링된 프롬프트
+            temperature: 생성 다양성
+            max_tokens: 최대 생성 토큰 수
+            template_version: 프롬프트 템플릿 버전
+            extra: 함수 스키마 등 추가로 결과에 영향을 주는 값
+
+        Returns:
+            sha256 해시 문자열
+        """
+        raw = json.dumps(
+            [model, prompt, temperature, max_tokens, template_version, extra],
+            ensure_ascii=False,
+            sort_keys=True
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    async def get_or_set(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        캐시에 값이 있으면 반환하고, 없으면 compute()로 생성해서 저장합니다.
+        compute()가 예외를 던지면 캐시에 저장하지 않고 그대로 전파합니다.
+        단, LLM 회로 차단기가 열려 있으면(CircuitOpenError) 만료된 값이라도 있으면 반환합니다.
+
+        Args:
+            key: make_key()로 만든 캐시 키
+            compute: 값을 새로 생성하는 코루틴 함수 (JSON 직렬화 가능한 값 반환)
+
+        Returns:
+            캐시된 값 또는 새로 생성한 값
+        """
+        entry = await self._lookup(key)
+
+        if entry is not None:
+            stored_at, raw = entry
+            age = time.time() - stored_at
+
+            if age <= self.ttl:
+                self.stats["hits"] += 1
+                return json.loads(raw)
+
+            if age <= self.ttl + self.stale_ttl:
+                # 오래된 값을 바로 내주고 백그라운드에서 갱신
+                self.stats["stale_hits"] += 1
+                self._schedule_refresh(key, compute)
+                return json.loads(raw)
+
+            # 만료된 값은 LLM 호출이 차단된 경우에만 쓰기 위해 잠시 보관
+            expired = raw
+            self.stats["expirations"] += 1
+        else:
+            expired = None
+
+        self.stats["misses"] += 1
+        try:
+            value = await compute()
+        except CircuitOpenError:
+            if expired is None:
+                raise
+            # 회로 차단 중에는 만료된 응답이라도 내줌 (오류 메시지보다 나음)
+            self.stats["degraded_hits"] += 1
+            return json.loads(expired)
+        except Exception:
+            if expired is not None:
+                await self._delete(key)
+            raise
+
+        await self.set(key, value)
+        return value
+
+    async def set(self, key: str, value: Any) -> None:
+        """값을 메모리와 (설정된 경우) 디스크에 저장합니다."""
+        raw = json.dumps(value, ensure_ascii=False)
+        stored_at = time.time()
+        self._put_memory(key, stored_at, raw)
+
+        if self.db_path:
+            await asyncio.to_thread(self._db_put, key, stored_at, raw)
+
+    def clear(self) -> None:
+        """메모리 캐시를 비웁니다. (디스크 캐시는 유지)"""
+        self._memory.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """캐시 카운터와 현재 메모리 항목 수를 반환합니다."""
+        return {**self.stats, "size": len(self._memory)}
+
+    async def _lookup(self, key: str) -> Optional[Tuple[float, str]]:
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+            return entry
+
+        if not self.db_path:
+            return None
+
+        entry = await asyncio.to_thread(self._db_get, key)
+        if entry is not None:
+            self.stats["disk_hits"] += 1
+            # 디스크에서 찾은 값은 메모리 계층으로 승격
+            self._put_memory(key, entry[0], entry[1])
+        return entry
+
+    async def _delete(self, key: str) -> None:
+        self._memory.pop(key, None)
+        if self.db_path:
+            await asyncio.to_thread(self._db_delete, key)
+
+    def _put_memory(self, key: str, stored_at: float, raw: str) -> None:
+        self._memory[key] = (stored_at, raw)
+        self._memory.move_to_end(key)
+
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def _schedule_refresh(self, key: str, compute: Callable[[], Awaitable[Any]]) -> None:
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+
+        async def _refresh():
+            try:
+                value = await compute()
+                await self.set(key, value)
+                self.stats["refreshes"] += 1
+            except Exception as e:
+                logger.warning(f"캐시 갱신 실패: {str(e)}")
+            finally:
+                self._refreshing.discard(key)
+
+        task = asyncio.create_task(_refresh())
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    # SQLite 디스크 계층 (asyncio.to_thread로 호출)
+    def _get_db(self) -> sqlite3.Connection:
+        if self._db is None:
+            self._db = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, stored_at REAL NOT NULL, value TEXT NOT NULL)"
+            )
+            self._db.commit()
+        return self._db
+
+    def _db_get(self, key: str) -> Optional[Tuple[float, str]]:
+        with self._db_lock:
+            row = self._get_db().execute(
+                "SELECT stored_at, value FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def _db_put(self, key: str, stored_at: float, raw: str) -> None:
+        with self._db_lock:
+            db = self._get_db()
+            db.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, stored_at, value) VALUES (?, ?, ?)",
+                (key, stored_at, raw)
+            )
+            db.commit()
+
+    def _db_delete(self, key: str) -> None:
+        with self._db_lock:
+            db = self._get_db()
+            db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            db.commit()
+
+
+# 프로세스 전역에서 공유하는 캐시 인스턴스
+llm_cache = LLMCache()
@@ -0,0 +1,146 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+from app.core.config import (
+    LLM_HEDGE_ENABLED,
+    LLM_HEDGE_QUANTILE,
+    LLM_HEDGE_BUDGET,
+    LLM_HEDGE_MIN_SAMPLES,
+    LLM_HEDGE_MIN_DELAY
+)
+
+logger = logging.getLogger(__name__)
+
+# 키(템플릿, 모델)마다 보관하는 최근 응답 시간 수
+LATENCY_WINDOW = 200
+# 헤징 예산으로 모아둘 수 있는 최대 추가 요청 수
+MAX_BUDGET_TOKENS = 10.0
+
+
+class RequestHedger:
+    """
+    느린 LLM 요청에 같은 요청을 하나 더 보내서 먼저 끝난 응답을 사용합니다. (hedged request)
+
+    - 프롬프트 템플릿과 모델별로 최근 응답 시간을 기록해서 분위수(기본 p90)를 계산합니다.
+    - 요청이 그 시간 안에 끝나지 않으면 같은 요청을 하나 더 보내고, 먼저 성공한 쪽을 사용하며
+      나머지는 취소합니다.
+    - 추가 요청은 전체 요청 수의 budget 비율까지만 허용합니다. (요청마다 budget만큼 예산이 쌓임)
+    - 기록이 min_samples보다 적은 키는 헤징하지 않습니다.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = LLM_HEDGE_ENABLED,
+        quantile: float = LLM_HEDGE_QUANTILE,
+        budget: float = LLM_HEDGE_BUDGET,
+        min_samples: int = LLM_HEDGE_MIN_SAMPLES,
+        min_delay: float = LLM_HEDGE_MIN_DELAY
+    ):
+        self.enabled = enabled
+        self.quantile = quantile
+        self.budget = budget
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._tokens = 0.0
+        self.stats: Dict[str, int] = {
+            "requests": 0,
+            "hedged": 0,
+            "hedge_wins": 0,
+            "budget_denied": 0
+        }
+
+    def delay(self, key: str) -> Optional[float]:
+        """추가 요청을 보내기 전까지 기다릴 시간(초). 기록이 부족하면 None."""
+        latencies = self._latencies.get(key)
+        if not latencies or len(latencies) < self.min_samples:
+            return None
+        ordered = sorted(latencies)
+        index = min(len(ordered) - 1, int(len(ordered) * self.quantile))
+        return max(self.min_delay, ordered[index])
+
+    def observe(self, key: str, seconds: float) -> None:
+        latencies = self._latencies.get(key)
+        if latencies is None:
+            latencies = self._latencies[key] = deque(maxlen=LATENCY_WINDOW)
+        latencies.append(seconds)
+
+    async def run(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        fn()을 실행하고, 느리면 한 번 더 실행해서 먼저 성공한 결과를 반환합니다.
+
+        Args:
+            key: 응답 시간을 구분하는 키 (예: "level_test:gpt-4o-mini")
+            fn: 요청 하나를 수행하는 코루틴 함수 (호출 한도 슬롯 획득 포함)
+
+        Returns:
+            fn()의 결과 (두 요청이 모두 실패하면 첫 요청의 예외를 전파)
+        """
+        self.stats["requests"] += 1
+        self._tokens = min(MAX_BUDGET_TOKENS, self._tokens + self.budget)
+
+        delay = self.delay(key) if self.enabled else None
+        started = time.monotonic()
+        primary = asyncio.ensure_future(fn())
+        hedge: Optional[asyncio.Future] = None
+        try:
+            if delay is not None:
+                await asyncio.wait({primary}, timeout=delay)
+
+            if primary.done() or delay is None:
+                result = await primary
+                self.observe(key, time.monotonic() - started)
+                return result
+
+            if self._tokens < 1:
+                self.stats["budget_denied"] += 1
+                result = await primary
+                self.observe(key, time.monotonic() - started)
+                return result
+
+            self._tokens -= 1
+            self.stats["hedged"] += 1
+            hedge = asyncio.ensure_future(fn())
+
+            pending = {primary, hedge}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.cancelled() or task.exception() is not None:
+                        continue
+                    if task is hedge:
+                        self.stats["hedge_wins"] += 1
+                    # 첫 요청이 졌으면 실제 응답 시간은 알 수 없으므로 지금까지 걸린 시간(하한)을 기록
+                    self.observe(key, time.monotonic() - started)
+                    return task.result()
+
+            # 두 요청 모두 실패
+            return primary.result()
+
+        finally:
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "budget": round(self._tokens, 2),
+            "delays": {
+                key: round(delay, 2)
+                for key, delay in ((key, self.delay(key)) for key in self._latencies)
+                if delay is not None
+            }
+        }
+
+
+def hedge_key(template: Optional[str], model: str) -> str:
+    return f"{template or 'default'}:{model}"
+
+
+# 프로세스 전역 LLM 요청 헤징 관리자
+llm_hedger = RequestHedger()
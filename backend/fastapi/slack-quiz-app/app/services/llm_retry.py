@@ -0,0 +1,259 @@
+import asyncio
+import logging
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.core.config import (
+    LLM_RETRY_MAX_ATTEMPTS,
+    LLM_RETRY_BASE_DELAY,
+    LLM_RETRY_MAX_DELAY,
+    LLM_BREAKER_FAILURE_THRESHOLD,
+    LLM_BREAKER_RESET_TIMEOUT
+)
+
+logger = logging.getLogger(__name__)
+
+# 서버가 알려준 대기 시간도 이 이상은 기다리지 않음 (초)
+MAX_RETRY_AFTER = 60.0
+
+# 다시 시도할 수 있는 제공자 쪽 오류 종류 (회로 차단기도 이 오류만 장애로 셈)
+# client 오류는 다시 보내도 같은 결과이고, unknown은 대부분 응답 처리 코드의 버그라 재시도해도 소용없음
+RETRYABLE_ERRORS = {"rate_limited", "timeout", "connection", "server"}
+
+
+class CircuitOpenError(Exception):
+    """회로 차단기가 열려 있어 요청을 보내지 않았을 때 발생합니다."""
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"{name} 호출이 일시적으로 차단되었습니다. ({retry_in:.0f}초 후 재시도)")
+        self.name = name
+        self.retry_in = retry_in
+
+
+def classify(exc: BaseException) -> str:
+    """
+    LLM 호출 예외를 종류별로 분류합니다.
+    OpenAI SDK와 LangChain(내부적으로 OpenAI SDK 사용) 예외를 모두 처리합니다.
+
+    Returns:
+        rate_limited / timeout / connection / server / client / circuit_open / unknown
+    """
+    if isinstance(exc, CircuitOpenError):
+        return "circuit_open"
+    if isinstance(exc, asyncio.TimeoutError):
+        return "timeout"
+
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+
+    if status == 429:
+        # 사용량 한도 초과는 기다려도 풀리지 않음
+        if getattr(exc, "code", None) == "insufficient_quota":
+            return "client"
+        return "rate_limited"
+    if status == 408:
+        return "timeout"
+    if isinstance(status, int) and status >= 500:
+        return "server"
+    if isinstance(status, int) and 400 <= status < 500:
+        return "client"
+
+    name = type(exc).__name__
+    if name == "APITimeoutError":
+        return "timeout"
+    if name == "APIConnectionError" or isinstance(exc, ConnectionError):
+        return "connection"
+    return "unknown"
+
+
+def retry_after(exc: BaseException) -> Optional[float]:
+    """응답 헤더(retry-after-ms, retry-after)에 있는 대기 시간(초)을 반환합니다."""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        value = headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            # HTTP 날짜 형식
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitBreaker:
+    """
+    LLM 제공자 장애 시 요청을 바로 실패시켜 재시도 폭주를 막는 회로 차단기입니다.
+
+    - closed: 정상. 재시도 가능한 오류가 failure_threshold번 연속되면 open
+    - open: reset_timeout 동안 모든 요청을 CircuitOpenError로 즉시 실패
+    - half_open: reset_timeout이 지나면 요청 하나만 보내보고, 성공하면 closed, 실패하면 다시 open
+    - client 오류(400 등)는 제공자가 정상 응답한 것이므로 장애로 세지 않습니다.
+    - 제공자 장애인지 알 수 없는 오류(unknown)도 세지 않습니다. (시험 요청 자리만 돌려줌)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = LLM_BREAKER_FAILURE_THRESHOLD,
+        reset_timeout: float = LLM_BREAKER_RESET_TIMEOUT
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self.stats: Dict[str, int] = {
+            "opened": 0,
+            "rejected": 0
+        }
+
+    def before_call(self) -> None:
+        """요청을 보내기 전에 호출합니다. 차단 중이면 CircuitOpenError를 발생시킵니다."""
+        if self.state == "open":
+            remaining = self._opened_at + self.reset_timeout - time.monotonic()
+            if remaining > 0:
+                self.stats["rejected"] += 1
+                raise CircuitOpenError(self.name, remaining)
+            self.state = "half_open"
+            logger.info(f"회로 차단기 반개방: {self.name}")
+
+        if self.state == "half_open":
+            if self._probing:
+                self.stats["rejected"] += 1
+                raise CircuitOpenError(self.name, self.reset_timeout)
+            self._probing = True
+
+    def record_success(self) -> None:
+        if self.state != "closed":
+            logger.info(f"회로 차단기 복구: {self.name}")
+        self.state = "closed"
+        self._failures = 0
+        self._probing = False
+
+    def release(self) -> None:
+        """결과 없이 끝난(취소된) 시험 요청의 자리를 돌려줍니다."""
+        self._probing = False
+
+    def record_failure(self, kind: str) -> None:
+        if kind == "client":
+            self.record_success()
+            return
+        if kind not in RETRYABLE_ERRORS:
+            self.release()
+            return
+
+        self._failures += 1
+        self._probing = False
+        if self.state == "half_open" or (self.state == "closed" and self._failures >= self.failure_threshold):
+            self.state = "open"
+            self._opened_at = time.monotonic()
+            self.stats["opened"] += 1
+            logger.error(f"회로 차단기 열림: {self.name} (연속 실패 {self._failures}회)")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "state": self.state, "failures": self._failures}
+
+
+class RetryPolicy:
+    """
+    LLM 호출 공용 재시도 정책입니다.
+
+    - 오류를 분류해서 다시 보내도 소용없는 오류(400, 인증, 사용량 초과 등)는 바로 전파합니다.
+    - 대기 시간은 decorrelated jitter로 정해서 여러 세션의 재시도가 한꺼번에 몰리지 않게 합니다.
+      (다음 대기 = min(max_delay, random(base_delay, 이전 대기 * 3)))
+    - 서버가 Retry-After를 보내면 그보다 먼저 재시도하지 않습니다.
+    - 회로 차단기가 있으면 시도마다 확인하고 결과를 기록합니다.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = LLM_RETRY_MAX_ATTEMPTS,
+        base_delay: float = LLM_RETRY_BASE_DELAY,
+        max_delay: float = LLM_RETRY_MAX_DELAY
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.stats: Dict[str, int] = {"retries": 0}
+
+    def next_delay(self, previous: float) -> float:
+        return min(self.max_delay, random.uniform(self.base_delay, max(self.base_delay, previous * 3)))
+
+    async def run(
+        self,
+        fn: Callable[[], Awaitable[Any]],
+        breaker: Optional[CircuitBreaker] = None,
+        can_retry: Optional[Callable[[], bool]] = None
+    ) -> Any:
+        """
+        fn()을 실행하고, 재시도할 수 있는 오류면 정책에 따라 다시 실행합니다.
+
+        Args:
+            fn: 요청 한 번을 수행하는 코루틴 함수
+            breaker: 사용할 회로 차단기
+            can_retry: 재시도 직전에 확인할 조건 (예: 스트리밍 조각을 이미 보냈으면 False)
+
+        Returns:
+            fn()의 결과 (마지막 시도의 예외는 그대로 전파)
+        """
+        delay = self.base_delay
+        for attempt in range(1, self.max_attempts + 1):
+            if breaker is not None:
+                breaker.before_call()
+
+            try:
+                result = await fn()
+            except asyncio.CancelledError:
+                if breaker is not None:
+                    breaker.release()
+                raise
+            except Exception as e:
+                kind = classify(e)
+                self.stats[kind] = self.stats.get(kind, 0) + 1
+                if breaker is not None:
+                    breaker.record_failure(kind)
+
+                if (
+                    kind not in RETRYABLE_ERRORS
+                    or attempt >= self.max_attempts
+                    or (can_retry is not None and not can_retry())
+                ):
+                    raise
+
+                delay = self.next_delay(delay)
+                hint = retry_after(e)
+                if hint is not None:
+                    delay = max(delay, min(hint, MAX_RETRY_AFTER))
+
+                self.stats["retries"] += 1
+                logger.warning(f"LLM 호출 실패({kind}): {str(e)}, {delay:.1f}초 후 재시도합니다... (시도 {attempt}/{self.max_attempts})")
+                await asyncio.sleep(delay)
+                continue
+
+            if breaker is not None:
+                breaker.record_success()
+            return result
+
+        # max_attempts가 0 이하인 경우
+        raise RuntimeError("응답을 받아오지 못했습니다.")
+
+    def get_stats(self) -> Dict[str, int]:
+        return dict(self.stats)
+
+
+# 프로세스 전역 재시도 정책과 OpenAI 회로 차단기 (SDK 직접 호출과 LangChain 호출이 함께 사용)
+llm_retry = RetryPolicy()
+openai_breaker = CircuitBreaker("openai")
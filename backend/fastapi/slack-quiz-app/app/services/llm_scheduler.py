@@ -0,0 +1,346 @@
+import asyncio
+import heapq
+import itertools
+import time
+import weakref
+from collections import deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from app.core.config import (
+    LLM_RPM_LIMIT,
+    LLM_TPM_LIMIT,
+    LLM_MAX_CONCURRENCY,
+    LLM_BACKGROUND_RESERVE
+)
+
+
+# 요청 우선순위 (숫자가 작을수록 먼저 처리)
+class Priority:
+    INTERACTIVE = 0  # 사용자가 응답을 기다리는 호출 (질문 답변, 개념 설명 등)
+    BACKGROUND = 1  # 미리 생성, 팩 빌드 등 사용자가 기다리지 않는 호출
+
+PRIORITY_NAMES = {
+    Priority.INTERACTIVE: "interactive",
+    Priority.BACKGROUND: "background"
+}
+
+# 현재 요청을 보낸 Slack 사용자 ID (핸들러에서 설정하면 하위 LLM 호출까지 전달됨)
+current_user_id: ContextVar[Optional[str]] = ContextVar("current_user_id", default=None)
+
+# 우선순위를 올릴 때 대기열을 다시 정렬할 스케줄러들
+_schedulers: "weakref.WeakSet[LLMScheduler]" = weakref.WeakSet()
+
+
+class JobPriority:
+    """
+    작업 하나(미리 생성, 합쳐진 LLM 요청 등)의 우선순위입니다.
+
+    - 스케줄러는 요청을 배정할 때마다 현재 값을 읽으므로, 사용자가 그 결과를 기다리기 시작하면
+      raise_to()로 올려서 이미 대기열에 있는 요청까지 앞당길 수 있습니다.
+    - parent가 있으면 부모와 자신 중 더 급한 값을 사용합니다. (부모가 올라가면 함께 올라감)
+    """
+
+    __slots__ = ("_value", "parent")
+
+    def __init__(self, value: int = Priority.BACKGROUND, parent: Optional["JobPriority"] = None):
+        self._value = value
+        self.parent = parent
+
+    @property
+    def value(self) -> int:
+        if self.parent is None:
+            return self._value
+        return min(self._value, self.parent.value)
+
+    def raise_to(self, priority: int) -> bool:
+        """우선순위를 priority로 올립니다. 이미 그만큼 급하면 False를 반환합니다."""
+        if priority >= self.value:
+            return False
+        self._value = priority
+        for scheduler in list(_schedulers):
+            scheduler.reprioritize()
+        return True
+
+
+# 현재 작업의 우선순위 (미리 생성 작업에서 설정하면 하위 LLM 호출이 모두 그 우선순위를 따름, 없으면 INTERACTIVE)
+current_priority: ContextVar[Optional[JobPriority]] = ContextVar("current_priority", default=None)
+
+
+def effective_priority(priority: int = Priority.INTERACTIVE) -> int:
+    """현재 작업의 우선순위를 반영한 호출 우선순위 (작업 우선순위보다 앞설 수 없음)"""
+    job = current_priority.get()
+    return priority if job is None else max(priority, job.value)
+
+
+def estimate_tokens(prompt: str, max_tokens: int = 1024) -> int:
+    """
+    요청이 소모할 토큰 수를 대략 추정합니다.
+    OpenAI는 분당 토큰 한도에 max_tokens까지 포함해서 계산합니다.
+    """
+    # 한글은 대략 글자당 1토큰 이상이므로 보수적으로 글자 수를 그대로 사용
+    return len(prompt) + max_tokens
+
+
+class _Waiter:
+    __slots__ = ("future", "requested", "job", "priority", "tokens", "user", "start_tag", "enqueued_at")
+
+    def __init__(
+        self,
+        future: asyncio.Future,
+        requested: int,
+        job: Optional[JobPriority],
+        tokens: int,
+        user: str,
+        start_tag: float
+    ):
+        self.future = future
+        self.requested = requested
+        self.job = job
+        self.priority = self.current_priority()
+        self.tokens = tokens
+        self.user = user
+        self.start_tag = start_tag
+        self.enqueued_at = time.monotonic()
+
+    def current_priority(self) -> int:
+        return self.requested if self.job is None else max(self.requested, self.job.value)
+
+
+class LLMScheduler:
+    """
+    모든 LLM 호출 앞에서 분당 요청 수(RPM), 분당 토큰 수(TPM), 동시 요청 수를 제한합니다.
+
+    - 예산은 토큰 버킷 방식으로 계속 채워집니다.
+    - 대기열은 우선순위 순서로 처리하고, 같은 우선순위 안에서는 사용자별 가중 공정 큐잉
+      (start-time fair queuing)으로 처리합니다. 한 사용자가 요청을 몰아 보내도
+      그 사용자의 요청만 뒤로 밀리고 다른 사용자는 영향을 받지 않습니다.
+    - 백그라운드 요청은 예산이 background_reserve 비율 이상 남아 있을 때만 시작하므로
+      부하가 걸리면 백그라운드 작업부터 밀려납니다.
+    - 동시 요청 수도 같은 비율만큼 사용자 요청용으로 남겨둡니다. 미리 생성 같은 긴 백그라운드
+      작업이 모든 동시 요청 자리를 차지하면 사용자 요청이 그 뒤에서 기다리게 되기 때문입니다.
+    """
+
+    def __init__(
+        self,
+        rpm: int = LLM_RPM_LIMIT,
+        tpm: int = LLM_TPM_LIMIT,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        background_reserve: float = LLM_BACKGROUND_RESERVE
+    ):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_concurrency = max_concurrency
+        self.background_reserve = background_reserve
+
+        self._requests = float(rpm)
+        self._tokens = float(tpm)
+        self._refilled_at = time.monotonic()
+        self._active = 0
+        self._active_background = 0
+        # 백그라운드 요청이 동시에 쓸 수 있는 자리 수 (나머지는 사용자 요청용, 최소 1개는 허용)
+        self.max_background_concurrency = max(1, max_concurrency - max(1, round(max_concurrency * background_reserve)))
+
+        self._queue: List[Tuple[int, float, int, _Waiter]] = []
+        self._seq = itertools.count()
+        self._wakeup: Optional[asyncio.TimerHandle] = None
+
+        # 공정 큐잉용 가상 시간과 사용자별 마지막 finish tag
+        self._virtual_time = 0.0
+        self._user_finish: Dict[str, float] = {}
+        self.user_weights: Dict[str, float] = {}
+
+        self._wait_times: Dict[int, Deque[float]] = {
+            priority: deque(maxlen=500) for priority in PRIORITY_NAMES
+        }
+        self._started: Dict[int, int] = {priority: 0 for priority in PRIORITY_NAMES}
+        _schedulers.add(self)
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        tokens: int,
+        priority: int = Priority.INTERACTIVE,
+        user: Optional[str] = None
+    ) -> AsyncIterator[None]:
+        """
+        LLM 호출 한 번에 필요한 예산을 확보합니다.
+
+        Args:
+            tokens: 예상 토큰 수 (estimate_tokens 참고)
+            priority: Priority.INTERACTIVE 또는 Priority.BACKGROUND
+                (current_priority 작업보다 앞설 수 없고, 대기 중에 작업 우선순위가 올라가면 함께 올라감)
+            user: 공정 큐잉에 사용할 사용자 ID (없으면 current_user_id 사용)
+
+        사용 예:
+            async with llm_scheduler.slot(estimate_tokens(prompt), Priority.INTERACTIVE):
+                response = await client.chat.completions.create(...)
+        """
+        if user is None:
+            user = current_user_id.get() or ""
+
+        waiter = await self._acquire(tokens, priority, current_priority.get(), user)
+        try:
+            yield
+        finally:
+            # 배정받을 때의 우선순위로 반환
+            self._release(waiter.priority)
+
+    async def _acquire(self, tokens: int, requested: int, job: Optional[JobPriority], user: str) -> _Waiter:
+        loop = asyncio.get_running_loop()
+        priority = requested if job is None else max(requested, job.value)
+        # 한도보다 큰 요청도 언젠가는 실행될 수 있도록 보정
+        # (백그라운드 요청은 예산을 background_reserve만큼 남겨야 시작하므로 그만큼 더 작게)
+        tokens = min(tokens, int(self.tpm * (1 - self._reserve_for(priority))))
+
+        # 사용자의 이전 요청이 끝나는 가상 시각 이후에 시작 (요청을 많이 보낼수록 뒤로 밀림)
+        start_tag = max(self._virtual_time, self._user_finish.get(user, 0.0))
+        self._user_finish[user] = start_tag + tokens / self.user_weights.get(user, 1.0)
+
+        waiter = _Waiter(loop.create_future(), requested, job, tokens, user, start_tag)
+        heapq.heappush(self._queue, (waiter.priority, start_tag, next(self._seq), waiter))
+        self._dispatch()
+
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # 슬롯을 배정받은 직후 취소된 경우 슬롯 반환
+                self._release(waiter.priority)
+            raise
+        return waiter
+
+    def reprioritize(self) -> None:
+        """대기 중인 요청의 작업 우선순위가 바뀌었으면 대기열에 반영하고 바로 배정합니다."""
+        changed = False
+        for index, (priority, start_tag, seq, waiter) in enumerate(self._queue):
+            current = waiter.current_priority()
+            if current != priority and not waiter.future.done():
+                waiter.priority = current
+                self._queue[index] = (current, start_tag, seq, waiter)
+                changed = True
+        if changed:
+            heapq.heapify(self._queue)
+            self._dispatch()
+
+    def _release(self, priority: int) -> None:
+        self._active -= 1
+        if priority != Priority.INTERACTIVE:
+            self._active_background -= 1
+        self._dispatch()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._refilled_at
+        self._refilled_at = now
+        self._requests = min(float(self.rpm), self._requests + elapsed * self.rpm / 60)
+        self._tokens = min(float(self.tpm), self._tokens + elapsed * self.tpm / 60)
+
+    def _reserve_for(self, priority: int) -> float:
+        return 0.0 if priority == Priority.INTERACTIVE else self.background_reserve
+
+    def _budget_delay(self, waiter: _Waiter) -> float:
+        """waiter가 시작할 수 있을 만큼 예산이 채워지기까지 남은 시간(초). 0이면 바로 가능."""
+        reserve = self._reserve_for(waiter.priority)
+        need_requests = 1 + self.rpm * reserve - self._requests
+        need_tokens = waiter.tokens + self.tpm * reserve - self._tokens
+
+        delay = 0.0
+        if need_requests > 0:
+            delay = max(delay, need_requests * 60 / self.rpm)
+        if need_tokens > 0:
+            delay = max(delay, need_tokens * 60 / self.tpm)
+        return delay
+
+    def _dispatch(self) -> None:
+        self._refill()
+
+        while self._queue:
+            waiter = self._queue[0][-1]
+            if waiter.future.done():
+                # 대기 중 취소된 요청
+                heapq.heappop(self._queue)
+                continue
+
+            if self._active >= self.max_concurrency:
+                return
+            # 우선순위 순서로 꺼내므로 맨 앞이 백그라운드면 대기 중인 사용자 요청도 없음
+            if waiter.priority != Priority.INTERACTIVE and self._active_background >= self.max_background_concurrency:
+                return
+
+            delay = self._budget_delay(waiter)
+            if delay > 0:
+                self._schedule_wakeup(delay)
+                return
+
+            heapq.heappop(self._queue)
+            self._requests -= 1
+            self._tokens -= waiter.tokens
+            self._active += 1
+            if waiter.priority != Priority.INTERACTIVE:
+                self._active_background += 1
+            self._virtual_time = max(self._virtual_time, waiter.start_tag)
+            self._wait_times[waiter.priority].append(time.monotonic() - waiter.enqueued_at)
+            self._started[waiter.priority] += 1
+            waiter.future.set_result(None)
+
+        self._prune_users()
+
+    def _prune_users(self) -> None:
+        # 가상 시간보다 앞선 finish tag는 더 이상 의미가 없으므로 정리
+        if len(self._user_finish) > 1000:
+            self._user_finish = {
+                user: finish for user, finish in self._user_finish.items()
+                if finish > self._virtual_time
+            }
+
+    def _schedule_wakeup(self, delay: float) -> None:
+        loop = asyncio.get_running_loop()
+        if self._wakeup is not None:
+            # 이미 더 이른 시점에 깨어나도록 예약되어 있으면 유지
+            if self._wakeup.when() <= loop.time() + delay:
+                return
+            self._wakeup.cancel()
+
+        def _wake():
+            self._wakeup = None
+            self._dispatch()
+
+        self._wakeup = loop.call_later(delay, _wake)
+
+    def get_stats(self) -> Dict[str, object]:
+        """대기열 길이, 대기 시간, 남은 예산을 반환합니다."""
+        self._refill()
+
+        queue_depth = {name: 0 for name in PRIORITY_NAMES.values()}
+        queued_users = set()
+        for entry in self._queue:
+            waiter = entry[-1]
+            if not waiter.future.done():
+                queue_depth[PRIORITY_NAMES[waiter.priority]] += 1
+                queued_users.add(waiter.user)
+
+        wait_seconds = {}
+        for priority, name in PRIORITY_NAMES.items():
+            samples = sorted(self._wait_times[priority])
+            wait_seconds[name] = {
+                "started": self._started[priority],
+                "avg": sum(samples) / len(samples) if samples else 0.0,
+                "p95": samples[min(len(samples) - 1, int(len(samples) * 0.95))] if samples else 0.0,
+                "max": samples[-1] if samples else 0.0
+            }
+
+        return {
+            "active": self._active,
+            "active_background": self._active_background,
+            "queue_depth": queue_depth,
+            "queued_users": len(queued_users),
+            "wait_seconds": wait_seconds,
+            "remaining_requests": round(self._requests, 1),
+            "remaining_tokens": round(self._tokens)
+        }
+
+
+# 프로세스 전역에서 공유하는 스케줄러
+llm_scheduler = LLMScheduler()
@@ -0,0 +1,121 @@
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+# Block Kit 한도
+MAX_BLOCKS_PER_MESSAGE = 50
+SECTION_TEXT_LIMIT = 3000
+# 알림/미리보기에 쓰이는 대체 텍스트 길이
+FALLBACK_TEXT_LIMIT = 3000
+# 메시지 하나에 담을 블록 텍스트 총량 (너무 긴 메시지는 Slack에서 잘려 보임)
+MESSAGE_TEXT_LIMIT = 12000
+
+Block = Dict[str, Any]
+
+
+def section(text: str) -> Block:
+    return {"type": "section", "text": {"type": "mrkdwn", "text": text}}
+
+
+def split_text(text: str, limit: int = SECTION_TEXT_LIMIT) -> List[str]:
+    """section 한도에 맞게 텍스트를 나눕니다. 가능하면 줄바꿈 위치에서 자릅니다."""
+    parts = []
+    while len(text) > limit:
+        cut = text.rfind("\n", 0, limit)
+        if cut <= 0:
+            cut = limit
+        parts.append(text[:cut])
+        text = text[cut:].lstrip("\n")
+    if text:
+        parts.append(text)
+    return parts
+
+
+def _block_text(block: Block) -> str:
+    text = block.get("text")
+    if isinstance(text, dict):
+        return text.get("text", "")
+    return ""
+
+
+class MessageComposer:
+    """
+    하나의 논리적 단계에서 보낼 내용을 모았다가 가능한 적은 수의 chat.postMessage로 보냅니다.
+
+    - text()/blocks()로 추가한 묶음은 한 메시지 안에 함께 들어갑니다. (문제와 버튼이 갈라지지 않음)
+    - 블록 50개, section 3000자, 메시지 텍스트 총량 한도를 넘으면 다음 메시지로 나눕니다.
+
+    사용 예:
+        composer = MessageComposer()
+        composer.text("📝 *수준 테스트를 시작합니다*")
+        composer.blocks([section("1번 문제"), {"type": "actions", ...}])
+        await composer.send(say)
+    """
+
+    def __init__(self):
+        self._groups: List[List[Block]] = []
+
+    def __len__(self) -> int:
+        return len(self._groups)
+
+    def text(self, text: str) -> "MessageComposer":
+        """mrkdwn 텍스트를 추가합니다. 긴 텍스트는 section 여러 개로 나뉩니다."""
+        blocks = [section(part) for part in split_text(text)]
+        if blocks:
+            self._groups.append(blocks)
+        return self
+
+    def blocks(self, blocks: List[Block]) -> "MessageComposer":
+        """함께 표시해야 하는 블록 묶음을 추가합니다."""
+        if blocks:
+            self._groups.append(list(blocks))
+        return self
+
+    def build(self) -> List[Dict[str, Any]]:
+        """chat.postMessage에 넘길 인자(blocks, text) 목록을 반환합니다."""
+        messages: List[List[Block]] = []
+        current: List[Block] = []
+        current_chars = 0
+
+        for group in self._groups:
+            group_chars = sum(len(_block_text(block)) for block in group)
+            if current and (
+                len(current) + len(group) > MAX_BLOCKS_PER_MESSAGE
+                or current_chars + group_chars > MESSAGE_TEXT_LIMIT
+            ):
+                messages.append(current)
+                current, current_chars = [], 0
+
+            # 묶음 하나가 한도를 넘으면 어쩔 수 없이 블록 단위로 나눔
+            for block in group:
+                if len(current) >= MAX_BLOCKS_PER_MESSAGE:
+                    messages.append(current)
+                    current, current_chars = [], 0
+                current.append(block)
+                current_chars += len(_block_text(block))
+
+        if current:
+            messages.append(current)
+
+        return [{"blocks": blocks, "text": self._fallback(blocks)} for blocks in messages]
+
+    async def send(self, say: Callable[..., Awaitable[Any]]) -> int:
+        """
+        모은 내용을 전송하고 비웁니다.
+
+        Args:
+            say: Bolt의 say() 또는 slack_outbox.sayer()
+
+        Returns:
+            전송한 메시지 수
+        """
+        messages = self.build()
+        self._groups = []
+        for message in messages:
+            await say(**message)
+        return len(messages)
+
+    @staticmethod
+    def _fallback(blocks: List[Block]) -> Optional[str]:
+        text = "\n".join(filter(None, (_block_text(block) for block in blocks)))
+        if len(text) > FALLBACK_TEXT_LIMIT:
+            text = text[:FALLBACK_TEXT_LIMIT - 1] + "…"
+        return text or None
@@ -0,0 +1,211 @@
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from app.core.config import (
+    MODEL_ROUTES,
+    MODEL_HEAVY,
+    MODEL_HEAVY_TEMPLATES,
+    MODEL_ROUTER_WINDOW,
+    MODEL_ROUTER_MIN_SAMPLES
+)
+from app.services.llm_retry import classify
+
+logger = logging.getLogger(__name__)
+
+
+class Route:
+    """프롬프트 템플릿 하나의 모델 선택 규칙"""
+
+    __slots__ = ("primary", "fallbacks", "max_p95", "max_error_rate")
+
+    def __init__(self, primary: str, fallbacks: List[str], max_p95: float, max_error_rate: float = 0.2):
+        self.primary = primary
+        self.fallbacks = fallbacks
+        self.max_p95 = max_p95  # 이 응답 시간(초)을 p95가 넘으면 다음 모델로 전환
+        self.max_error_rate = max_error_rate  # 이 오류 비율을 넘으면 다음 모델로 전환
+
+    @property
+    def models(self) -> List[str]:
+        return [self.primary, *self.fallbacks]
+
+
+# 템플릿별 모델 라우팅 표 (없는 템플릿은 default 사용)
+# 모든 템플릿이 빠르고 저렴한 모델을 우선 사용하고, 품질이 좋은 모델은 느리거나 실패할 때만 사용
+# (긴 설명에 무거운 모델을 먼저 쓰려면 MODEL_HEAVY_TEMPLATES로 명시적으로 지정)
+DEFAULT_ROUTES: Dict[str, Route] = {
+    "default": Route("gpt-4o-mini", ["gpt-3.5-turbo"], max_p95=20),
+    "tag_extraction": Route("gpt-4o-mini", ["gpt-3.5-turbo"], max_p95=8),
+    "subtopics": Route("gpt-4o-mini", ["gpt-3.5-turbo"], max_p95=10),
+    "quiz": Route("gpt-4o-mini", ["gpt-4o"], max_p95=20),
+    "level_test": Route("gpt-4o-mini", ["gpt-4o"], max_p95=20),
+    "concept_explanation": Route("gpt-4o-mini", ["gpt-4o"], max_p95=25),
+    "user_question": Route("gpt-4o-mini", ["gpt-4o"], max_p95=25),
+    "interview_questions": Route("gpt-4o-mini", ["gpt-4o"], max_p95=30),
+    "advanced_topic": Route("gpt-4o-mini", ["gpt-4o"], max_p95=40)
+}
+
+
+def load_routes(
+    overrides: Optional[str] = MODEL_ROUTES,
+    heavy_templates: str = MODEL_HEAVY_TEMPLATES,
+    heavy_model: str = MODEL_HEAVY
+) -> Dict[str, Route]:
+    """
+    기본 라우팅 표에 환경 변수로 지정한 값을 덮어씁니다.
+
+    - heavy_templates: 무거운 모델(heavy_model)을 primary로 쓸 템플릿 (쉼표 구분, 예: advanced_topic,interview_questions)
+      기존 primary는 fallback으로 사용
+    - overrides(JSON): 템플릿별 설정을 직접 지정 (heavy_templates보다 우선)
+      예: {"advanced_topic": {"primary": "gpt-4o", "fallbacks": ["gpt-4o-mini"], "max_p95": 30}}
+    """
+    routes = dict(DEFAULT_ROUTES)
+    for template in filter(None, (name.strip() for name in heavy_templates.split(","))):
+        base = routes.get(template, routes["default"])
+        fallbacks = [model for model in base.models if model != heavy_model]
+        routes[template] = Route(heavy_model, fallbacks, base.max_p95, base.max_error_rate)
+
+    if not overrides:
+        return routes
+
+    try:
+        for template, spec in json.loads(overrides).items():
+            base = routes.get(template, routes["default"])
+            routes[template] = Route(
+                spec.get("primary", base.primary),
+                spec.get("fallbacks", base.fallbacks),
+                float(spec.get("max_p95", base.max_p95)),
+                float(spec.get("max_error_rate", base.max_error_rate))
+            )
+    except (ValueError, AttributeError, TypeError) as e:
+        logger.error(f"MODEL_ROUTES 설정을 읽을 수 없어 기본 라우팅 표를 사용합니다: {str(e)}")
+        return load_routes(None, heavy_templates, heavy_model)
+    return routes
+
+
+class ModelRouter:
+    """
+    프롬프트 템플릿별로 사용할 모델을 고릅니다.
+
+    - 템플릿과 모델 조합마다 최근 window초 동안의 응답 시간과 성공 여부를 기록합니다.
+      (응답 길이가 템플릿마다 달라서 응답 시간은 같은 템플릿 안에서만 비교)
+    - 라우팅 표의 primary부터 순서대로 확인해서 p95와 오류 비율이 기준 안에 있는 첫 모델을 사용합니다.
+      (기록이 min_samples보다 적은 모델은 정상으로 간주)
+    - 전환된 뒤에는 primary로 요청이 가지 않으므로, 오래된 기록이 window 밖으로 밀려나면
+      자연스럽게 primary로 돌아옵니다.
+    - 모든 모델이 기준을 넘으면 오류 비율이 가장 낮은 모델을 사용합니다.
+    """
+
+    def __init__(
+        self,
+        routes: Optional[Dict[str, Route]] = None,
+        window: float = MODEL_ROUTER_WINDOW,
+        min_samples: int = MODEL_ROUTER_MIN_SAMPLES
+    ):
+        self.routes = routes or load_routes()
+        self.window = window
+        self.min_samples = min_samples
+
+        # (템플릿, 모델)별 (기록 시각, 응답 시간, 성공 여부)
+        self._samples: Dict[Tuple[str, str], Deque[Tuple[float, float, bool]]] = {}
+        self._current: Dict[str, str] = {}
+        self.stats: Dict[str, Any] = {
+            "decisions": {},
+            "failovers": 0
+        }
+
+    def choose(self, template: Optional[str]) -> str:
+        """template에 사용할 모델 이름을 반환합니다."""
+        name = self._name(template)
+        route = self.routes[name]
+
+        chosen = None
+        for model in route.models:
+            if self._healthy(name, model, route):
+                chosen = model
+                break
+        if chosen is None:
+            chosen = min(route.models, key=lambda model: self._health(name, model)[1])
+
+        previous = self._current.get(name)
+        if previous is not None and previous != chosen:
+            if chosen != route.primary:
+                self.stats["failovers"] += 1
+            p95, error_rate, _ = self._health(name, previous)
+            logger.warning(
+                f"모델 전환: {name} {previous} -> {chosen} "
+                f"(p95={p95:.1f}초, 오류율={error_rate:.0%})"
+            )
+        self._current[name] = chosen
+
+        decisions = self.stats["decisions"].setdefault(name, {})
+        decisions[chosen] = decisions.get(chosen, 0) + 1
+        return chosen
+
+    async def track(self, template: Optional[str], model: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """요청 한 번(fn)을 실행하면서 응답 시간과 성공 여부를 기록합니다."""
+        started = time.monotonic()
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            # 헤징에서 진 요청 등 취소된 요청은 기록하지 않음
+            raise
+        except Exception as e:
+            # 요청 자체가 잘못된 경우는 모델 상태와 무관
+            if classify(e) not in ("client", "circuit_open"):
+                self.observe(template, model, time.monotonic() - started, False)
+            raise
+        self.observe(template, model, time.monotonic() - started, True)
+        return result
+
+    def observe(self, template: Optional[str], model: str, seconds: float, ok: bool) -> None:
+        """실제 요청 한 번의 결과를 기록합니다."""
+        key = (self._name(template), model)
+        samples = self._samples.get(key)
+        if samples is None:
+            samples = self._samples[key] = deque(maxlen=1000)
+        samples.append((time.monotonic(), seconds, ok))
+
+    def get_stats(self) -> Dict[str, Any]:
+        models = {}
+        for name, model in list(self._samples):
+            p95, error_rate, count = self._health(name, model)
+            models[f"{name}:{model}"] = {"p95": round(p95, 2), "error_rate": round(error_rate, 3), "samples": count}
+        return {
+            **self.stats,
+            "current": dict(self._current),
+            "models": models
+        }
+
+    def _name(self, template: Optional[str]) -> str:
+        return template if template in self.routes else "default"
+
+    def _healthy(self, name: str, model: str, route: Route) -> bool:
+        p95, error_rate, count = self._health(name, model)
+        if count < self.min_samples:
+            return True
+        return p95 <= route.max_p95 and error_rate <= route.max_error_rate
+
+    def _health(self, name: str, model: str) -> Tuple[float, float, int]:
+        """(p95 응답 시간, 오류 비율, 기록 수)"""
+        samples = self._samples.get((name, model))
+        if not samples:
+            return 0.0, 0.0, 0
+
+        cutoff = time.monotonic() - self.window
+        while samples and samples[0][0] < cutoff:
+            samples.popleft()
+        if not samples:
+            return 0.0, 0.0, 0
+
+        latencies = sorted(seconds for _, seconds, ok in samples if ok)
+        errors = sum(1 for _, _, ok in samples if not ok)
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else 0.0
+        return p95, errors / len(samples), len(samples)
+
+
+# 프로세스 전역 모델 라우터
+model_router = ModelRouter()
@@ -1,46 +1,195 @@
 import os
+import json
 import openai
-from openai import AsyncOpenAI
 import asyncio
 from typing import Optional, Dict, Any, List, Union, Callable, Awaitable
+from app.prompts.fsm_prompts import PROMPT_VERSION
+from app.services.llm_cache import llm_cache
+from app.services.singleflight import llm_singleflight
+from app.services.llm_scheduler import llm_scheduler, Priority, estimate_tokens
+from app.services.llm_hedging import llm_hedger, hedge_key
+from app.services.llm_retry import llm_retry, openai_breaker, CircuitOpenError
+from app.services.model_router import model_router
+from app.services.http_clients import openai_client
 
 # OpenAI 클라이언트 설정
 openai.api_key = os.getenv("OPENAI_API_KEY")
-client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# 공용 연결 풀을 쓰는 클라이언트 (재시도는 공용 재시도 정책에서 처리)
+client = openai_client
 
-# 재시도 설정
-MAX_RETRIES = 3
-RETRY_DELAY = 2  # 초 단위
+# 스트리밍으로 받은 텍스트 조각을 처리하는 함수
+TokenCallback = Callable[[str], None]
 
 # 모델 설정
 DEFAULT_MODEL = "gpt-4o-mini"
 TIMEOUT = 60  # 초 단위
 
+async def _request_completion(
+    prompt: str,
+    model: str,
+    temperature: float,
+    max_tokens: int,
+    timeout: int,
+    priority: int,
+    on_token: Optional[TokenCallback] = None,
+    template: Optional[str] = None
+) -> str:
+    """
+    텍스트 완성 요청을 재시도와 함께 수행합니다.
+    모든 시도가 실패하면 마지막 예외를 그대로 전파합니다.
+    on_token이 있으면 스트리밍으로 받으면서 조각마다 호출합니다.
+    스트리밍이 아닌 요청은 느리면 같은 요청을 하나 더 보내서 먼저 끝난 응답을 사용합니다.
+    시도마다 응답 시간과 성공 여부를 모델 라우터에 기록합니다.
+    """
+    messages = [
+        {"role": "system", "content": "You are a helpful assistant."},
+        {"role": "user", "content": prompt}
+    ]
+
+    async def _stream() -> str:
+        stream = await client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True
+        )
+        parts = []
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                content = chunk.choices[0].delta.content
+                parts.append(content)
+                _emit(content)
+        return "".join(parts)
+
+    async def _create() -> Any:
+        # 헤징으로 보내는 요청도 각자 호출 한도 스케줄러에서 슬롯을 받음
+        async with llm_scheduler.slot(estimate_tokens(prompt, max_tokens), priority):
+            # 비동기 타임아웃 설정
+            return await model_router.track(template, model, lambda: asyncio.wait_for(
+                client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens
+                ),
+                timeout=timeout
+            ))
+
+    emitted = False
+
+    def _emit(content: str) -> None:
+        nonlocal emitted
+        emitted = True
+        on_token(content)
+
+    async def _attempt() -> str:
+        if on_token is not None:
+            # 시도마다 호출 한도 스케줄러에서 슬롯을 받아서 요청
+            async with llm_scheduler.slot(estimate_tokens(prompt, max_tokens), priority):
+                content = await model_router.track(template, model, lambda: asyncio.wait_for(_stream(), timeout=timeout))
+            return content if content else "응답 내용이 없습니다."
+
+        response = await llm_hedger.run(hedge_key(template, model), _create)
+        content = response.choices[0].message.content
+        return content if content is not None else "응답 내용이 없습니다."
+
+    # 스트리밍 조각을 이미 보냈으면 다시 시도하지 않음 (같은 내용이 중복으로 표시됨)
+    return await llm_retry.run(_attempt, breaker=openai_breaker, can_retry=lambda: not emitted)
+
 async def get_completion(
     prompt: str,
-    model: str = DEFAULT_MODEL,
+    model: Optional[str] = None,
     temperature: float = 0.7,
     max_tokens: int = 2048,
-    timeout: int = TIMEOUT
+    timeout: int = TIMEOUT,
+    use_cache: bool = True,
+    priority: int = Priority.INTERACTIVE,
+    on_token: Optional[TokenCallback] = None,
+    template: Optional[str] = None
 ) -> str:
     """
     OpenAI API에 비동기로 요청하여 텍스트 완성을 가져옵니다.
     오류나 타임아웃 시 자동 재시도 기능을 포함합니다.
+    동일한 요청은 LLM 응답 캐시에서 바로 반환하고,
+    동시에 진행 중인 동일한 요청은 하나로 합쳐서 기다립니다.
 
     Args:
         prompt: 입력 프롬프트
-        model: 사용할 모델 이름
+        model: 사용할 모델 이름 (없으면 모델 라우터가 template에 맞게 선택)
         temperature: 생성 다양성 (0~1)
         max_tokens: 최대 생성 토큰 수
         timeout: 요청 타임아웃(초)
+        use_cache: 응답 캐시 사용 여부
+        priority: 호출 우선순위 (Priority.INTERACTIVE / Priority.BACKGROUND)
+        on_token: 스트리밍으로 받은 텍스트 조각마다 호출할 함수
+            (캐시 적중이나 합쳐진 요청이면 호출되지 않으므로 최종 결과는 반환값을 사용할 것)
+        template: 프롬프트 템플릿 이름 (모델 선택과 헤징 기준 응답 시간을 템플릿별로 구분)
 
     Returns:
         생성된 텍스트
     """
-    for attempt in range(MAX_RETRIES):
-        try:
+    model = model or model_router.choose(template)
+
+    async def _request() -> str:
+        return await _request_completion(prompt, model, temperature, max_tokens, timeout, priority, on_token, template)
+
+    try:
+        if not use_cache:
+            return await _request()
+
+        key = llm_cache.make_key(model, prompt, temperature, max_tokens, PROMPT_VERSION)
+
+        async def _compute() -> str:
+            return await llm_singleflight.do(key, _request)
+
+        return await llm_cache.get_or_set(key, _compute)
+
+    except CircuitOpenError:
+        return "🚧 AI 응답 서비스가 일시적으로 불안정합니다. 잠시 후 다시 시도해주세요."
+
+    except asyncio.TimeoutError:
+        return "죄송합니다. 응답 시간이 너무 오래 걸려 처리하지 못했습니다. 다시 시도해주세요."
+
+    except Exception as e:
+        return f"죄송합니다. 오류가 발생했습니다: {str(e)}"
+
+async def _request_structured_completion(
+    prompt: str,
+    functions: List[Dict[str, Any]],
+    model: str,
+    temperature: float,
+    timeout: int,
+    priority: int,
+    function_call: Optional[str] = None,
+    template: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    함수 호출 요청을 재시도와 함께 수행합니다.
+    모든 시도가 실패하면 마지막 예외를 그대로 전파합니다.
+    느리면 같은 요청을 하나 더 보내서 먼저 끝난 응답을 사용합니다.
+    시도마다 응답 시간과 성공 여부를 모델 라우터에 기록합니다.
+    """
+    template = template or function_call
+
+    # 함수 형식 변환 - OpenAI SDK와 호환되는 형식으로 변환
+    converted_functions = []
+    for func in functions:
+        converted_functions.append({
+            "type": "function",
+            "function": func
+        })
+
+    # 지정한 함수를 반드시 호출하도록 강제
+    options: Dict[str, Any] = {}
+    if function_call:
+        options["tool_choice"] = {"type": "function", "function": {"name": function_call}}
+
+    async def _create() -> Any:
+        # 시도마다(헤징 요청 포함) 호출 한도 스케줄러에서 슬롯을 받아서 요청
+        async with llm_scheduler.slot(estimate_tokens(prompt), priority):
             # 비동기 타임아웃 설정
-            response = await asyncio.wait_for(
+            return await model_router.track(template, model, lambda: asyncio.wait_for(
                 client.chat.completions.create(
                     model=model,
                     messages=[
@@ -48,129 +197,104 @@ async def get_completion(
                         {"role": "user", "content": prompt}
                     ],
                     temperature=temperature,
-                    max_tokens=max_tokens
+                    tools=converted_functions,
+                    **options
                 ),
                 timeout=timeout
-            )
-
-            content = response.choices[0].message.content
-            return content if content is not None else "응답 내용이 없습니다."
-
-        except asyncio.TimeoutError:
-            if attempt < MAX_RETRIES - 1:
-                # 지수 백오프로 재시도
-                delay = RETRY_DELAY * (2 ** attempt)
-                print(f"요청 타임아웃, {delay}초 후 재시도합니다... (시도 {attempt+1}/{MAX_RETRIES})")
-                await asyncio.sleep(delay)
-            else:
-                return "죄송합니다. 응답 시간이 너무 오래 걸려 처리하지 못했습니다. 다시 시도해주세요."
-
-        except Exception as e:
-            if attempt < MAX_RETRIES - 1:
-                delay = RETRY_DELAY * (2 ** attempt)
-                print(f"오류 발생: {str(e)}, {delay}초 후 재시도합니다... (시도 {attempt+1}/{MAX_RETRIES})")
-                await asyncio.sleep(delay)
-            else:
-                return f"죄송합니다. 오류가 발생했습니다: {str(e)}"
-
-    # 모든 시도가 실패했을 경우의 기본 반환값
-    return "응답을 받아오지 못했습니다. 잠시 후 다시 시도해주세요."
+            ))
+
+    response = await llm_retry.run(
+        lambda: llm_hedger.run(hedge_key(template, model), _create),
+        breaker=openai_breaker
+    )
+    message = response.choices[0].message
+
+    # 함수 호출 응답 확인
+    if message.tool_calls and len(message.tool_calls) > 0:
+        tool_call = message.tool_calls[0]
+        function_name = tool_call.function.name
+        function_args = tool_call.function.arguments
+
+        # JSON 문자열을 파싱
+        try:
+            parsed_args = json.loads(function_args)
+            return {
+                "function": function_name,
+                "args": parsed_args
+            }
+        except json.JSONDecodeError:
+            return {
+                "function": function_name,
+                "args": function_args
+            }
+
+    # 일반 텍스트 응답
+    return {"text": message.content if message.content else "응답 내용이 없습니다."}
 
 async def get_structured_completion(
     prompt: str,
     functions: List[Dict[str, Any]],
-    model: str = "gpt-4-turbo",
+    model: Optional[str] = None,
     temperature: float = 0.2,
-    timeout: int = TIMEOUT
+    timeout: int = TIMEOUT,
+    use_cache: bool = True,
+    priority: int = Priority.INTERACTIVE,
+    function_call: Optional[str] = None,
+    template: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     함수 호출 형식으로 구조화된 응답을 받아옵니다.
+    동일한 요청은 LLM 응답 캐시에서 바로 반환하고,
+    동시에 진행 중인 동일한 요청은 하나로 합쳐서 기다립니다.
 
     Args:
         prompt: 입력 프롬프트
         functions: 함수 스키마 목록
-        model: 사용할 모델 이름
+        model: 사용할 모델 이름 (없으면 모델 라우터가 template에 맞게 선택)
         temperature: 생성 다양성 (0~1)
         timeout: 요청 타임아웃(초)
+        use_cache: 응답 캐시 사용 여부
+        priority: 호출 우선순위 (Priority.INTERACTIVE / Priority.BACKGROUND)
+        function_call: 반드시 호출할 함수 이름 (없으면 모델이 선택)
+        template: 프롬프트 템플릿 이름 (모델 선택과 헤징 기준 응답 시간을 템플릿별로 구분, 없으면 function_call 사용)
 
     Returns:
         구조화된 응답 데이터
     """
-    for attempt in range(MAX_RETRIES):
-        try:
-            # 함수 형식 변환 - OpenAI SDK와 호환되는 형식으로 변환
-            from openai.types.chat import ChatCompletionToolParam
-            converted_functions = []
-            for func in functions:
-                converted_functions.append({
-                    "type": "function",
-                    "function": func
-                })
+    model = model or model_router.choose(template or function_call)
 
-            # 비동기 타임아웃 설정
-            response = await asyncio.wait_for(
-                client.chat.completions.create(
-                    model=model,
-                    messages=[
-                        {"role": "system", "content": "You are a helpful assistant."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=temperature,
-                    tools=converted_functions
-                ),
-                timeout=timeout
-            )
-
-            message = response.choices[0].message
-
-            # 함수 호출 응답 확인
-            if message.tool_calls and len(message.tool_calls) > 0:
-                tool_call = message.tool_calls[0]
-                function_name = tool_call.function.name
-                function_args = tool_call.function.arguments
-
-                # JSON 문자열을 파싱
-                import json
-                try:
-                    parsed_args = json.loads(function_args)
-                    return {
-                        "function": function_name,
-                        "args": parsed_args
-                    }
-                except json.JSONDecodeError:
-                    return {
-                        "function": function_name,
-                        "args": function_args
-                    }
-
-            # 일반 텍스트 응답
-            return {"text": message.content if message.content else "응답 내용이 없습니다."}
-
-        except asyncio.TimeoutError:
-            if attempt < MAX_RETRIES - 1:
-                delay = RETRY_DELAY * (2 ** attempt)
-                print(f"요청 타임아웃, {delay}초 후 재시도합니다... (시도 {attempt+1}/{MAX_RETRIES})")
-                await asyncio.sleep(delay)
-            else:
-                return {"error": "타임아웃 오류"}
-
-        except Exception as e:
-            if attempt < MAX_RETRIES - 1:
-                delay = RETRY_DELAY * (2 ** attempt)
-                print(f"오류 발생: {str(e)}, {delay}초 후 재시도합니다... (시도 {attempt+1}/{MAX_RETRIES})")
-                await asyncio.sleep(delay)
-            else:
-                return {"error": f"API 오류: {str(e)}"}
-
-    # 모든 시도가 실패했을 경우의 기본 반환값
-    return {"error": "응답을 받아오지 못했습니다."}
+    async def _request() -> Dict[str, Any]:
+        return await _request_structured_completion(prompt, functions, model, temperature, timeout, priority, function_call, template)
+
+    try:
+        if not use_cache:
+            return await _request()
+
+        extra: Any = functions if function_call is None else {"functions": functions, "function_call": function_call}
+        key = llm_cache.make_key(model, prompt, temperature, None, PROMPT_VERSION, extra=extra)
+
+        async def _compute() -> Dict[str, Any]:
+            return await llm_singleflight.do(key, _request)
+
+        return await llm_cache.get_or_set(key, _compute)
+
+    except CircuitOpenError:
+        return {"error": "회로 차단 중"}
+
+    except asyncio.TimeoutError:
+        return {"error": "타임아웃 오류"}
+
+    except Exception as e:
+        return {"error": f"API 오류: {str(e)}"}
 
 async def generate_with_stream(
     prompt: str,
     callback: Callable[[str], Awaitable[None]],
-    model: str = DEFAULT_MODEL,
+    model: Optional[str] = None,
     temperature: float = 0.7,
-    max_tokens: int = 2048
+    max_tokens: int = 2048,
+    priority: int = Priority.INTERACTIVE,
+    template: Optional[str] = None
 ) -> None:
     """
     스트리밍 방식으로 텍스트를 생성하고 콜백 함수로 청크를 전달합니다.
@@ -178,11 +302,17 @@ async def generate_with_stream(
     Args:
         prompt: 입력 프롬프트
         callback: 각 청크를 처리할 콜백 함수
-        model: 사용할 모델 이름
+        model: 사용할 모델 이름 (없으면 모델 라우터가 template에 맞게 선택)
         temperature: 생성 다양성 (0~1)
         max_tokens: 최대 생성 토큰 수
+        priority: 호출 우선순위 (Priority.INTERACTIVE / Priority.BACKGROUND)
+        template: 프롬프트 템플릿 이름
     """
-    try:
+    model = model or model_router.choose(template)
+    emitted = False
+
+    async def _stream() -> None:
+        nonlocal emitted
         stream = await client.chat.completions.create(
             model=model,
             messages=[
@@ -199,7 +329,16 @@ async def generate_with_stream(
             if chunk.choices and len(chunk.choices) > 0:
                 content = chunk.choices[0].delta.content
                 if content:
+                    emitted = True
                     await callback(content)
 
+    async def _attempt() -> None:
+        async with llm_scheduler.slot(estimate_tokens(prompt, max_tokens), priority):
+            await model_router.track(template, model, _stream)
+
+    try:
+        # 청크를 이미 보냈으면 다시 시도하지 않음
+        await llm_retry.run(_attempt, breaker=openai_breaker, can_retry=lambda: not emitted)
+
     except Exception as e:
-        await callback(f"\n[오류 발생: {str(e)}]")
\ No newline at end of file
+        await callback(f"\n[오류 발생: {str(e)}]")
@@ -0,0 +1,215 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.core.config import PREFETCH_ENABLED, PREFETCH_MAX_CONCURRENT, PREFETCH_TIMEOUT
+from app.services.llm_scheduler import JobPriority, Priority, current_priority, effective_priority
+from app.services.session_store import session_store
+
+logger = logging.getLogger(__name__)
+
+# 세션을 받아 다음 단계 결과를 생성하는 함수 (생성하지 못하면 None이나 빈 값 반환)
+PrefetchJob = Callable[[Dict[str, Any]], Awaitable[Any]]
+# 결과가 유효한 세션 조건을 문자열로 만드는 함수 (예: 주제와 태그)
+PrefetchKey = Callable[[Dict[str, Any]], str]
+
+# 미리 생성한 결과를 보관하는 세션 필드 (kind -> {"key", "value", "seconds"})
+SESSION_FIELD = "prefetch"
+
+
+class _Rule:
+    __slots__ = ("kind", "key", "job")
+
+    def __init__(self, kind: str, key: PrefetchKey, job: PrefetchJob):
+        self.kind = kind
+        self.key = key
+        self.job = job
+
+
+class _Pending:
+    __slots__ = ("kind", "key", "task", "job", "started_at")
+
+    def __init__(self, kind: str, key: str, task: asyncio.Task, job: JobPriority):
+        self.kind = kind
+        self.key = key
+        self.task = task
+        self.job = job
+        self.started_at = time.monotonic()
+
+
+class Prefetcher:
+    """
+    학습 단계가 바뀐 직후, 사용자가 다음에 고를 가능성이 높은 단계의 결과를 미리 생성합니다.
+    (예: 기본 학습이 끝나면 퀴즈, 퀴즈를 시작하면 면접 질문)
+
+    - rule(mode, kind, key, job)로 "mode로 바뀌면 kind 결과를 job으로 생성"하는 규칙을 등록합니다.
+    - 생성은 백그라운드 우선순위로 실행되어 사용자가 기다리는 LLM 호출보다 뒤로 밀립니다.
+    - 결과는 세션의 prefetch[kind]에 저장되고, 저장할 때와 꺼낼 때 key가 같아야 사용합니다.
+      (그 사이 주제나 태그가 바뀌었으면 버림)
+    - 사용자가 예측과 다른 단계로 가거나 처음부터 다시 시작하면 진행 중인 생성을 취소합니다.
+    - take()는 저장된 결과를 꺼내고, 아직 생성 중이면 이어서 기다립니다. (없으면 None)
+      기다리는 동안에는 생성 작업의 우선순위를 호출한 쪽(보통 사용자 요청)에 맞춰 올립니다.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = PREFETCH_ENABLED,
+        max_concurrent: int = PREFETCH_MAX_CONCURRENT,
+        timeout: float = PREFETCH_TIMEOUT
+    ):
+        self.enabled = enabled
+        self.max_concurrent = max_concurrent
+        self.timeout = timeout
+
+        # mode -> 규칙, kind -> key 함수
+        self._rules: Dict[str, _Rule] = {}
+        self._keys: Dict[str, PrefetchKey] = {}
+        # 사용자별 진행 중인 생성 (사용자당 하나)
+        self._pending: Dict[str, _Pending] = {}
+
+        self.stats: Dict[str, Any] = {
+            "started": 0,
+            "stored": 0,
+            "hits": 0,
+            "joined": 0,
+            "promoted": 0,
+            "misses": 0,
+            "cancelled": 0,
+            "failed": 0,
+            "skipped": 0,
+            "saved_seconds": 0.0
+        }
+
+    def rule(self, mode: str, kind: str, key: PrefetchKey, job: PrefetchJob) -> None:
+        """mode로 바뀌면 kind 결과를 job(세션)으로 미리 생성하도록 등록합니다."""
+        self._rules[mode] = _Rule(kind, key, job)
+        self._keys[kind] = key
+
+    def on_transition(self, user: str, session: Dict[str, Any]) -> None:
+        """
+        세션의 mode가 바뀐 뒤 호출합니다.
+        규칙이 있으면 미리 생성을 시작하고, 진행 중인 생성이 새 단계와 맞지 않으면 취소합니다.
+        """
+        rule = self._rules.get(session.get("mode", ""))
+        key = rule.key(session) if rule is not None else None
+
+        pending = self._pending.get(user)
+        if pending is not None:
+            if rule is not None and pending.kind == rule.kind and pending.key == key:
+                return
+            self.cancel(user)
+
+        if rule is None or not self.enabled:
+            return
+
+        stored = (session.get(SESSION_FIELD) or {}).get(rule.kind)
+        if stored and stored.get("key") == key:
+            return
+
+        if len(self._pending) >= self.max_concurrent:
+            self.stats["skipped"] += 1
+            return
+
+        self.stats["started"] += 1
+        job = JobPriority(Priority.BACKGROUND)
+        task = asyncio.ensure_future(self._run(user, rule, key, session, job))
+        pending = self._pending[user] = _Pending(rule.kind, key, task, job)
+        task.add_done_callback(lambda _: self._release(user, pending))
+
+    def cancel(self, user: str) -> None:
+        """사용자의 진행 중인 생성을 취소합니다. (저장된 결과는 세션과 함께 정리됨)"""
+        pending = self._pending.pop(user, None)
+        if pending is not None and not pending.task.done():
+            pending.task.cancel()
+            self.stats["cancelled"] += 1
+
+    async def take(self, user: str, kind: str) -> Optional[Any]:
+        """
+        미리 생성한 kind 결과를 꺼냅니다. 생성 중이면 끝날 때까지 기다립니다.
+
+        Returns:
+            생성된 결과 (없거나 현재 세션과 맞지 않으면 None, 이때는 평소처럼 생성할 것)
+        """
+        key_of = self._keys.get(kind)
+        if key_of is None:
+            return None
+
+        session = await session_store.get(user)
+        key = key_of(session)
+        stored = (session.get(SESSION_FIELD) or {}).get(kind)
+
+        if stored and stored.get("key") == key:
+            self.stats["hits"] += 1
+            self.stats["saved_seconds"] += stored.get("seconds", 0.0)
+        else:
+            pending = self._pending.get(user)
+            if pending is None or pending.kind != kind or pending.key != key:
+                self.stats["misses"] += 1
+                return None
+
+            # 사용자가 기다리기 시작했으므로 남은 LLM 호출은 사용자 요청과 같은 우선순위로 실행
+            # (백그라운드 우선순위로 두면 부하가 걸렸을 때 가장 먼저 밀려남)
+            if pending.job.raise_to(effective_priority()):
+                self.stats["promoted"] += 1
+
+            # 이미 진행된 만큼은 기다리지 않아도 됨 (기다리던 쪽이 취소되어도 생성은 계속되도록 wait 사용)
+            waited_from = time.monotonic()
+            await asyncio.wait({pending.task})
+            if pending.task.cancelled() or not pending.task.result():
+                self.stats["misses"] += 1
+                return None
+            self.stats["joined"] += 1
+            self.stats["saved_seconds"] += waited_from - pending.started_at
+            stored = {"value": pending.task.result()}
+
+        # 한 번 사용한 결과는 세션에서 제거
+        await session_store.update(user, lambda current: (current.get(SESSION_FIELD) or {}).pop(kind, None))
+        return stored["value"]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "saved_seconds": round(self.stats["saved_seconds"], 1),
+            "pending": len(self._pending)
+        }
+
+    def _release(self, user: str, pending: _Pending) -> None:
+        if self._pending.get(user) is pending:
+            del self._pending[user]
+
+    async def _run(self, user: str, rule: _Rule, key: str, session: Dict[str, Any], job: JobPriority) -> Any:
+        # 이 작업에서 발생하는 LLM 호출은 모두 작업 우선순위(처음에는 백그라운드)로 실행
+        current_priority.set(job)
+        started_at = time.monotonic()
+        try:
+            value = await asyncio.wait_for(rule.job(session), timeout=self.timeout)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.stats["failed"] += 1
+            logger.warning(f"미리 생성 실패: {rule.kind} ({str(e)})")
+            return None
+
+        if not value:
+            self.stats["failed"] += 1
+            return None
+
+        entry = {"key": key, "value": value, "seconds": round(time.monotonic() - started_at, 2)}
+        stored = False
+
+        def _store(current: Dict[str, Any]) -> None:
+            nonlocal stored
+            # 생성하는 동안 사용자가 다른 주제로 이동했으면 저장하지 않음
+            stored = rule.key(current) == key
+            if stored:
+                current.setdefault(SESSION_FIELD, {})[rule.kind] = entry
+
+        await session_store.update(user, _store)
+        if stored:
+            self.stats["stored"] += 1
+        return value
+
+
+# 프로세스 전역 다음 단계 미리 생성기
+prefetcher = Prefetcher()
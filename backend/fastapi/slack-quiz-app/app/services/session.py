@@ -0,0 +1,112 @@
+import json
+import sys
+import time
+from dataclasses import dataclass, fields
+from typing import Any, Dict, List, Optional
+
+
+@dataclass(slots=True)
+class UserSession:
+    """
+    사용자 학습 세션의 메모리 표현입니다.
+
+    - __slots__ 덕분에 인스턴스마다 __dict__가 없어 dict보다 작습니다.
+    - 목록/답변 필드는 사용하기 전까지 None으로 두어 빈 컨테이너를 만들지 않습니다.
+    - 크기가 큰 문제 목록은 UTF-8 JSON 바이트로 묶어서 보관하고 꺼낼 때 복원합니다.
+    - 알 수 없는 키는 extra에 보관하므로 저장소 밖에서 보면 dict 세션과 동일하게 동작합니다.
+    """
+
+    # LearningMode 값 또는 "selecting_level_check", "learning_completed" 같은 중간 단계
+    mode: str = ""
+    topic: str = ""
+    user_level: str = ""
+    level: str = ""
+
+    # 기본 학습
+    tags: Optional[List[str]] = None
+    current_tag_index: int = 0
+
+    # 심화 학습
+    subtopics: Optional[List[Dict[str, str]]] = None  # {"title", "description"} 목록
+    selected_subtopic: str = ""
+
+    # 면접 연습
+    interview_index: int = 0
+    interview_questions: Optional[bytes] = None  # 면접 질문 목록 (JSON 바이트)
+
+    # 레벨 테스트 / 퀴즈 문제 (JSON 바이트)와 사용자 답변 (문제 번호 문자열 -> 답변)
+    test_questions: Optional[bytes] = None
+    quiz_questions: Optional[bytes] = None
+    user_ox_answers: Optional[Dict[str, str]] = None
+    user_mc_answers: Optional[Dict[str, str]] = None
+    user_quiz_ox_answers: Optional[Dict[str, str]] = None
+    user_quiz_mc_answers: Optional[Dict[str, str]] = None
+
+    # 세션 결과물(태그, 문제 목록 등)을 만들 때 사용한 입력 (결과물 종류 -> 키)
+    artifact_keys: Optional[Dict[str, str]] = None
+
+    extra: Optional[Dict[str, Any]] = None
+    last_active: float = 0.0
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "UserSession":
+        """dict 세션을 변환합니다. 기본값과 같은 값은 저장하지 않습니다."""
+        session = cls(last_active=time.time())
+        for key, value in data.items():
+            if key in _PACKED_FIELDS:
+                if value is not None:
+                    value = json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+                setattr(session, key, value)
+            elif key in _FIELD_DEFAULTS and key not in _INTERNAL_FIELDS:
+                if isinstance(value, str):
+                    # 모드/주제 같은 짧은 문자열은 사용자 간에 같은 객체를 공유
+                    value = sys.intern(value)
+                setattr(session, key, value)
+            else:
+                if session.extra is None:
+                    session.extra = {}
+                session.extra[key] = value
+        return session
+
+    def to_dict(self) -> Dict[str, Any]:
+        """기본값이 아닌 필드만 담은 dict 세션을 반환합니다."""
+        data = {
+            name: getattr(self, name)
+            for name, default in _FIELD_DEFAULTS.items()
+            if name not in _INTERNAL_FIELDS and getattr(self, name) != default
+        }
+        for name in _PACKED_FIELDS:
+            if name in data:
+                data[name] = json.loads(data[name])
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def approx_size(self) -> int:
+        """
+        메모리 저장소에서 차지하는 대략적인 크기(바이트)
+        압축한 문제 목록 바이트와 목록/답변 컨테이너(한 단계까지)의 크기에 고정 크기를 더한 값입니다.
+        """
+        size = SESSION_BASE_BYTES
+        for name in _CONTAINER_FIELDS:
+            value = getattr(self, name)
+            if value is None:
+                continue
+            size += sys.getsizeof(value)
+            if isinstance(value, dict):
+                size += sum(sys.getsizeof(key) + sys.getsizeof(item) for key, item in value.items())
+            elif isinstance(value, list):
+                size += sum(sys.getsizeof(item) for item in value)
+        return size
+
+    def is_expired(self, idle_ttl: float, now: Optional[float] = None) -> bool:
+        return (now or time.time()) - self.last_active > idle_ttl
+
+
+# 목록/답변 필드를 뺀 세션 하나의 크기 (인스턴스, 짧은 문자열 필드, 저장소 항목. bench_session_memory로 측정)
+SESSION_BASE_BYTES = 448
+
+_INTERNAL_FIELDS = {"extra", "last_active"}
+_PACKED_FIELDS = ("test_questions", "quiz_questions", "interview_questions")
+_FIELD_DEFAULTS = {field.name: field.default for field in fields(UserSession)}
+_CONTAINER_FIELDS = tuple(name for name, default in _FIELD_DEFAULTS.items() if default is None)
@@ -0,0 +1,460 @@
+import asyncio
+import copy
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+from app.core.config import (
+    SESSION_BACKEND,
+    SESSION_DB_PATH,
+    SESSION_REDIS_URL,
+    SESSION_IDLE_TTL,
+    SESSION_MAX_ENTRIES,
+    SESSION_MAX_BYTES
+)
+from app.services.session import UserSession
+
+logger = logging.getLogger(__name__)
+
+# 세션을 제자리에서 수정하는 함수 (반환값은 사용하지 않음)
+SessionMutator = Callable[[Dict[str, Any]], Any]
+
+# 세션이 만료되거나 밀려나 사라졌을 때 사용자 ID로 호출되는 동기 함수
+ExpireListener = Callable[[str], Any]
+
+
+class SessionStore:
+    """
+    사용자별 학습 세션 저장소 인터페이스입니다.
+    세션은 JSON으로 직렬화 가능한 dict이며, get()이 반환한 dict를 수정해도 저장되지 않습니다.
+    변경은 set()/patch()/update()로만 반영합니다.
+    on_expire()로 등록한 함수는 세션이 만료되거나 밀려나 사라질 때 호출됩니다. (사용자별 부가 데이터 정리용)
+    """
+
+    def __init__(self):
+        self._expire_listeners: List[ExpireListener] = []
+
+    def on_expire(self, listener: ExpireListener) -> None:
+        """세션이 만료되거나 밀려났을 때 호출할 함수를 등록합니다."""
+        self._expire_listeners.append(listener)
+
+    def _notify_expired(self, users: Iterable[str]) -> None:
+        for user in users:
+            for listener in self._expire_listeners:
+                try:
+                    listener(user)
+                except Exception as e:
+                    logger.error(f"세션 만료 처리 실패 ({user}): {str(e)}")
+
+    async def get(self, user: str) -> Dict[str, Any]:
+        """사용자 세션을 반환합니다. 없으면 빈 dict를 반환합니다."""
+        raise NotImplementedError
+
+    async def set(self, user: str, session: Dict[str, Any]) -> None:
+        """사용자 세션 전체를 교체합니다."""
+        raise NotImplementedError
+
+    async def delete(self, user: str) -> None:
+        """사용자 세션을 삭제합니다."""
+        raise NotImplementedError
+
+    async def update(self, user: str, mutate: SessionMutator) -> Dict[str, Any]:
+        """
+        사용자 세션을 원자적으로 읽고-수정하고-씁니다.
+
+        Args:
+            user: Slack 사용자 ID
+            mutate: 세션 dict를 제자리에서 수정하는 동기 함수 (재시도될 수 있으므로 부수효과 금지)
+
+        Returns:
+            수정된 세션
+        """
+        raise NotImplementedError
+
+    async def patch(self, user: str, **changes: Any) -> Dict[str, Any]:
+        """세션의 일부 필드만 원자적으로 갱신합니다."""
+        return await self.update(user, lambda session: session.update(changes))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {}
+
+    async def close(self) -> None:
+        pass
+
+
+class MemorySessionStore(SessionStore):
+    """
+    프로세스 메모리 세션 저장소 (단일 워커 전용)
+
+    세션은 UserSession으로 압축해서 보관하고, 마지막 활동 순서로 정렬해 둡니다.
+    idle_ttl 동안 활동이 없는 세션은 제거되고, 세션 수가 max_entries를 넘거나
+    세션 크기(UserSession.approx_size) 합이 max_bytes를 넘으면 가장 오래 활동하지 않은 세션부터 밀려납니다.
+    방금 저장한 세션은 혼자 max_bytes를 넘더라도 밀어내지 않습니다.
+    """
+
+    def __init__(
+        self,
+        idle_ttl: float = SESSION_IDLE_TTL,
+        max_entries: int = SESSION_MAX_ENTRIES,
+        max_bytes: int = SESSION_MAX_BYTES
+    ):
+        super().__init__()
+        self.idle_ttl = idle_ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._sessions: "OrderedDict[str, UserSession]" = OrderedDict()
+        self._bytes = 0
+        self.stats: Dict[str, int] = {"expired": 0, "evicted": 0}
+
+    def _load(self, user: str, now: float) -> Optional[UserSession]:
+        session = self._sessions.get(user)
+        if session is None:
+            return None
+        if session.is_expired(self.idle_ttl, now):
+            self._remove(user)
+            self.stats["expired"] += 1
+            self._notify_expired([user])
+            return None
+
+        # 읽기도 활동으로 보고 가장 최근 위치로 이동
+        session.last_active = now
+        self._sessions.move_to_end(user)
+        return session
+
+    def _store(self, user: str, data: Dict[str, Any], now: float) -> None:
+        self._remove(user)
+        session = UserSession.from_dict(data)
+        self._sessions[user] = session
+        self._bytes += session.approx_size()
+        self._evict(now)
+
+    def _remove(self, user: str) -> None:
+        session = self._sessions.pop(user, None)
+        if session is not None:
+            self._bytes -= session.approx_size()
+
+    def _evict(self, now: float) -> None:
+        # 가장 오래 활동하지 않은 세션부터 정리
+        removed = []
+        while self._sessions:
+            user, oldest = next(iter(self._sessions.items()))
+            if oldest.is_expired(self.idle_ttl, now):
+                self.stats["expired"] += 1
+            elif len(self._sessions) > self.max_entries or (self._bytes > self.max_bytes and len(self._sessions) > 1):
+                self.stats["evicted"] += 1
+            else:
+                break
+            self._remove(user)
+            removed.append(user)
+        self._notify_expired(removed)
+
+    async def get(self, user: str) -> Dict[str, Any]:
+        session = self._load(user, time.time())
+        return copy.deepcopy(session.to_dict()) if session is not None else {}
+
+    async def set(self, user: str, session: Dict[str, Any]) -> None:
+        self._store(user, copy.deepcopy(session), time.time())
+
+    async def delete(self, user: str) -> None:
+        self._remove(user)
+
+    async def update(self, user: str, mutate: SessionMutator) -> Dict[str, Any]:
+        # await 없이 실행되므로 이벤트 루프 안에서 원자적
+        now = time.time()
+        current = self._load(user, now)
+        session = copy.deepcopy(current.to_dict()) if current is not None else {}
+        mutate(session)
+        self._store(user, session, now)
+        return copy.deepcopy(session)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "backend": "memory", "sessions": len(self._sessions), "bytes": self._bytes}
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    SQLite 세션 저장소. 재시작 후에도 유지되고, 같은 호스트의 여러 워커가 파일을 공유할 수 있습니다.
+    update()는 BEGIN IMMEDIATE 트랜잭션으로 프로세스 간에도 원자적입니다.
+    마지막 저장 후 idle_ttl이 지난 세션은 읽을 때 무시되고 주기적으로 삭제됩니다.
+    """
+
+    # 쓰기 몇 번마다 만료된 세션을 삭제할지
+    PURGE_EVERY = 1000
+
+    def __init__(self, db_path: str = SESSION_DB_PATH, idle_ttl: float = SESSION_IDLE_TTL):
+        super().__init__()
+        self.db_path = db_path
+        self.idle_ttl = idle_ttl
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._writes = 0
+        # 스레드에서 삭제한 만료 세션 (이벤트 루프로 돌아온 뒤 알림)
+        self._expired: List[str] = []
+
+    def _get_db(self) -> sqlite3.Connection:
+        if self._db is None:
+            # isolation_level=None: 트랜잭션을 직접 관리
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None, timeout=10)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS sessions "
+                "(user TEXT PRIMARY KEY, data TEXT NOT NULL, updated_at REAL NOT NULL DEFAULT 0)"
+            )
+            # updated_at 컬럼이 없던 이전 스키마 마이그레이션
+            columns = {row[1] for row in self._db.execute("PRAGMA table_info(sessions)")}
+            if "updated_at" not in columns:
+                self._db.execute("ALTER TABLE sessions ADD COLUMN updated_at REAL NOT NULL DEFAULT 0")
+                self._db.execute("UPDATE sessions SET updated_at = ?", (time.time(),))
+        return self._db
+
+    def _read(self, db: sqlite3.Connection, user: str) -> Dict[str, Any]:
+        row = db.execute(
+            "SELECT data FROM sessions WHERE user = ? AND updated_at > ?",
+            (user, time.time() - self.idle_ttl)
+        ).fetchone()
+        return json.loads(row[0]) if row else {}
+
+    def _write(self, db: sqlite3.Connection, user: str, session: Dict[str, Any]) -> None:
+        now = time.time()
+        # 기본값 필드를 빼고 저장
+        data = UserSession.from_dict(session).to_dict()
+        db.execute(
+            "INSERT OR REPLACE INTO sessions (user, data, updated_at) VALUES (?, ?, ?)",
+            (user, json.dumps(data, ensure_ascii=False), now)
+        )
+
+        self._writes += 1
+        if self._writes % self.PURGE_EVERY == 0:
+            cutoff = now - self.idle_ttl
+            self._expired.extend(row[0] for row in db.execute("SELECT user FROM sessions WHERE updated_at <= ?", (cutoff,)))
+            db.execute("DELETE FROM sessions WHERE updated_at <= ?", (cutoff,))
+
+    def _get(self, user: str) -> Dict[str, Any]:
+        with self._lock:
+            return self._read(self._get_db(), user)
+
+    def _set(self, user: str, session: Dict[str, Any]) -> None:
+        with self._lock:
+            self._write(self._get_db(), user, session)
+
+    def _delete(self, user: str) -> None:
+        with self._lock:
+            self._get_db().execute("DELETE FROM sessions WHERE user = ?", (user,))
+
+    def _update(self, user: str, mutate: SessionMutator) -> Dict[str, Any]:
+        with self._lock:
+            db = self._get_db()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                session = self._read(db, user)
+                mutate(session)
+                self._write(db, user, session)
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            return session
+
+    async def get(self, user: str) -> Dict[str, Any]:
+        return await asyncio.to_thread(self._get, user)
+
+    async def set(self, user: str, session: Dict[str, Any]) -> None:
+        await asyncio.to_thread(self._set, user, session)
+        self._flush_expired()
+
+    async def delete(self, user: str) -> None:
+        await asyncio.to_thread(self._delete, user)
+
+    async def update(self, user: str, mutate: SessionMutator) -> Dict[str, Any]:
+        session = await asyncio.to_thread(self._update, user, mutate)
+        self._flush_expired()
+        return session
+
+    def _flush_expired(self) -> None:
+        if not self._expired:
+            return
+        with self._lock:
+            expired, self._expired = self._expired, []
+        self._notify_expired(expired)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"backend": "sqlite", "writes": self._writes}
+
+    async def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+class RespError(Exception):
+    """Redis 프로토콜 서버가 반환한 오류"""
+
+
+class _RespConnection:
+    """Redis 직렬화 프로토콜(RESP)로 명령을 주고받는 최소한의 연결"""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    async def execute(self, *args: Any) -> Any:
+        parts = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode("utf-8")
+            parts.append(f"${len(data)}\r\n".encode() + data + b"\r\n")
+        self.writer.write(b"".join(parts))
+        await self.writer.drain()
+        return await self._read_reply()
+
+    async def _read_reply(self) -> Any:
+        line = await self.reader.readline()
+        if not line:
+            raise ConnectionError("Redis 연결이 끊어졌습니다.")
+
+        prefix, body = line[:1], line[1:-2]
+        if prefix == b"+":
+            return body.decode()
+        if prefix == b"-":
+            raise RespError(body.decode())
+        if prefix == b":":
+            return int(body)
+        if prefix == b"$":
+            length = int(body)
+            if length < 0:
+                return None
+            data = await self.reader.readexactly(length + 2)
+            return data[:-2]
+        if prefix == b"*":
+            length = int(body)
+            if length < 0:
+                return None
+            return [await self._read_reply() for _ in range(length)]
+        raise RespError(f"알 수 없는 응답 형식: {line!r}")
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Redis 프로토콜 세션 저장소. Redis 또는 RESP를 지원하는 로컬 대체 서버와 함께 사용합니다.
+    update()는 WATCH/MULTI/EXEC 낙관적 잠금으로 원자적이며, 충돌 시 다시 시도합니다.
+    WATCH는 연결 단위이므로 명령마다 풀에서 연결 하나를 전용으로 사용합니다.
+    세션은 저장할 때마다 idle_ttl 만료 시간이 다시 설정되고, 메모리 한도는 서버의 maxmemory 정책을 따릅니다.
+    만료는 Redis 서버가 처리하므로 on_expire() 함수는 호출되지 않습니다.
+    """
+
+    def __init__(
+        self,
+        url: str = SESSION_REDIS_URL,
+        pool_size: int = 10,
+        key_prefix: str = "session:",
+        idle_ttl: float = SESSION_IDLE_TTL
+    ):
+        super().__init__()
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.key_prefix = key_prefix
+        self.idle_ttl = int(idle_ttl)
+
+        self._idle: List[_RespConnection] = []
+        self._pool_size = pool_size
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _key(self, user: str) -> str:
+        return f"{self.key_prefix}{user}"
+
+    def _encode(self, session: Dict[str, Any]) -> str:
+        # 기본값 필드를 빼고 저장
+        return json.dumps(UserSession.from_dict(session).to_dict(), ensure_ascii=False)
+
+    async def _connect(self) -> _RespConnection:
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        conn = _RespConnection(reader, writer)
+        if self.password:
+            await conn.execute("AUTH", self.password)
+        if self.db:
+            await conn.execute("SELECT", self.db)
+        return conn
+
+    async def _run(self, fn: Callable[[_RespConnection], Any]) -> Any:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._pool_size)
+
+        async with self._semaphore:
+            conn = self._idle.pop() if self._idle else await self._connect()
+            try:
+                result = await fn(conn)
+            except BaseException:
+                # 응답을 다 읽지 못했을 수 있으므로 재사용하지 않음
+                conn.close()
+                raise
+            self._idle.append(conn)
+            return result
+
+    async def get(self, user: str) -> Dict[str, Any]:
+        async def _get(conn: _RespConnection):
+            raw = await conn.execute("GET", self._key(user))
+            return json.loads(raw) if raw else {}
+        return await self._run(_get)
+
+    async def set(self, user: str, session: Dict[str, Any]) -> None:
+        async def _set(conn: _RespConnection):
+            await conn.execute("SET", self._key(user), self._encode(session), "EX", self.idle_ttl)
+        await self._run(_set)
+
+    async def delete(self, user: str) -> None:
+        async def _delete(conn: _RespConnection):
+            await conn.execute("DEL", self._key(user))
+        await self._run(_delete)
+
+    async def update(self, user: str, mutate: SessionMutator, max_attempts: int = 20) -> Dict[str, Any]:
+        key = self._key(user)
+
+        async def _update(conn: _RespConnection):
+            for _ in range(max_attempts):
+                await conn.execute("WATCH", key)
+                raw = await conn.execute("GET", key)
+                session = json.loads(raw) if raw else {}
+                try:
+                    mutate(session)
+                except BaseException:
+                    await conn.execute("UNWATCH")
+                    raise
+
+                await conn.execute("MULTI")
+                await conn.execute("SET", key, self._encode(session), "EX", self.idle_ttl)
+                # 다른 클라이언트가 WATCH 이후 키를 바꿨으면 EXEC 결과가 None
+                if await conn.execute("EXEC") is not None:
+                    return session
+            raise RespError(f"세션 갱신 충돌이 계속 발생했습니다: {user}")
+
+        return await self._run(_update)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"backend": "redis", "idle_connections": len(self._idle)}
+
+    async def close(self) -> None:
+        while self._idle:
+            self._idle.pop().close()
+
+
+def create_session_store(backend: str = SESSION_BACKEND) -> SessionStore:
+    """설정에 맞는 세션 저장소를 생성합니다."""
+    if backend == "sqlite":
+        return SQLiteSessionStore()
+    if backend == "redis":
+        return RedisSessionStore()
+    return MemorySessionStore()
+
+
+# 프로세스 전역 세션 저장소
+session_store = create_session_store()
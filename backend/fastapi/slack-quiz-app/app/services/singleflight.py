@@ -0,0 +1,99 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.services.llm_scheduler import JobPriority, current_priority, effective_priority
+
+
+class _Call:
+    """진행 중인 요청 하나와 그 결과를 기다리는 호출자 수"""
+
+    __slots__ = ("task", "waiters", "job")
+
+    def __init__(self, task: asyncio.Task, job: Optional[JobPriority]):
+        self.task = task
+        self.waiters = 0
+        self.job = job
+
+
+class SingleFlight:
+    """
+    같은 키로 동시에 들어온 요청을 하나의 실제 요청으로 합칩니다.
+
+    - 첫 호출자가 요청을 시작하고, 이후 호출자는 같은 결과를 함께 기다립니다.
+    - 결과와 예외는 기다리는 모든 호출자에게 그대로 전달됩니다.
+    - 한 호출자가 취소되어도 나머지 호출자의 요청은 계속 진행되며,
+      기다리는 호출자가 모두 사라졌을 때만 실제 요청을 취소합니다.
+    - 백그라운드 작업이 시작한 요청에 사용자 요청이 합쳐지면 그 요청의 우선순위를 사용자 요청에 맞춰 올립니다.
+      (백그라운드 작업의 나머지 요청은 그대로)
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self.stats: Dict[str, int] = {
+            "leaders": 0,
+            "coalesced": 0,
+            "abandoned": 0,
+            "promoted": 0
+        }
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        key에 해당하는 요청이 진행 중이면 그 결과를 기다리고, 없으면 fn()을 실행합니다.
+
+        Args:
+            key: 요청을 구분하는 키 (보통 LLM 캐시 키)
+            fn: 실제 요청을 수행하는 코루틴 함수
+
+        Returns:
+            fn()의 결과
+        """
+        call = self._calls.get(key)
+        if call is None:
+            parent = current_priority.get()
+            job = JobPriority(parent=parent) if parent is not None else None
+            call = _Call(asyncio.ensure_future(self._lead(fn, job)), job)
+            self._calls[key] = call
+            call.task.add_done_callback(lambda task: self._on_done(key, call))
+            self.stats["leaders"] += 1
+        else:
+            self.stats["coalesced"] += 1
+            if call.job is not None and call.job.raise_to(effective_priority()):
+                self.stats["promoted"] += 1
+
+        call.waiters += 1
+        try:
+            # shield: 이 호출자가 취소되어도 공유 중인 요청은 취소되지 않음
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # 기다리는 호출자가 없으면 요청을 정리
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+                call.task.cancel()
+                self.stats["abandoned"] += 1
+
+    @staticmethod
+    async def _lead(fn: Callable[[], Awaitable[Any]], job: Optional[JobPriority]) -> Any:
+        # 이 요청만 따로 우선순위를 올릴 수 있도록 요청 전용 우선순위로 실행
+        if job is not None:
+            current_priority.set(job)
+        return await fn()
+
+    def in_flight(self) -> int:
+        """현재 진행 중인 요청 수를 반환합니다."""
+        return len(self._calls)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {**self.stats, "in_flight": self.in_flight()}
+
+    def _on_done(self, key: str, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        # 기다리는 호출자가 없을 때 "exception was never retrieved" 경고 방지
+        if not call.task.cancelled():
+            call.task.exception()
+
+
+# LLM 요청 공용 인스턴스
+llm_singleflight = SingleFlight()
@@ -0,0 +1,223 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+from slack_sdk.errors import SlackApiError
+from slack_sdk.web.async_client import AsyncWebClient
+
+from app.core.config import (
+    SLACK_CHANNEL_RATE,
+    SLACK_CHANNEL_BURST,
+    SLACK_COALESCE_MAX_CHARS
+)
+from app.services.http_clients import slack_client
+
+logger = logging.getLogger(__name__)
+
+# Block Kit section 하나에 들어갈 수 있는 최대 글자 수
+SECTION_TEXT_LIMIT = 3000
+# 하나로 합칠 수 있는 최대 메시지 수
+COALESCE_MAX_MESSAGES = 10
+
+
+class _Message:
+    __slots__ = ("payload", "future")
+
+    def __init__(self, payload: Dict[str, Any], future: asyncio.Future):
+        self.payload = payload
+        self.future = future
+
+    def is_small_text(self) -> bool:
+        # 블록/첨부 등 다른 옵션 없이 텍스트만 있는 메시지만 합칠 수 있음
+        return set(self.payload) == {"text"} and len(self.payload["text"]) <= SLACK_COALESCE_MAX_CHARS
+
+
+class _Channel:
+    __slots__ = ("queue", "tokens", "refilled_at", "paused_until", "worker")
+
+    def __init__(self, burst: float):
+        self.queue: Deque[_Message] = deque()
+        self.tokens = burst
+        self.refilled_at = time.monotonic()
+        self.paused_until = 0.0
+        self.worker: Optional[asyncio.Task] = None
+
+
+class SlackOutbox:
+    """
+    채널별 Slack 메시지 전송 큐입니다.
+
+    - 핸들러는 post()/sayer()로 메시지를 넣고 바로 다음 작업을 진행합니다.
+    - 채널마다 등록 순서대로 하나씩 전송하고, 채널별 한도(rate, burst) 안에서 쉬지 않고 보냅니다.
+    - 429 응답을 받으면 Retry-After 동안 그 채널만 멈췄다가 같은 메시지부터 다시 보냅니다.
+    - 한도 때문에 대기 중인 짧은 텍스트 메시지가 이어져 있으면 section 블록 여러 개로 된
+      메시지 하나로 합쳐서 보냅니다.
+    """
+
+    def __init__(
+        self,
+        client: AsyncWebClient,
+        rate: float = SLACK_CHANNEL_RATE,
+        burst: float = SLACK_CHANNEL_BURST,
+        max_channels: int = 10000
+    ):
+        self.client = client
+        self.rate = rate
+        self.burst = burst
+        self.max_channels = max_channels
+
+        self._channels: "OrderedDict[str, _Channel]" = OrderedDict()
+        self.stats: Dict[str, int] = {
+            "queued": 0,
+            "sent": 0,
+            "coalesced": 0,
+            "rate_limited": 0,
+            "failed": 0
+        }
+
+    def post(self, channel: str, **payload: Any) -> asyncio.Future:
+        """
+        메시지를 채널 큐에 넣고 바로 반환합니다.
+
+        Args:
+            channel: 채널 ID
+            payload: chat_postMessage에 넘길 인자 (text, blocks 등)
+
+        Returns:
+            전송이 끝나면 Slack 응답(실패 시 None)으로 완료되는 Future
+        """
+        future = asyncio.get_running_loop().create_future()
+        state = self._channel(channel)
+        state.queue.append(_Message(payload, future))
+        self.stats["queued"] += 1
+
+        if state.worker is None:
+            state.worker = asyncio.ensure_future(self._drain(channel, state))
+        return future
+
+    def sayer(self, channel: str) -> Callable[..., Awaitable[asyncio.Future]]:
+        """Bolt의 say()와 같은 방식으로 호출할 수 있는 전송 함수를 반환합니다."""
+        async def say(text: Any = None, blocks: Optional[List[Dict[str, Any]]] = None, **kwargs: Any) -> asyncio.Future:
+            if isinstance(text, dict):
+                kwargs.update(text)
+            elif text is not None:
+                kwargs["text"] = text
+            if blocks is not None:
+                kwargs["blocks"] = blocks
+            return self.post(channel, **kwargs)
+        return say
+
+    async def flush(self, timeout: float = 10.0) -> None:
+        """큐에 남은 메시지를 timeout 동안 전송합니다."""
+        workers = [state.worker for state in self._channels.values() if state.worker is not None]
+        if workers:
+            await asyncio.wait(workers, timeout=timeout)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            **self.stats,
+            "backlog": sum(len(state.queue) for state in self._channels.values())
+        }
+
+    def _channel(self, channel: str) -> _Channel:
+        state = self._channels.get(channel)
+        if state is None:
+            state = self._channels[channel] = _Channel(self.burst)
+            self._prune()
+        self._channels.move_to_end(channel)
+        return state
+
+    def _prune(self) -> None:
+        # 오래 사용하지 않은 채널 중 보낼 메시지가 없는 것부터 정리
+        for channel in list(self._channels):
+            if len(self._channels) <= self.max_channels:
+                break
+            if self._channels[channel].worker is None:
+                del self._channels[channel]
+
+    def _delay(self, state: _Channel) -> float:
+        """다음 메시지를 보낼 수 있을 때까지 남은 시간(초). 0이면 바로 가능."""
+        now = time.monotonic()
+        state.tokens = min(self.burst, state.tokens + (now - state.refilled_at) * self.rate)
+        state.refilled_at = now
+
+        delay = max(0.0, state.paused_until - now)
+        if state.tokens < 1:
+            delay = max(delay, (1 - state.tokens) / self.rate)
+        return delay
+
+    def _take(self, state: _Channel) -> List[_Message]:
+        first = state.queue.popleft()
+        batch = [first]
+        if not first.is_small_text():
+            return batch
+
+        total = len(first.payload["text"])
+        while state.queue and len(batch) < COALESCE_MAX_MESSAGES:
+            candidate = state.queue[0]
+            if not candidate.is_small_text():
+                break
+            total += len(candidate.payload["text"])
+            if total > SLACK_COALESCE_MAX_CHARS:
+                break
+            batch.append(state.queue.popleft())
+        return batch
+
+    def _payload(self, batch: List[_Message]) -> Dict[str, Any]:
+        if len(batch) == 1:
+            return batch[0].payload
+
+        texts = [message.payload["text"] for message in batch]
+        return {
+            "text": "\n".join(texts),
+            "blocks": [
+                {"type": "section", "text": {"type": "mrkdwn", "text": text[:SECTION_TEXT_LIMIT]}}
+                for text in texts
+                if text.strip()
+            ]
+        }
+
+    async def _drain(self, channel: str, state: _Channel) -> None:
+        try:
+            while state.queue:
+                delay = self._delay(state)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                    continue
+
+                batch = self._take(state)
+                state.tokens -= 1
+                response = None
+                try:
+                    response = await self.client.chat_postMessage(channel=channel, **self._payload(batch))
+                    self.stats["sent"] += 1
+                    self.stats["coalesced"] += len(batch) - 1
+
+                except SlackApiError as e:
+                    if e.response.status_code == 429:
+                        # 같은 메시지부터 다시 보내도록 큐 앞에 되돌림
+                        retry_after = float(e.response.headers.get("Retry-After", 1))
+                        state.paused_until = time.monotonic() + retry_after
+                        state.queue.extendleft(reversed(batch))
+                        self.stats["rate_limited"] += 1
+                        logger.warning(f"Slack 전송 한도 초과: {channel} ({retry_after}초 대기)")
+                        continue
+
+                    self.stats["failed"] += 1
+                    logger.error(f"Slack 메시지 전송 실패: {channel} ({e.response.get('error')})")
+
+                except Exception as e:
+                    self.stats["failed"] += 1
+                    logger.error(f"Slack 메시지 전송 실패: {channel} ({str(e)})")
+
+                for message in batch:
+                    if not message.future.done():
+                        message.future.set_result(response)
+        finally:
+            state.worker = None
+
+
+# 프로세스 전역 Slack 전송 큐
+slack_outbox = SlackOutbox(slack_client)
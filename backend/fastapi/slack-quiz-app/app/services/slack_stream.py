@@ -0,0 +1,161 @@
+import asyncio
+import logging
+import time
+from typing import List, Optional
+
+from slack_sdk.errors import SlackApiError
+
+from app.core.config import SLACK_STREAM_UPDATE_INTERVAL, SLACK_STREAM_MESSAGE_CHARS
+from app.services.slack_outbox import SlackOutbox, slack_outbox
+
+logger = logging.getLogger(__name__)
+
+# 생성 중임을 보여주는 표시
+CURSOR = " ▌"
+
+
+class SlackStreamWriter:
+    """
+    LLM 스트리밍 응답을 Slack 메시지 하나(길면 이어지는 메시지 여러 개)에 점진적으로 표시합니다.
+
+    - start()로 자리표시 메시지를 먼저 보내고, append()로 받은 조각은 interval마다 모아서 chat_update 합니다.
+    - 텍스트가 max_chars를 넘으면 앞 메시지는 그대로 두고 이어지는 메시지를 새로 보냅니다.
+    - 429 응답을 받으면 Retry-After 동안 수정을 미룹니다.
+    - finish(text)는 최종 텍스트로 마무리합니다. (캐시 적중 등으로 조각이 오지 않았어도 결과가 표시됨)
+
+    사용 예:
+        stream = SlackStreamWriter(channel, prefix="📝 *답변*\\n\\n")
+        await stream.start()
+        answer = await get_completion(prompt, on_token=stream.append)
+        await stream.finish(answer)
+    """
+
+    def __init__(
+        self,
+        channel: str,
+        prefix: str = "",
+        placeholder: str = "⏳ 답변을 생성하고 있습니다...",
+        interval: float = SLACK_STREAM_UPDATE_INTERVAL,
+        max_chars: int = SLACK_STREAM_MESSAGE_CHARS,
+        outbox: SlackOutbox = slack_outbox
+    ):
+        self.channel = channel
+        self.prefix = prefix
+        self.placeholder = placeholder
+        self.interval = interval
+        self.max_chars = max_chars
+        self.outbox = outbox
+
+        self._text = ""
+        # 이미 보낸 메시지의 ts와 마지막으로 표시한 내용
+        self._messages: List[str] = []
+        self._shown: List[str] = []
+        # 메시지별 시작 위치와 그때 기준이 된 텍스트
+        self._offsets: List[int] = []
+        self._laid_out = ""
+        self._next_update = 0.0
+        self._timer: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        self._finished = False
+
+    async def start(self) -> None:
+        """자리표시 메시지를 보냅니다. (앞서 큐에 들어간 메시지가 먼저 전송됨)"""
+        response = await self.outbox.post(self.channel, text=self.prefix + self.placeholder)
+        if response is not None:
+            self._messages.append(response["ts"])
+            self._shown.append(self.prefix + self.placeholder)
+        self._next_update = time.monotonic() + self.interval
+
+    def append(self, chunk: str) -> None:
+        """스트리밍으로 받은 텍스트 조각을 추가합니다. (LLM 호출의 on_token으로 사용)"""
+        if self._finished:
+            return
+        self._text += chunk
+        if self._timer is None:
+            delay = max(0.0, self._next_update - time.monotonic())
+            self._timer = asyncio.ensure_future(self._flush_later(delay))
+
+    async def finish(self, text: Optional[str] = None) -> None:
+        """최종 텍스트로 메시지를 마무리합니다."""
+        self._finished = True
+        if text is not None:
+            self._text = text
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        await self._flush(final=True)
+
+    async def _flush_later(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        self._timer = None
+        await self._flush(final=False)
+
+    def _layout(self, text: str) -> List[int]:
+        """
+        메시지별 시작 위치를 계산합니다.
+        이미 나눠진 앞부분이 그대로면 기존 위치를 유지해서 앞 메시지 내용이 바뀌지 않게 합니다.
+        """
+        offsets = self._offsets
+        if not offsets or not text.startswith(self._laid_out[:offsets[-1]]):
+            offsets = [0]
+        offsets = list(offsets)
+
+        limit = self.max_chars - len(CURSOR)
+        while len(text) - offsets[-1] > limit:
+            start = offsets[-1]
+            # 가능하면 뒤쪽 절반 안의 줄바꿈에서 자름
+            cut = text.rfind("\n", start + limit // 2, start + limit)
+            offsets.append(cut + 1 if cut != -1 else start + limit)
+        return offsets
+
+    async def _flush(self, final: bool) -> None:
+        async with self._lock:
+            text = self.prefix + self._text
+            self._offsets = self._layout(text)
+            self._laid_out = text
+
+            bounds = self._offsets + [len(text)]
+            segments = [text[bounds[i]:bounds[i + 1]] for i in range(len(self._offsets))]
+            if not final:
+                segments[-1] += CURSOR
+
+            for index, segment in enumerate(segments):
+                if index < len(self._messages):
+                    if self._shown[index] != segment:
+                        await self._update(index, segment)
+                else:
+                    # 길이 한도를 넘은 부분은 이어지는 메시지로 전송
+                    response = await self.outbox.post(self.channel, text=segment)
+                    if response is None:
+                        return
+                    self._messages.append(response["ts"])
+                    self._shown.append(segment)
+
+            # 최종 텍스트가 더 짧아져 남는 메시지는 삭제
+            while final and len(self._messages) > len(segments):
+                ts = self._messages.pop()
+                self._shown.pop()
+                try:
+                    await self.outbox.client.chat_delete(channel=self.channel, ts=ts)
+                except SlackApiError as e:
+                    logger.error(f"Slack 메시지 삭제 실패: {self.channel} ({e.response.get('error')})")
+
+    async def _update(self, index: int, text: str) -> None:
+        try:
+            await self.outbox.client.chat_update(channel=self.channel, ts=self._messages[index], text=text)
+            self._shown[index] = text
+            self._next_update = time.monotonic() + self.interval
+
+        except SlackApiError as e:
+            if e.response.status_code == 429:
+                retry_after = float(e.response.headers.get("Retry-After", 1))
+                self._next_update = time.monotonic() + retry_after
+                logger.warning(f"Slack 메시지 수정 한도 초과: {self.channel} ({retry_after}초 대기)")
+                if self._finished:
+                    # 마지막 내용은 반드시 반영
+                    await asyncio.sleep(retry_after)
+                    await self._update(index, text)
+                elif self._timer is None:
+                    self._timer = asyncio.ensure_future(self._flush_later(retry_after))
+                return
+            logger.error(f"Slack 메시지 수정 실패: {self.channel} ({e.response.get('error')})")
@@ -0,0 +1,379 @@
+import json
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.prompts.fsm_prompts import structured_repair_prompt
+from app.services.json_stream import InvalidElement, JsonArrayStream, TokenCallback, loads_lenient, stream_json_array
+from app.services.openai_service import get_structured_completion
+
+logger = logging.getLogger(__name__)
+
+_JSON_TYPES = {"string": str, "array": list, "object": dict, "integer": int}
+
+
+class Schema:
+    """
+    프롬프트 하나가 생성하는 JSON 배열 원소의 형식입니다.
+
+    - properties/required는 JSON Schema 형식이며 함수 호출 스키마로 그대로 사용됩니다.
+    - repair는 왕복 요청 없이 고칠 수 있는 흔한 오류(키 이름, 값 표기 등)를 고친 원소를 반환합니다.
+    - check는 필드 간 규칙을 검사하고, 문제가 있으면 오류 메시지를 반환합니다.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        properties: Dict[str, Dict[str, Any]],
+        required: List[str],
+        repair: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+        check: Optional[Callable[[Dict[str, Any]], Optional[str]]] = None
+    ):
+        self.name = name
+        self.description = description
+        self.properties = properties
+        self.required = required
+        self.repair = repair
+        self.check = check
+
+    @property
+    def function_name(self) -> str:
+        return f"submit_{self.name}"
+
+    def item_schema(self) -> Dict[str, Any]:
+        return {"type": "object", "properties": self.properties, "required": self.required}
+
+    def function(self) -> Dict[str, Any]:
+        """원소 배열 전체를 제출하는 함수 스키마"""
+        return {
+            "name": self.function_name,
+            "description": self.description,
+            "parameters": {
+                "type": "object",
+                "properties": {"items": {"type": "array", "items": self.item_schema()}},
+                "required": ["items"]
+            }
+        }
+
+    def item_function(self) -> Dict[str, Any]:
+        """원소 하나를 제출하는 함수 스키마 (잘못된 항목 재요청용)"""
+        return {
+            "name": self.function_name,
+            "description": self.description,
+            "parameters": self.item_schema()
+        }
+
+    def validate(self, item: Any) -> Optional[str]:
+        """원소가 형식에 맞으면 None, 아니면 오류 메시지를 반환합니다."""
+        if not isinstance(item, dict):
+            return "항목이 JSON 객체가 아닙니다."
+        for name in self.required:
+            if name not in item or item[name] in (None, ""):
+                return f"'{name}' 필드가 없습니다."
+        for name, spec in self.properties.items():
+            if name not in item:
+                continue
+            expected = _JSON_TYPES.get(spec.get("type", ""))
+            if expected and not isinstance(item[name], expected):
+                return f"'{name}' 필드는 {spec['type']} 형식이어야 합니다."
+            if "enum" in spec and item[name] not in spec["enum"]:
+                return f"'{name}' 필드는 {', '.join(spec['enum'])} 중 하나여야 합니다."
+        return self.check(item) if self.check else None
+
+
+class StructuredOutput:
+    """
+    LLM의 JSON 출력을 스키마로 검증하고, 고칠 수 있는 오류는 로컬에서 고칩니다.
+
+    - 코드 블록 표시, 앞뒤 설명 문장, 닫는 괄호 앞 쉼표, 잘린 배열은 재요청 없이 해석합니다.
+    - 스키마별 repair로 키 이름이나 값 표기를 고친 뒤 검증합니다.
+    - 그래도 잘못된 원소만 골라서 그 항목 하나를 다시 요청합니다. (전체 재생성 없음)
+    - 템플릿별로 파싱 실패/재요청 비율을 집계합니다.
+    """
+
+    def __init__(self, model: Optional[str] = None, max_reasks: int = 2):
+        # 없으면 모델 라우터가 스키마(템플릿)별로 선택
+        self.model = model
+        # 요청 한 번에서 재요청할 수 있는 최대 항목 수
+        self.max_reasks = max_reasks
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    async def complete(self, schema: Schema, prompt: str, temperature: float = 0.3) -> List[Dict[str, Any]]:
+        """
+        함수 호출로 원소 배열을 요청하고 검증된 원소 목록을 반환합니다.
+        해석할 수 있는 원소가 없으면 빈 목록을 반환합니다. (호출하는 쪽에서 기본값 사용)
+        """
+        stats = self._stats(schema)
+        stats["requests"] += 1
+
+        result = await get_structured_completion(
+            prompt,
+            [schema.function()],
+            model=self.model,
+            temperature=temperature,
+            function_call=schema.function_name,
+            template=schema.name
+        )
+        if "error" in result:
+            logger.error(f"구조화된 출력 요청 실패: {schema.name} ({result['error']})")
+            stats["fallbacks"] += 1
+            return []
+
+        payload = result.get("args", result.get("text"))
+        if isinstance(payload, str):
+            # 함수 인자 대신 텍스트로 답했거나 인자 JSON이 깨진 경우
+            try:
+                payload = loads_lenient(payload)
+                stats["repaired"] += 1
+            except ValueError:
+                stats["parse_failures"] += 1
+                stats["fallbacks"] += 1
+                return []
+
+        items = []
+        reasks = 0
+        for item in self._unwrap(payload):
+            item, reasked = await self._ensure(schema, prompt, item, reasks < self.max_reasks)
+            reasks += reasked
+            if item is not None:
+                items.append(item)
+
+        if not items:
+            stats["fallbacks"] += 1
+        return items
+
+    async def stream(
+        self,
+        schema: Schema,
+        prompt: str,
+        request: Callable[[TokenCallback], Awaitable[str]]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        스트리밍 응답에서 원소가 완성될 때마다 검증(필요하면 수정)해서 반환합니다.
+
+        Args:
+            schema: 원소 형식
+            prompt: 원래 프롬프트 (잘못된 항목 재요청 시 사용)
+            request: on_token 콜백을 받아 LLM을 호출하는 코루틴 함수
+        """
+        stats = self._stats(schema)
+        stats["requests"] += 1
+
+        parser = JsonArrayStream(keep_invalid=True)
+        count = 0
+        reasks = 0
+        async for item in stream_json_array(request, parser):
+            item, reasked = await self._ensure(schema, prompt, item, reasks < self.max_reasks)
+            reasks += reasked
+            if item is not None:
+                count += 1
+                yield item
+
+        stats["repaired"] += parser.repaired
+        if not parser.started:
+            stats["parse_failures"] += 1
+        if not count:
+            stats["fallbacks"] += 1
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        result = {}
+        for name, stats in self.stats.items():
+            requests = stats["requests"] or 1
+            result[name] = {
+                **stats,
+                "parse_failure_rate": round(stats["parse_failures"] / requests, 3),
+                "reask_rate": round(stats["reasks"] / requests, 3)
+            }
+        return result
+
+    def _stats(self, schema: Schema) -> Dict[str, int]:
+        stats = self.stats.get(schema.name)
+        if stats is None:
+            stats = self.stats[schema.name] = {
+                "requests": 0,
+                "items": 0,
+                "repaired": 0,
+                "invalid": 0,
+                "reasks": 0,
+                "reask_failures": 0,
+                "parse_failures": 0,
+                "fallbacks": 0
+            }
+        return stats
+
+    @staticmethod
+    def _unwrap(payload: Any) -> List[Any]:
+        # {"items": [...]} / {"questions": [...]} 처럼 배열을 감싼 객체와 단일 객체도 허용
+        if isinstance(payload, list):
+            return payload
+        if isinstance(payload, dict):
+            lists = [value for value in payload.values() if isinstance(value, list)]
+            if len(payload) == 1 and len(lists) == 1:
+                return lists[0]
+            return [payload]
+        return []
+
+    async def _ensure(self, schema: Schema, prompt: str, item: Any, can_reask: bool) -> Tuple[Optional[Dict[str, Any]], int]:
+        """원소를 검증하고, 로컬 수정으로 안 되면 그 항목만 다시 요청합니다. (원소, 재요청 수)를 반환합니다."""
+        stats = self._stats(schema)
+
+        if isinstance(item, InvalidElement):
+            fragment, error = item.text, "JSON 형식이 올바르지 않습니다."
+        else:
+            if schema.repair and isinstance(item, dict):
+                repaired = schema.repair(dict(item))
+                if repaired != item:
+                    stats["repaired"] += 1
+                item = repaired
+            error = schema.validate(item)
+            if error is None:
+                stats["items"] += 1
+                return item, 0
+            fragment = json.dumps(item, ensure_ascii=False)
+
+        stats["invalid"] += 1
+        logger.warning(f"구조화된 출력 형식 오류: {schema.name} ({error})")
+        if not can_reask:
+            return None, 0
+
+        stats["reasks"] += 1
+        result = await get_structured_completion(
+            structured_repair_prompt.format(
+                prompt=prompt,
+                fragment=fragment,
+                error=error,
+                function_name=schema.function_name
+            ),
+            [schema.item_function()],
+            model=self.model,
+            temperature=0,
+            function_call=schema.function_name,
+            template=f"{schema.name}_repair"
+        )
+
+        fixed = result.get("args")
+        if schema.repair and isinstance(fixed, dict):
+            fixed = schema.repair(fixed)
+        if fixed is None or schema.validate(fixed) is not None:
+            stats["reask_failures"] += 1
+            return None, 1
+
+        stats["items"] += 1
+        return fixed, 1
+
+
+# 문제 유형/정답 표기 정규화
+_QUESTION_TYPES = {
+    "ox": "OX", "o/x": "OX", "true/false": "OX",
+    "객관식 문제": "객관식", "multiple choice": "객관식", "multiple_choice": "객관식",
+    "주관식 문제": "주관식", "단답형": "주관식", "서술형": "주관식", "short answer": "주관식"
+}
+_OX_ANSWERS = {
+    "o": "O", "true": "O", "맞음": "O", "참": "O",
+    "x": "X", "false": "X", "틀림": "X", "거짓": "X"
+}
+
+
+def _repair_question(item: Dict[str, Any]) -> Dict[str, Any]:
+    question_type = str(item.get("type", "")).strip()
+    item["type"] = _QUESTION_TYPES.get(question_type.lower(), question_type)
+    if "question" not in item and "question_text" in item:
+        item["question"] = item["question_text"]
+    if isinstance(item.get("options"), dict):
+        item["options"] = list(item["options"].values())
+    if isinstance(item.get("answer"), bool):
+        item["answer"] = "true" if item["answer"] else "false"
+    elif isinstance(item.get("answer"), (int, float)):
+        item["answer"] = str(item["answer"])
+    if item["type"] == "OX" and isinstance(item.get("answer"), str):
+        answer = item["answer"].strip()
+        item["answer"] = _OX_ANSWERS.get(answer.lower(), answer)
+    return item
+
+
+def _check_question(item: Dict[str, Any]) -> Optional[str]:
+    if item["type"] == "OX" and item["answer"] not in ("O", "X"):
+        return "OX 문제의 정답은 O 또는 X여야 합니다."
+    if item["type"] == "객관식" and len(item.get("options") or []) < 2:
+        return "객관식 문제에는 보기가 2개 이상 있어야 합니다."
+    return None
+
+
+def _repair_subtopic(item: Dict[str, Any]) -> Dict[str, Any]:
+    for alias in ("name", "subtopic", "topic"):
+        if "title" not in item and alias in item:
+            item["title"] = item.pop(alias)
+    item.setdefault("description", "")
+    return item
+
+
+def _repair_interview(item: Dict[str, Any]) -> Dict[str, Any]:
+    if "basic" not in item and "advanced" not in item and "question" in item:
+        item["basic"] = item.pop("question")
+    if isinstance(item.get("followup"), str):
+        item["followup"] = [item["followup"]]
+    return item
+
+
+def _check_interview(item: Dict[str, Any]) -> Optional[str]:
+    if not item.get("basic") and not item.get("advanced"):
+        return "'basic' 또는 'advanced' 질문이 필요합니다."
+    return None
+
+
+_QUESTION_PROPERTIES = {
+    "type": {"type": "string", "enum": ["OX", "객관식", "주관식"]},
+    "question": {"type": "string"},
+    "options": {"type": "array", "items": {"type": "string"}},
+    "answer": {"type": "string"}
+}
+
+QUIZ_SCHEMA = Schema(
+    "quiz",
+    "생성한 퀴즈 문제 목록을 제출합니다.",
+    _QUESTION_PROPERTIES,
+    ["type", "question", "answer"],
+    repair=_repair_question,
+    check=_check_question
+)
+
+LEVEL_TEST_SCHEMA = Schema(
+    "level_test",
+    "생성한 수준 테스트 문제 목록을 제출합니다.",
+    {
+        **_QUESTION_PROPERTIES,
+        "level": {"type": "string"},
+        "topic": {"type": "string"}
+    },
+    ["type", "question", "answer"],
+    repair=_repair_question,
+    check=_check_question
+)
+
+SUBTOPIC_SCHEMA = Schema(
+    "subtopics",
+    "추출한 세부 학습 주제 목록을 제출합니다.",
+    {
+        "title": {"type": "string"},
+        "description": {"type": "string"}
+    },
+    ["title"],
+    repair=_repair_subtopic
+)
+
+INTERVIEW_SCHEMA = Schema(
+    "interview_questions",
+    "생성한 면접 질문 목록을 제출합니다. 각 항목은 basic 또는 advanced 질문 하나를 가집니다.",
+    {
+        "basic": {"type": "string"},
+        "advanced": {"type": "string"},
+        "followup": {"type": "array", "items": {"type": "string"}},
+        "answer": {"type": "string"}
+    },
+    ["answer"],
+    repair=_repair_interview,
+    check=_check_interview
+)
+
+# 프로세스 전역 구조화된 출력 처리기
+structured_output = StructuredOutput()
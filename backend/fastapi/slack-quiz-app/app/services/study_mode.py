@@ -10,20 +10,23 @@ from app.prompts.fsm_prompts import (
 )
 from app.chains.network_graph_fsm import (
     run_fsm,
-    generate_level_test,
-    evaluate_user_level,
-    extract_subtopics,
-    explain_advanced_topic,
-    generate_interview_questions,
-    NetworkGraphState
+    run_step,
+    extract_topic_tags
 )
-from typing import Dict, List, Any, Tuple, cast
+from app.services.artifacts import session_artifacts, artifact_key
+from typing import Dict, List, Any, Tuple, Optional, Callable
 import asyncio
 import random
 
-async def run_network_learning_fsm(topic: str) -> List[str]:
+async def run_network_learning_fsm(
+    topic: str,
+    on_token: Optional[Callable[[str], None]] = None,
+    user: Optional[str] = None
+) -> List[str]:
     """
     네트워크 학습 FSM을 실행하고 단계별 결과를 반환합니다.
+    on_token을 주면 기본 개념 설명을 생성하는 동안 조각마다 호출합니다.
+    user를 주면 세션에 저장된 태그를 재사용하고, 새로 추출한 태그는 세션에 저장합니다.
     """
     # 바로 초기 응답을 위한 단계별 메시지
     initial_steps = [
@@ -32,7 +35,10 @@ async def run_network_learning_fsm(topic: str) -> List[str]:
     ]
 
     # 실제 FSM 실행 (시간이 오래 걸릴 수 있음)
-    final_state = await run_fsm(topic)
+    tags = None
+    if user:
+        tags = await session_artifacts.get_or_create(user, "tags", artifact_key(topic), lambda: extract_topic_tags(topic))
+    final_state = await run_fsm(topic, on_token=on_token, tags=tags, user=user)
 
     # 결과 정리
     steps = []
@@ -70,9 +76,15 @@ async def run_network_learning_fsm(topic: str) -> List[str]:
 
     return initial_steps + steps
 
-async def process_level_test_answers(topic: str, answers: List[Dict[str, Any]]) -> Tuple[List[str], Dict[str, Any]]:
+async def process_level_test_answers(
+    topic: str,
+    answers: List[Dict[str, Any]],
+    user: Optional[str] = None
+) -> Tuple[List[str], Dict[str, Any]]:
     """
     사용자의 수준 테스트 답변을 처리하고 결과를 반환합니다.
+    answers에는 문제별 사용자 답(user_answer)과 정답(correct_answer)을 담아서 넘깁니다. (채점에 문제 목록은 필요 없음)
+    user를 주면 학습 흐름 체크포인트에서 이어서 실행합니다.
     """
     # 즉시 응답할 초기 메시지
     initial_steps = [
@@ -80,33 +92,10 @@ async def process_level_test_answers(topic: str, answers: List[Dict[str, Any]])
         "☕ 잠시만 기다려주세요..."
     ]
 
-    # 이 함수는 FSM 상태를 직접 조작합니다
-    state: Dict[str, Any] = {
-        "topic": topic,
-        "tags": [],
-        "mode": "learning",
-        "current_index": 0,
-        "explanation": "",
-        "user_question": "",
-        "level_test_questions": [],
-        "level_test_responses": answers,
-        "user_level": "",
-        "subtopics": [],
-        "selected_subtopic": "",
-        "interview_questions": [],
-        "current_interview_index": 0
-    }
-
-    # 먼저 테스트 생성
-    state = generate_level_test(cast(NetworkGraphState, state))
-
-    # 사용자 수준 평가
-    state = evaluate_user_level(cast(NetworkGraphState, state))
+    # 사용자 수준 평가 (추천할 서브토픽이 흐름에 없을 때만 추출)
+    state = await run_step(user, topic, mode="level_test", level_test_responses=answers)
     user_level = state["user_level"]
 
-    # 사용자 수준에 맞는 서브토픽 추출
-    state = extract_subtopics(cast(NetworkGraphState, state))
-
     # 결과 메시지 구성
     steps = []
     steps.append(f"📊 *테스트 결과*: 현재 {topic} 이해도는 *{user_level}* 수준으로 평가되었습니다.")
@@ -128,9 +117,46 @@ async def process_level_test_answers(topic: str, answers: List[Dict[str, Any]])
 
     return initial_steps + steps, state
 
-async def study_advanced_topic(topic: str, subtopic_index: int, user_level: str) -> List[str]:
+async def prepare_next_steps(
+    topic: str,
+    user_level: str,
+    user: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    수준이 정해진 뒤 다음 단계에서 쓸 세부 주제와 면접 질문(세부 주제 없이 user_level 수준)을 동시에 생성합니다.
+    user를 주면 세션에 저장된 결과물은 다시 만들지 않고, 새로 만든 결과물은 세션에 저장합니다.
+    기본 개념 학습과 동시에 실행할 수 있도록 사용자 학습 흐름 체크포인트는 사용하지 않습니다.
+    """
+    subtopics_key = artifact_key(topic)
+    interview_key = artifact_key(topic, "", user_level)
+    subtopics = await session_artifacts.get(user, "subtopics", subtopics_key)
+    questions = await session_artifacts.get(user, "interview", interview_key)
+
+    state = await run_step(
+        None,
+        topic,
+        mode="prepare_next",
+        user_level=user_level,
+        subtopics=subtopics or [],
+        interview_questions=questions or []
+    )
+    if not subtopics and state["subtopics"]:
+        await session_artifacts.put(user, "subtopics", subtopics_key, state["subtopics"])
+    if not questions and state["interview_questions"]:
+        await session_artifacts.put(user, "interview", interview_key, state["interview_questions"])
+    return state
+
+async def study_advanced_topic(
+    topic: str,
+    subtopic_index: int,
+    user_level: str,
+    on_token: Optional[Callable[[str], None]] = None,
+    user: Optional[str] = None
+) -> List[str]:
     """
     선택한 서브토픽에 대한 심화 학습을 제공합니다.
+    on_token을 주면 심화 설명을 생성하는 동안 조각마다 호출합니다.
+    user를 주면 사용자에게 보여준 (학습 흐름에 저장된) 세부 주제 목록에서 선택합니다.
     """
     # 즉시 응답할 초기 메시지
     initial_steps = [
@@ -138,39 +164,36 @@ async def study_advanced_topic(topic: str, subtopic_index: int, user_level: str)
         "💡 곧 자세한 내용이 제공됩니다."
     ]
 
-    # FSM 상태 초기화
-    state: Dict[str, Any] = {
-        "topic": topic,
-        "tags": [],
-        "mode": "advanced",
-        "current_index": 0,
-        "explanation": "",
-        "user_question": "",
-        "level_test_questions": [],
-        "level_test_responses": [],
-        "user_level": user_level,
-        "subtopics": [],
-        "selected_subtopic": subtopic_index,
-        "interview_questions": [],
-        "current_interview_index": 0
-    }
-
-    # 서브토픽 추출 (필요한 경우)
-    state = extract_subtopics(cast(NetworkGraphState, state))
+    # 서브토픽 목록 (미리 만들어 둔 목록을 우선 사용하고, 흐름에도 없을 때만 추출)
+    values: Dict[str, Any] = {"mode": "subtopic_selection", "user_level": user_level}
+    stored = await session_artifacts.get(user, "subtopics", artifact_key(topic))
+    if stored:
+        values["subtopics"] = stored
+    state = await run_step(user, topic, **values)
+    subtopics = state["subtopics"]
 
     # 선택한 서브토픽이 범위 내에 있는지 확인
-    if subtopic_index < 0 or subtopic_index >= len(state["subtopics"]):
+    if subtopic_index < 0 or subtopic_index >= len(subtopics):
         return initial_steps + ["❌ 잘못된 주제 번호입니다. 다시 시도해주세요."]
 
-    # 심화 주제 설명
-    state = explain_advanced_topic(cast(NetworkGraphState, state))
+    # 심화 주제 설명 (번호가 아니라 선택한 주제 제목으로 설명)
+    selected_subtopic = subtopics[subtopic_index]["title"]
+    state = await run_step(
+        user,
+        topic,
+        on_token=on_token,
+        mode="advanced_topic",
+        subtopics=subtopics,
+        selected_subtopic=selected_subtopic,
+        user_level=user_level,
+        explanation=""
+    )
 
     steps = []
-    selected_subtopic = state["subtopics"][subtopic_index]["title"]
     steps.append(f"🔍 *{selected_subtopic}* 심화 학습")
 
-    if "advanced_explanation" in state:
-        steps.append(state["advanced_explanation"])
+    if state.get("explanation"):
+        steps.append(state["explanation"])
 
     # 추가 학습 안내
     steps.append("\n💬 더 알고 싶은 내용이 있으면 '질문 [주제] [질문내용]' 형식으로 질문하세요.")
@@ -178,9 +201,17 @@ async def study_advanced_topic(topic: str, subtopic_index: int, user_level: str)
 
     return initial_steps + steps
 
-async def start_interview_session(topic: str, subtopic: str = "", user_level: str = "intermediate") -> List[str]:
+async def start_interview_session(
+    topic: str,
+    subtopic: str = "",
+    user_level: str = "intermediate",
+    questions: Optional[List[Dict[str, Any]]] = None,
+    user: Optional[str] = None
+) -> List[str]:
     """
     면접 세션을 시작하고 첫 번째 질문을 제공합니다.
+    questions를 주면 (미리 생성해 둔 질문) 새로 생성하지 않고 사용합니다.
+    user를 주면 질문 목록을 세션에 저장해서 다음 질문에서 같은 목록을 사용합니다.
     """
     # 즉시 응답할 초기 메시지
     initial_steps = [
@@ -188,25 +219,20 @@ async def start_interview_session(topic: str, subtopic: str = "", user_level: st
         "📝 실제 면접에서 자주 나오는 질문들을 준비하고 있습니다..."
     ]
 
-    # FSM 상태 초기화
-    state: Dict[str, Any] = {
-        "topic": topic,
-        "tags": [],
-        "mode": "interview",
-        "current_index": 0,
-        "explanation": "",
-        "user_question": "",
-        "level_test_questions": [],
-        "level_test_responses": [],
-        "user_level": user_level,
-        "subtopics": [],
-        "selected_subtopic": subtopic,
-        "interview_questions": [],
-        "current_interview_index": 0
-    }
-
-    # 면접 질문 생성
-    state = generate_interview_questions(cast(NetworkGraphState, state))
+    # 면접 질문 생성 (세션에 같은 조건의 질문이 있으면 재사용, 없으면 흐름에서 새로 생성)
+    key = artifact_key(topic, subtopic, user_level)
+    questions = questions or await session_artifacts.get(user, "interview", key)
+    state = await run_step(
+        user,
+        topic,
+        mode="interview",
+        selected_subtopic=subtopic,
+        user_level=user_level,
+        interview_questions=questions or [],
+        current_interview_index=0
+    )
+    if state["interview_questions"]:
+        await session_artifacts.put(user, "interview", key, state["interview_questions"])
 
     steps = []
     steps.append(f"🎤 *{topic} 관련 면접 질문 연습*")
@@ -225,38 +251,23 @@ async def start_interview_session(topic: str, subtopic: str = "", user_level: st
 
     return initial_steps + steps
 
-async def get_next_interview_question(topic: str, index: int, user_level: str = "intermediate") -> Tuple[List[str], bool]:
+async def get_next_interview_question(
+    topic: str,
+    index: int,
+    user_level: str = "intermediate",
+    user: Optional[str] = None
+) -> Tuple[List[str], bool]:
     """
     다음 면접 질문을 제공합니다.
+    user를 주면 학습 흐름에 저장된 (진행 중인 면접의) 질문 목록을 사용합니다. (질문마다 새로 생성하지 않음)
     """
     # 즉시 응답할 초기 메시지
     initial_steps = [
         "🔄 다음 면접 질문을 준비 중입니다..."
     ]
 
-    # FSM 상태 초기화
-    state: Dict[str, Any] = {
-        "topic": topic,
-        "tags": [],
-        "mode": "interview",
-        "current_index": 0,
-        "explanation": "",
-        "user_question": "",
-        "level_test_questions": [],
-        "level_test_responses": [],
-        "user_level": user_level,
-        "subtopics": [],
-        "selected_subtopic": "",
-        "interview_questions": [],
-        "current_interview_index": index
-    }
-
-    # 면접 질문이 없으면 생성
-    if not state["interview_questions"]:
-        state = generate_interview_questions(cast(NetworkGraphState, state))
-
-    # 현재 인덱스의 질문 가져오기
-    state = get_interview_question(cast(NetworkGraphState, state))
+    # 현재 인덱스의 질문 가져오기 (면접 질문이 없으면 생성)
+    state = await run_step(user, topic, mode="interview", user_level=user_level, current_interview_index=index)
 
     steps = []
 
@@ -285,9 +296,15 @@ async def get_next_interview_question(topic: str, index: int, user_level: str =
 
     return initial_steps + steps, is_completed
 
-async def answer_user_question(topic: str, tag_index: int, question: str) -> str:
+async def answer_user_question(
+    topic: str,
+    tag_index: int,
+    question: str,
+    on_token: Optional[Callable[[str], None]] = None
+) -> str:
     """
     사용자 질문에 답변합니다.
+    on_token을 주면 답변을 생성하는 동안 조각마다 호출합니다.
     """
     # 시간이 오래 걸릴 수 있는 비동기 처리
     from app.services.openai_service import get_completion
@@ -300,7 +317,7 @@ async def answer_user_question(topic: str, tag_index: int, question: str) -> str
 
     # 답변 생성
     try:
-        response = await get_completion(prompt)
+        response = await get_completion(prompt, on_token=on_token, template="user_question")
         return response.strip()
     except Exception as e:
         return f"답변을 생성하는 중 오류가 발생했습니다: {str(e)}"
\ No newline at end of file
@@ -0,0 +1,68 @@
+import time
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+from app.core.config import USER_LLM_BURST, USER_LLM_REFILL_PER_MINUTE
+
+
+class UserRateLimiter:
+    """
+    Slack 사용자별 토큰 버킷입니다.
+    LLM을 호출하는 요청마다 토큰을 소모하고, 버킷이 비면 대기열에 넣지 않고 바로 거절합니다.
+    """
+
+    def __init__(
+        self,
+        capacity: float = USER_LLM_BURST,
+        refill_per_minute: float = USER_LLM_REFILL_PER_MINUTE,
+        max_users: int = 10000
+    ):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_minute / 60
+        self.max_users = max_users
+
+        # user -> (남은 토큰, 마지막 갱신 시각)
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self.stats: Dict[str, int] = {"allowed": 0, "rejected": 0}
+
+    def _current(self, user: str) -> float:
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.get(user, (self.capacity, now))
+        tokens = min(self.capacity, tokens + (now - updated_at) * self.refill_per_second)
+        self._buckets[user] = (tokens, now)
+        self._buckets.move_to_end(user)
+
+        # 오래 활동하지 않은 사용자의 버킷은 가득 찬 상태와 같으므로 버려도 됨
+        while len(self._buckets) > self.max_users:
+            self._buckets.popitem(last=False)
+        return tokens
+
+    def try_acquire(self, user: str, cost: float = 1.0) -> bool:
+        """
+        사용자의 버킷에서 cost만큼 소모합니다.
+
+        Returns:
+            소모에 성공하면 True, 버킷이 부족하면 False
+        """
+        tokens = self._current(user)
+        if tokens < cost:
+            self.stats["rejected"] += 1
+            return False
+
+        self._buckets[user] = (tokens - cost, self._buckets[user][1])
+        self.stats["allowed"] += 1
+        return True
+
+    def retry_after(self, user: str, cost: float = 1.0) -> float:
+        """다시 요청할 수 있을 때까지 남은 시간(초)을 반환합니다."""
+        missing = cost - self._current(user)
+        if missing <= 0:
+            return 0.0
+        return missing / self.refill_per_second if self.refill_per_second > 0 else float("inf")
+
+    def get_stats(self) -> Dict[str, int]:
+        return {**self.stats, "tracked_users": len(self._buckets)}
+
+
+# 프로세스 전역에서 공유하는 사용자별 한도
+user_rate_limiter = UserRateLimiter()
@@ -0,0 +1,60 @@
+"""
+비동기 FSM 노드 벤치마크
+
+run_fsm N개를 동시에 실행해서 걸린 시간과 그동안 이벤트 루프가 멈춘 최대 시간(Slack ack 지연)을 잽니다.
+- async: 가짜 LLM이 asyncio.sleep으로 기다림 (ainvoke를 쓰는 현재 노드)
+- blocking: 가짜 LLM이 time.sleep으로 기다림 (이전의 동기 llm.invoke 호출)
+주제를 모두 다르게 해서 응답 캐시나 동일 요청 합치기로 호출이 줄지 않게 합니다.
+
+    python -m benchmarks.bench_async_nodes [--users 20] [--latency 0.5]
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.fakes import FakeLLM, report
+
+from app.chains.network_graph_fsm import run_fsm
+
+
+async def watch_loop(stop: asyncio.Event, interval: float = 0.01) -> float:
+    """이벤트 루프가 interval보다 늦게 깨어난 최대 시간(초)"""
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - start - interval)
+    return worst
+
+
+async def measure(llm: FakeLLM, users: int, run: int) -> tuple:
+    stop = asyncio.Event()
+    watcher = asyncio.create_task(watch_loop(stop))
+    await asyncio.sleep(0)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run_fsm(f"주제 {run}-{i}") for i in range(users)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    return elapsed, await watcher
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.5)
+    args = parser.parse_args()
+
+    rows = [["LLM 대기 방식", "동시 실행", "걸린 시간 s", "이벤트 루프 최대 멈춤 s", "LLM 호출"]]
+    for run, blocking in enumerate((False, True)):
+        llm = FakeLLM(latency=args.latency, chunks=1, chunk_delay=0, blocking=blocking).install()
+        for users in (1, args.users):
+            elapsed, stalled = await measure(llm, users, run * 1000 + users)
+            rows.append(["blocking" if blocking else "async", users, f"{elapsed:.2f}", f"{stalled:.2f}", sum(llm.calls.values())])
+            llm.calls.clear()
+    report(f"run_fsm 동시 실행 (LLM 지연 {args.latency}s)", rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,108 @@
+"""
+사용자별 공정 분배 시뮬레이션
+
+일반 사용자 50명(평균 --interval초마다 요청 하나)과 초당 --abuse-rate개씩 요청을 몰아 보내는 사용자 1명이
+같은 LLM 호출 한도 스케줄러를 나눠 쓸 때 일반 사용자 요청의 대기+응답 시간 p95를 비교합니다.
+LLM 호출은 슬롯을 잡은 뒤 --service초 기다리는 것으로 대신합니다.
+
+- 일반 사용자만: 기준값
+- 사용자 구분 없음: 모든 요청을 같은 사용자로 큐잉 (공정 큐잉 이전과 같은 FIFO)
+- 공정 큐잉: current_user_id로 사용자별 가중 공정 큐잉
+- 공정 큐잉 + 사용자 한도: 버킷이 빈 요청은 대기열에 넣지 않고 바로 거절 (handlers.is_rate_limited)
+
+    python -m benchmarks.bench_fair_share [--duration 10] [--concurrency 8]
+"""
+import argparse
+import asyncio
+import random
+import time
+from typing import Dict, List
+
+from benchmarks.fakes import percentile, report
+
+from app.services.llm_scheduler import LLMScheduler, current_user_id
+from app.services.user_rate_limit import UserRateLimiter
+
+NORMAL_USERS = 50
+ABUSER = "U_ABUSER"
+
+
+class Simulation:
+    def __init__(self, args: argparse.Namespace, fair: bool, limited: bool):
+        self.args = args
+        self.fair = fair
+        self.scheduler = LLMScheduler(rpm=1_000_000, tpm=1_000_000_000, max_concurrency=args.concurrency)
+        self.limiter = UserRateLimiter() if limited else None
+        self.latencies: Dict[str, List[float]] = {"normal": [], "abuser": []}
+        self.rejected: Dict[str, int] = {"normal": 0, "abuser": 0}
+        self.tasks: List[asyncio.Task] = []
+
+    async def request(self, user: str) -> None:
+        kind = "abuser" if user == ABUSER else "normal"
+        if self.limiter is not None and not self.limiter.try_acquire(user):
+            self.rejected[kind] += 1
+            return
+
+        current_user_id.set(user if self.fair else "")
+        start = time.perf_counter()
+        async with self.scheduler.slot(500):
+            await asyncio.sleep(self.args.service)
+        self.latencies[kind].append(time.perf_counter() - start)
+
+    async def user_loop(self, user: str, interval: float, rng: random.Random) -> None:
+        # 요청 간격은 평균 interval인 지수 분포, duration이 지나면 더 보내지 않음
+        start = time.perf_counter()
+        at = rng.uniform(0, interval)
+        while at < self.args.duration:
+            await asyncio.sleep(max(0.0, start + at - time.perf_counter()))
+            self.tasks.append(asyncio.create_task(self.request(user)))
+            at += rng.expovariate(1 / interval)
+
+    async def run(self, abuse: bool) -> None:
+        rng = random.Random(42)
+        loops = [self.user_loop(f"U{i:02d}", self.args.interval, rng) for i in range(NORMAL_USERS)]
+        if abuse:
+            loops.append(self.user_loop(ABUSER, 1 / self.args.abuse_rate, rng))
+        await asyncio.gather(*loops)
+        await asyncio.gather(*self.tasks)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--interval", type=float, default=10.0)
+    parser.add_argument("--abuse-rate", type=float, default=40.0)
+    parser.add_argument("--service", type=float, default=0.2)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    scenarios = [
+        ("일반 사용자만", False, True, False),
+        ("사용자 구분 없음", True, False, False),
+        ("공정 큐잉", True, True, False),
+        ("공정 큐잉 + 사용자 한도", True, True, True)
+    ]
+    rows = [["시나리오", "일반 p50 s", "일반 p95 s", "일반 요청", "과다 사용자 처리", "과다 사용자 p95 s", "즉시 거절 (일반/과다)"]]
+    for name, abuse, fair, limited in scenarios:
+        simulation = Simulation(args, fair, limited)
+        await simulation.run(abuse)
+        normal = simulation.latencies["normal"]
+        abuser = simulation.latencies["abuser"]
+        rows.append([
+            name,
+            f"{percentile(normal, 0.5):.2f}",
+            f"{percentile(normal, 0.95):.2f}",
+            len(normal),
+            len(abuser),
+            f"{percentile(abuser, 0.95):.2f}" if abuser else "-",
+            f"{simulation.rejected['normal']}/{simulation.rejected['abuser']}"
+        ])
+    report(
+        f"LLM 동시 요청 {args.concurrency}개, 호출당 {args.service}s, "
+        f"일반 사용자 {NORMAL_USERS}명 x {1 / args.interval:.2f}req/s, 과다 사용자 {args.abuse_rate:.0f}req/s",
+        rows
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
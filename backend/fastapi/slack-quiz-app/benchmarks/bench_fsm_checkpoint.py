@@ -0,0 +1,113 @@
+"""
+학습 흐름 체크포인트 벤치마크 (memory / sqlite)
+
+세션 하나를 학습 → 수준 테스트 → 심화 → 면접 질문까지 진행한 뒤
+이어서 실행하는 단계(면접 질문 넘기기)의 지연 시간과 세션당 체크포인트 크기를 잽니다.
+LLM은 가짜(지연 없음)이므로 측정값은 그래프/체크포인터 오버헤드입니다.
+비교를 위해 이전 체크포인트를 지우지 않는 경우(prune 없음)도 함께 잽니다.
+
+    python -m benchmarks.bench_fsm_checkpoint [--steps 200]
+"""
+import argparse
+import asyncio
+import os
+import pickle
+import sqlite3
+import tempfile
+import time
+
+from benchmarks.fakes import FakeLLM, percentile, report
+
+from app.chains.network_graph_fsm import get_study_graph
+from app.services import study_mode
+from app.services.fsm_checkpoint import fsm_checkpointer
+
+TOPIC = "TCP"
+
+
+async def run_flow(user: str) -> None:
+    await study_mode.run_network_learning_fsm(TOPIC, user=user)
+    await study_mode.process_level_test_answers(TOPIC, [{"user_answer": "O", "correct_answer": "O"}], user=user)
+    await study_mode.study_advanced_topic(TOPIC, 1, "advanced", user=user)
+    await study_mode.start_interview_session(TOPIC, user_level="advanced", user=user)
+
+
+def memory_size(user: str) -> tuple:
+    saver = fsm_checkpointer.saver
+    # storage: thread_id -> checkpoint_ns -> checkpoint_id -> (checkpoint, metadata, parent_id)
+    saved = [entry for per_ns in saver.storage[user].values() for entry in per_ns.values()]
+    size = sum(len(pickle.dumps(entry)) for entry in saved)
+    size += sum(len(pickle.dumps(value)) for key, value in saver.blobs.items() if key[0] == user)
+    size += sum(len(pickle.dumps(value)) for key, value in saver.writes.items() if key[0] == user)
+    checkpoints = len(saved)
+    return checkpoints, size
+
+
+def sqlite_size(db_path: str, user: str) -> tuple:
+    with sqlite3.connect(db_path) as db:
+        count, size = db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(checkpoint) + LENGTH(metadata)), 0) FROM checkpoints WHERE thread_id = ?",
+            (user,)
+        ).fetchone()
+        writes = db.execute(
+            "SELECT COALESCE(SUM(LENGTH(value)), 0) FROM writes WHERE thread_id = ?", (user,)
+        ).fetchone()[0]
+    return count, size + writes
+
+
+async def keep_all(user: str) -> None:
+    return None
+
+
+async def measure(backend: str, steps: int, prune: bool = True) -> list:
+    db_path = os.path.join(tempfile.mkdtemp(), "checkpoints.db")
+    fsm_checkpointer.backend = backend
+    fsm_checkpointer.db_path = db_path
+    await fsm_checkpointer.start()
+    if not prune:
+        fsm_checkpointer.prune = keep_all
+    try:
+        user = f"U-{backend}-{prune}"
+        await run_flow(user)
+
+        latencies = []
+        for i in range(steps):
+            start = time.perf_counter()
+            await study_mode.get_next_interview_question(TOPIC, i % 5, user=user)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        config = {"configurable": {"thread_id": user}}
+        start = time.perf_counter()
+        for _ in range(steps):
+            await get_study_graph().aget_state(config)
+        state_ms = (time.perf_counter() - start) / steps * 1000
+
+        checkpoints, size = memory_size(user) if backend == "memory" else sqlite_size(db_path, user)
+        return [
+            backend if prune else f"{backend} (prune 없음)",
+            f"{sum(latencies) / steps:.2f}",
+            f"{percentile(latencies, 0.95):.2f}",
+            f"{state_ms:.2f}",
+            checkpoints,
+            f"{size / 1024:.1f}"
+        ]
+    finally:
+        vars(fsm_checkpointer).pop("prune", None)
+        await fsm_checkpointer.close()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--steps", type=int, default=200)
+    args = parser.parse_args()
+
+    llm = FakeLLM(latency=0, chunks=1, chunk_delay=0).install()
+    rows = [["backend", "resume avg ms", "resume p95 ms", "aget_state ms", "checkpoints", "session KiB"]]
+    for backend in ("memory", "sqlite"):
+        for prune in (True, False):
+            rows.append(await measure(backend, args.steps, prune))
+    report(f"이어서 실행하는 단계 {args.steps}회 (LLM 호출 {sum(llm.calls.values())}회)", rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
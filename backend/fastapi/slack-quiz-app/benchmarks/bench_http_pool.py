@@ -0,0 +1,140 @@
+"""
+HTTP 연결 풀 벤치마크
+
+로컬 aiohttp 서버를 Slack / OpenAI API 대신 띄우고, 세션 --sessions개가 동시에 요청을 --requests번씩 보낼 때
+서버가 받은 TCP 연결 수와 요청 지연 시간을 비교합니다.
+- 공용 풀: http_clients의 slack_client(공용 aiohttp 세션)와 openai_client(공용 httpx 풀)
+- 요청마다 새 클라이언트: 연결 풀 이전처럼 요청마다 클라이언트를 만들고 닫음
+OpenAI 요청은 앱과 같이 LLM 호출 한도 스케줄러(동시 요청 LLM_MAX_CONCURRENCY개)를 거칩니다. (분당 한도는 끔)
+로컬 평문 HTTP라 TLS 핸드셰이크 비용은 빠져 있습니다. (실제 API에서는 새 연결마다 더 비쌈)
+
+    python -m benchmarks.bench_http_pool [--sessions 200] [--requests 2]
+"""
+import argparse
+import asyncio
+import time
+from typing import Awaitable, Callable, List, Set, Tuple
+
+from aiohttp import web
+from openai import AsyncOpenAI
+from slack_sdk.web.async_client import AsyncWebClient
+
+from benchmarks.fakes import percentile, report
+
+from app.services import http_clients
+from app.services.llm_scheduler import LLMScheduler
+
+COMPLETION = {
+    "id": "chatcmpl-bench",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "gpt-4o-mini",
+    "choices": [{"index": 0, "message": {"role": "assistant", "content": "설명"}, "finish_reason": "stop"}]
+}
+
+
+class FakeAPIServer:
+    """응답마다 delay초 기다리고, 요청을 보낸 클라이언트 주소(=TCP 연결)를 기록합니다."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.connections: Set[Tuple[str, int]] = set()
+        self.runner: web.AppRunner = None
+        self.url = ""
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_post("/api/{method}", self.slack)
+        app.router.add_post("/v1/chat/completions", self.openai)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0, backlog=1024)
+        await site.start()
+        self.url = "http://127.0.0.1:%d" % self.runner.addresses[0][1]
+
+    async def slack(self, request: web.Request) -> web.Response:
+        self.connections.add(request.transport.get_extra_info("peername"))
+        await request.read()
+        await asyncio.sleep(self.delay)
+        return web.json_response({"ok": True, "ts": "1.0", "channel": "C1"})
+
+    async def openai(self, request: web.Request) -> web.Response:
+        self.connections.add(request.transport.get_extra_info("peername"))
+        await request.read()
+        await asyncio.sleep(self.delay)
+        return web.json_response(COMPLETION)
+
+
+async def run_sessions(sessions: int, requests: int, call: Callable[[int], Awaitable[object]]) -> Tuple[float, List[float]]:
+    latencies: List[float] = []
+
+    async def session(n: int) -> None:
+        for _ in range(requests):
+            start = time.perf_counter()
+            await call(n)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(session(n) for n in range(sessions)))
+    return time.perf_counter() - start, latencies
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=2)
+    parser.add_argument("--delay", type=float, default=0.02)
+    args = parser.parse_args()
+
+    server = FakeAPIServer(args.delay)
+    await server.start()
+    slack_url = f"{server.url}/api/"
+    openai_url = f"{server.url}/v1"
+    messages = [{"role": "user", "content": "TCP"}]
+    scheduler = LLMScheduler(rpm=1_000_000, tpm=1_000_000_000)
+
+    # 공용 풀 (앱과 같은 설정)
+    http_clients.slack_client.base_url = slack_url
+    await http_clients.start_http_clients()
+    shared_openai = http_clients.openai_client.with_options(base_url=openai_url)
+
+    async def slack_shared(n: int) -> object:
+        return await http_clients.slack_client.chat_postMessage(channel=f"C{n}", text="안녕하세요")
+
+    async def slack_per_request(n: int) -> object:
+        return await AsyncWebClient(token="xoxb-bench", base_url=slack_url).chat_postMessage(channel=f"C{n}", text="안녕하세요")
+
+    async def openai_shared(n: int) -> object:
+        async with scheduler.slot(100):
+            return await shared_openai.chat.completions.create(model="gpt-4o-mini", messages=messages)
+
+    async def openai_per_request(n: int) -> object:
+        async with scheduler.slot(100):
+            async with AsyncOpenAI(api_key="bench-key", base_url=openai_url, max_retries=0) as client:
+                return await client.chat.completions.create(model="gpt-4o-mini", messages=messages)
+
+    rows = [["API", "클라이언트", "TCP 연결", "걸린 시간 s", "p50 ms", "p95 ms"]]
+    for api, label, call in (
+        ("Slack", "공용 풀", slack_shared),
+        ("Slack", "요청마다 새 클라이언트", slack_per_request),
+        ("OpenAI", "공용 풀", openai_shared),
+        ("OpenAI", "요청마다 새 클라이언트", openai_per_request)
+    ):
+        server.connections.clear()
+        elapsed, latencies = await run_sessions(args.sessions, args.requests, call)
+        rows.append([
+            api,
+            label,
+            len(server.connections),
+            f"{elapsed:.2f}",
+            f"{percentile(latencies, 0.5) * 1000:.0f}",
+            f"{percentile(latencies, 0.95) * 1000:.0f}"
+        ])
+
+    await http_clients.close_http_clients()
+    await server.runner.cleanup()
+    report(f"동시 세션 {args.sessions}개 x 요청 {args.requests}번 (서버 응답 {args.delay}s)", rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
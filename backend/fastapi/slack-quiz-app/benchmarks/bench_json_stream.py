@@ -0,0 +1,68 @@
+"""
+문제 스트리밍 벤치마크
+
+LLM이 문제 5개짜리 JSON 배열을 조각으로 나눠 보낼 때 첫 문제와 마지막 문제를 받기까지 걸린 시간을 비교합니다.
+- 전체 응답 대기: 응답이 끝난 뒤 JSON을 한 번에 해석 (이전 방식)
+- 스트리밍: JsonArrayStream으로 원소가 완성될 때마다 반환 (stream_level_test_questions / stream_quiz_questions)
+
+    python -m benchmarks.bench_json_stream [--latency 0.5] [--chunks 40] [--chunk-delay 0.05]
+"""
+import argparse
+import asyncio
+import time
+from typing import AsyncIterator, Callable, Dict, List
+
+from benchmarks.fakes import FakeLLM, report
+
+from app.chains import network_graph_fsm
+from app.chains.network_graph_fsm import new_state, stream_level_test_questions, stream_quiz_questions
+from app.services.json_stream import loads_lenient
+
+
+async def wait_full(template: str) -> AsyncIterator[Dict]:
+    text = await network_graph_fsm.call_llm("prompt", template=template)
+    for question in loads_lenient(text):
+        yield question
+
+
+async def timings(questions: Callable[[], AsyncIterator[Dict]], rounds: int) -> List[float]:
+    first = last = 0.0
+    for _ in range(rounds):
+        start = time.perf_counter()
+        count = 0
+        async for _ in questions():
+            count += 1
+            if count == 1:
+                first += time.perf_counter() - start
+        last += time.perf_counter() - start
+        assert count == 5, count
+    return [first / rounds, last / rounds]
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--chunks", type=int, default=40)
+    parser.add_argument("--chunk-delay", type=float, default=0.05)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    FakeLLM(latency=args.latency, chunks=args.chunks, chunk_delay=args.chunk_delay).install()
+    state = new_state("TCP", tags=["TCP", "UDP"])
+
+    rows = [["문제", "방식", "첫 문제 s", "마지막 문제 s"]]
+    for name, template, stream in (
+        ("수준 테스트", "level_test", lambda: stream_level_test_questions(state)),
+        ("퀴즈", "quiz", lambda: stream_quiz_questions(state))
+    ):
+        for label, questions in (("전체 응답 대기", lambda: wait_full(template)), ("스트리밍", stream)):
+            first, last = await timings(questions, args.rounds)
+            rows.append([name, label, f"{first:.2f}", f"{last:.2f}"])
+    report(
+        f"문제 5개 생성 (첫 조각 {args.latency}s, {args.chunks}조각 x {args.chunk_delay}s)",
+        rows
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,93 @@
+"""
+다음 단계 미리 생성(prefetcher) 벤치마크
+
+사용자 --users명이 같은 시간대에 주제 선택 → 수준 테스트 → 기본 학습 완료 → 퀴즈 → 면접 순서로 진행하는 흐름을 재생하고,
+버튼을 누른 뒤 다음 단계 내용(문제/질문)이 준비될 때까지의 체감 지연 시간을 미리 생성 사용 여부별로 비교합니다.
+단계 사이에는 사용자가 화면을 읽는 시간(--think-min ~ --think-max초)을 둡니다.
+handlers와 같은 규칙(mode 전환 시 on_transition, 버튼을 누르면 take, 없으면 바로 생성)을 사용합니다.
+
+    python -m benchmarks.bench_prefetch [--users 20] [--latency 1.0]
+"""
+import argparse
+import asyncio
+import random
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+from benchmarks.fakes import TAGS, FakeLLM, percentile, report
+
+from app.api.slack.handlers import LearningMode, prefetch_interview, prefetch_level_test, prefetch_quiz
+from app.services.prefetch import prefetcher
+from app.services.session_store import session_store
+
+# (다음 단계를 예측하는 mode, 버튼을 눌러 꺼내는 결과, 미리 생성이 없을 때 바로 생성하는 함수)
+STEPS = [
+    ("selecting_level_check", "level_test", prefetch_level_test),
+    ("learning_completed", "quiz", prefetch_quiz),
+    (LearningMode.QUIZ, "interview", prefetch_interview)
+]
+
+
+async def replay(user: str, topic: str, think: List[float], latencies: Dict[str, List[float]]) -> None:
+    await session_store.set(user, {"topic": topic, "tags": TAGS[:5], "user_level": "intermediate"})
+    for (mode, kind, generate), seconds in zip(STEPS, think):
+        prefetcher.on_transition(user, await session_store.patch(user, mode=mode))
+        await asyncio.sleep(seconds)
+
+        start = time.perf_counter()
+        value = await prefetcher.take(user, kind)
+        if not value:
+            value = await generate(await session_store.get(user))
+        assert value, kind
+        latencies[kind].append(time.perf_counter() - start)
+
+
+async def run(args: argparse.Namespace, enabled: bool, round_id: int) -> Dict[str, List[float]]:
+    prefetcher.enabled = enabled
+    rng = random.Random(3)
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    await asyncio.gather(*(
+        replay(
+            f"U{round_id}-{i}",
+            f"주제 {round_id}-{i}",
+            [rng.uniform(args.think_min, args.think_max) for _ in STEPS],
+            latencies
+        )
+        for i in range(args.users)
+    ))
+    return latencies
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=1.0)
+    parser.add_argument("--think-min", type=float, default=1.0)
+    parser.add_argument("--think-max", type=float, default=6.0)
+    args = parser.parse_args()
+
+    llm = FakeLLM(latency=args.latency, chunks=20, chunk_delay=0.05).install()
+    rows = [["미리 생성", "단계", "p50 s", "p95 s", "최대 s", "LLM 호출"]]
+    for round_id, enabled in enumerate((False, True)):
+        llm.calls.clear()
+        latencies = await run(args, enabled, round_id)
+        for _, kind, _ in STEPS:
+            values = latencies[kind]
+            rows.append([
+                "사용" if enabled else "사용 안 함",
+                kind,
+                f"{percentile(values, 0.5):.2f}",
+                f"{percentile(values, 0.95):.2f}",
+                f"{max(values):.2f}",
+                llm.calls[kind if kind != "interview" else "interview_questions"]
+            ])
+    report(
+        f"사용자 {args.users}명, LLM 첫 조각 {args.latency}s + 생성 1s, 읽는 시간 {args.think_min}~{args.think_max}s",
+        rows
+    )
+    print(f"\nprefetcher: {prefetcher.get_stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,83 @@
+"""
+다음 단계 준비(prepare_next) 분기 벤치마크
+
+1) 세부 주제 추출과 면접 질문 생성을 차례로 실행할 때와 prepare_next 분기로 동시에 실행할 때의 걸리는 시간
+2) 수준이 저장된 뒤 기본 개념 학습을 보여주고 바로 면접을 시작할 때, 면접 질문이 준비될 때까지의 시간
+   (학습만 실행 vs 학습과 다음 단계 준비를 동시에 실행)
+
+LLM 호출마다 --latency초 지연을 넣은 가짜 LLM과 가짜 Slack API를 사용합니다.
+
+    python -m benchmarks.bench_prepare_next [--latency 1.0] [--rounds 3]
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.fakes import FakeLLM, FakeSlack, report
+
+from app.api.slack import handlers
+from app.chains.network_graph_fsm import run_step
+from app.services import study_mode
+
+TOPIC = "TCP"
+LEVEL = "advanced"
+
+
+async def sequential() -> None:
+    subtopics = await run_step(None, TOPIC, mode="prepare_next", user_level=LEVEL, interview_questions=[{"basic": "-"}])
+    await run_step(None, TOPIC, mode="prepare_next", user_level=LEVEL, subtopics=subtopics["subtopics"])
+
+
+async def branched() -> None:
+    await run_step(None, TOPIC, mode="prepare_next", user_level=LEVEL)
+
+
+async def learn_then_interview(user: str, prepare: bool) -> tuple:
+    """수준 저장 시점부터 (학습 완료, 면접 첫 질문 준비) 까지의 시간"""
+    start = time.perf_counter()
+    if prepare:
+        await handlers.start_basic_learning("C1", TOPIC, user, LEVEL)
+    else:
+        await handlers.stream_basic_learning("C1", TOPIC, user)
+    learned = time.perf_counter()
+    await study_mode.start_interview_session(TOPIC, user_level=LEVEL, user=user)
+    return learned - start, time.perf_counter() - start
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=1.0)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    llm = FakeLLM(latency=args.latency, chunks=10, chunk_delay=0.01).install()
+    FakeSlack(latency=0.01).install()
+
+    rows = [["실행 방식", "평균 s", "LLM 호출"]]
+    for name, run in (("차례로 실행", sequential), ("prepare_next 분기", branched)):
+        llm.calls.clear()
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            await run()
+        rows.append([name, f"{(time.perf_counter() - start) / args.rounds:.2f}", sum(llm.calls.values()) // args.rounds])
+    report(f"세부 주제 + 면접 질문 생성 (LLM 지연 {args.latency}s)", rows)
+
+    rows = [["기본 개념 학습", "학습 완료 s", "면접 질문 준비 s", "LLM 호출"]]
+    for prepare in (False, True):
+        llm.calls.clear()
+        learned = ready = 0.0
+        for i in range(args.rounds):
+            learn_time, ready_time = await learn_then_interview(f"U-{prepare}-{i}", prepare)
+            learned += learn_time
+            ready += ready_time
+        rows.append([
+            "학습 + 다음 단계 준비" if prepare else "학습만",
+            f"{learned / args.rounds:.2f}",
+            f"{ready / args.rounds:.2f}",
+            sum(llm.calls.values()) // args.rounds
+        ])
+    report("수준 저장 후 면접 질문이 준비될 때까지", rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,81 @@
+"""
+세션 메모리 사용량 벤치마크
+
+--users명의 세션을 메모리에 보관할 때 프로세스 RSS 증가량과 세션당 바이트 수를 잽니다.
+UserSession은 저장소가 SESSION_MAX_BYTES 한도에 쓰는 추정 크기(approx_size)도 함께 출력합니다.
+- dict: 이전 방식처럼 세션 dict를 그대로 보관
+- UserSession: MemorySessionStore (__slots__ 데이터 클래스, 문제 목록은 JSON 바이트로 압축)
+세션은 Slack 요청에서 파싱한 값처럼 사용자마다 별도 객체로 만들고, 측정마다 새 프로세스에서 실행합니다.
+
+    python -m benchmarks.bench_session_memory [--users 100000]
+"""
+import argparse
+import asyncio
+import gc
+import json
+import os
+import subprocess
+import sys
+
+from benchmarks.fakes import report, sample_session
+
+from app.services.session_store import MemorySessionStore
+
+PROFILES = {
+    # 주제만 고른 사용자
+    "idle": lambda i: {"mode": "selecting_level_check", "topic": "TCP", "artifact_keys": {}},
+    # 수준 테스트를 푸는 중인 사용자 (문제 5개와 답변)
+    "level_test": sample_session
+}
+
+
+def rss_bytes() -> int:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+async def fill(variant: str, profile: str, users: int) -> dict:
+    """세션을 채운 뒤 늘어난 RSS (bytes)"""
+    make = PROFILES[profile]
+    gc.collect()
+    rss_before = rss_bytes()
+
+    store = MemorySessionStore(max_entries=users, max_bytes=sys.maxsize)
+    sessions = {}
+    for i in range(users):
+        # Slack 요청 payload를 파싱한 것처럼 사용자마다 새 객체
+        data = json.loads(json.dumps(make(i)))
+        if variant == "dict":
+            sessions[f"U{i:06d}"] = data
+        else:
+            await store.set(f"U{i:06d}", data)
+
+    gc.collect()
+    return {"rss": rss_bytes() - rss_before, "estimated": store.get_stats()["bytes"]}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--child", nargs=2, metavar=("VARIANT", "PROFILE"))
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(asyncio.run(fill(*args.child, args.users))))
+        return
+
+    rows = [["세션", "보관 방식", "RSS 증가 MiB", "세션당 bytes", "추정 bytes"]]
+    for profile in PROFILES:
+        for variant in ("dict", "UserSession"):
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_session_memory", "--users", str(args.users), "--child", variant, profile],
+                check=True, capture_output=True, text=True
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            estimated = f"{result['estimated'] / args.users:,.0f}" if variant == "UserSession" else "-"
+            rows.append([profile, variant, f"{result['rss'] / 2 ** 20:.1f}", f"{result['rss'] / args.users:,.0f}", estimated])
+    report(f"세션 {args.users:,}개 메모리 사용량", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+세션 저장소 처리량 벤치마크 (memory / sqlite / redis)
+
+--users명의 세션에 get, set, patch(update)를 각각 --ops번 실행하고
+--concurrency개 코루틴으로 섞어서 실행했을 때의 초당 처리 수를 잽니다.
+redis는 SESSION_REDIS_URL에 연결할 수 없으면 프로세스 내 가짜 Redis 서버(fakes.FakeRedis)로 잽니다.
+(가짜 서버는 벤치마크와 같은 이벤트 루프에서 돌므로 실제 Redis와 비교하기보다 연결 풀과 WATCH 재시도 비용을 보는 용도)
+
+    python -m benchmarks.bench_session_store [--users 1000] [--ops 5000]
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from typing import Awaitable, Callable, Optional, Tuple
+
+from benchmarks.fakes import FakeRedis, report, sample_session
+
+from app.core.config import SESSION_REDIS_URL
+from app.services.session_store import MemorySessionStore, RedisSessionStore, SQLiteSessionStore, SessionStore
+
+
+async def rate(ops: int, concurrency: int, op: Callable[[int], Awaitable[object]]) -> float:
+    """op(i)를 concurrency개 코루틴으로 나눠 ops번 실행한 초당 처리 수"""
+    async def worker(offset: int) -> None:
+        for i in range(offset, ops, concurrency):
+            await op(i)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(n) for n in range(concurrency)))
+    return ops / (time.perf_counter() - start)
+
+
+async def open_redis() -> Tuple[str, RedisSessionStore, Optional[FakeRedis]]:
+    store = RedisSessionStore(key_prefix="bench-session:")
+    try:
+        await store.get("U_PING")
+    except OSError as e:
+        print(f"{SESSION_REDIS_URL}에 연결할 수 없어 가짜 Redis 서버로 잽니다 ({e})")
+        fake = FakeRedis()
+        return "redis (가짜)", RedisSessionStore(await fake.start(), key_prefix="bench-session:"), fake
+    return "redis", store, None
+
+
+async def measure(name: str, store: SessionStore, args: argparse.Namespace) -> list:
+    users = [f"U{i:05d}" for i in range(args.users)]
+    rng = random.Random(7)
+    for user in users:
+        await store.set(user, sample_session(0))
+
+    async def mixed(i: int) -> object:
+        # 버튼 클릭 하나 = 세션 읽기 + 답변 기록, 가끔 세션 전체 저장
+        user = rng.choice(users)
+        if i % 10 == 0:
+            return await store.set(user, sample_session(i))
+        if i % 2 == 0:
+            return await store.get(user)
+        return await store.patch(user, current_tag_index=i % 5)
+
+    row = [name]
+    row.append(f"{await rate(args.ops, 1, lambda i: store.get(users[i % args.users])):,.0f}")
+    row.append(f"{await rate(args.ops, 1, lambda i: store.set(users[i % args.users], sample_session(i))):,.0f}")
+    row.append(f"{await rate(args.ops, 1, lambda i: store.patch(users[i % args.users], current_tag_index=i % 5)):,.0f}")
+    row.append(f"{await rate(args.ops, args.concurrency, mixed):,.0f}")
+
+    for user in users:
+        await store.delete(user)
+    await store.close()
+    return row
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--ops", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    stores = [
+        ("memory", MemorySessionStore()),
+        ("sqlite", SQLiteSessionStore(os.path.join(tempfile.mkdtemp(), "sessions.db")))
+    ]
+    redis_name, redis, fake_redis = await open_redis()
+    stores.append((redis_name, redis))
+
+    rows = [["backend", "get/s", "set/s", "patch/s", f"혼합 x{args.concurrency}/s"]]
+    for name, store in stores:
+        rows.append(await measure(name, store, args))
+    if fake_redis is not None:
+        await fake_redis.close()
+    report(f"세션 저장소 처리량 (사용자 {args.users}명, 연산 {args.ops}회)", rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
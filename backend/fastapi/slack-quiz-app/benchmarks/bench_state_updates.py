@@ -0,0 +1,125 @@
+"""
+FSM 상태 전이 비용 벤치마크
+
+실제 크기의 학습 상태(키워드 8개, 긴 설명, 문제/면접 질문 10개씩)에서
+- 노드 하나: 바뀐 필드만 반환(현재) vs 전체 상태를 복사해서 반환(이전 방식)의 호출 시간과 전이 하나가 붙잡는 메모리
+- 그래프 한 단계(다음 면접 질문): 걸린 시간과 체크포인트에 새로 쓰는 채널 수 / 바이트
+를 잽니다.
+
+    python -m benchmarks.bench_state_updates [--calls 20000] [--steps 300]
+"""
+import argparse
+import asyncio
+import pickle
+import time
+import tracemalloc
+from typing import Any, Callable, Dict
+
+from benchmarks.fakes import TAGS, FakeLLM, question, report
+
+from app.chains import network_graph_fsm as fsm
+from app.services.fsm_checkpoint import fsm_checkpointer
+
+USER = "U_BENCH"
+
+
+def realistic_state() -> Dict[str, Any]:
+    return fsm.new_state(
+        "TCP",
+        tags=TAGS + ["QUIC"],
+        explanation="TCP는 연결 지향 전송 계층 프로토콜입니다. " * 150,
+        questions=[question(i) for i in range(10)],
+        level_test_questions=[question(i) for i in range(10)],
+        level_test_responses=[{"user_answer": "O", "correct_answer": "O"} for _ in range(10)],
+        subtopics=[{"title": f"세부 주제 {i}", "description": "설명 " * 60} for i in range(8)],
+        interview_questions=[
+            {"basic": f"면접 질문 {i}: 3-way handshake를 설명해주세요.", "followup": ["왜 3번인가요?"] * 2, "answer": "모범 답안 " * 200}
+            for i in range(10)
+        ],
+        mode="interview"
+    )
+
+
+def full_copy(node: Callable[[Dict[str, Any]], Dict[str, Any]]) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """이전 방식: 변경분을 반영한 전체 상태 사본을 반환 (면접 질문은 목록 전체 복사)"""
+    def _node(state: Dict[str, Any]) -> Dict[str, Any]:
+        update = node(state)
+        if "interview_questions" in update:
+            update["interview_questions"] = fsm.update_items(state["interview_questions"], update["interview_questions"])
+        return {**state, **update}
+    return _node
+
+
+def measure_node(node: Callable[[Dict[str, Any]], Dict[str, Any]], state: Dict[str, Any], calls: int) -> tuple:
+    start = time.perf_counter()
+    for i in range(calls):
+        state["current_interview_index"] = i % 10
+        node(state)
+    micros = (time.perf_counter() - start) / calls * 1e6
+
+    # 전이 결과를 보관할 때(체크포인트, 이벤트 기록 등) 전이 하나가 붙잡는 메모리
+    kept = []
+    tracemalloc.start()
+    for i in range(1000):
+        state["current_interview_index"] = i % 10
+        kept.append(node(state))
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return micros, retained / 1000
+
+
+async def measure_graph(steps: int) -> tuple:
+    saver = fsm_checkpointer.saver
+    written = {"channels": 0, "bytes": 0}
+    aput = saver.aput
+
+    async def counting_aput(config, checkpoint, metadata, new_versions):
+        # 이번 단계에서 버전이 바뀐 채널 값만 새로 직렬화되어 저장됨
+        for channel in new_versions:
+            if channel in checkpoint["channel_values"]:
+                written["channels"] += 1
+                written["bytes"] += len(saver.serde.dumps_typed(checkpoint["channel_values"][channel])[1])
+        return await aput(config, checkpoint, metadata, new_versions)
+
+    # 면접까지 진행한 세션 (첫 단계에서 전체 상태를 저장)
+    values = {key: value for key, value in realistic_state().items() if key != "topic"}
+    await fsm.run_step(USER, "TCP", **values)
+
+    saver.aput = counting_aput
+    start = time.perf_counter()
+    for i in range(steps):
+        await fsm.run_step(USER, "TCP", mode="interview", current_interview_index=i % 10)
+    elapsed = (time.perf_counter() - start) / steps * 1000
+    del saver.aput
+    return elapsed, written["channels"] / steps, written["bytes"] / steps
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--steps", type=int, default=300)
+    args = parser.parse_args()
+
+    FakeLLM(latency=0, chunks=1, chunk_delay=0).install()
+
+    state = realistic_state()
+    rows = [["노드", "반환 방식", "호출 µs", "전이당 보관 bytes"]]
+    for name, node in (
+        ("get_interview_question", fsm.get_interview_question),
+        ("evaluate_user_level", fsm.evaluate_user_level),
+        ("next_tag", fsm.next_tag)
+    ):
+        for label, run in (("바뀐 필드만", node), ("전체 상태 복사", full_copy(node))):
+            micros, retained = measure_node(run, dict(state), args.calls)
+            rows.append([name, label, f"{micros:.2f}", f"{retained:,.0f}"])
+    report(f"노드 전이 {args.calls}회 (상태 pickle 크기 {len(pickle.dumps(state)):,} bytes)", rows)
+
+    elapsed, channels, size = await measure_graph(args.steps)
+    report(
+        f"그래프 한 단계: 다음 면접 질문 {args.steps}회 (memory 체크포인터)",
+        [["단계 ms", "새로 쓴 채널/단계", "새로 쓴 bytes/단계"], [f"{elapsed:.2f}", f"{channels:.1f}", f"{size:,.0f}"]]
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
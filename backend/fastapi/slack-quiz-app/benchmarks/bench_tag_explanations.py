@@ -0,0 +1,61 @@
+"""
+키워드 설명 동시 생성 벤치마크
+
+키워드 7개의 설명을 stream_tag_explanations로 생성할 때 첫 설명과 마지막 설명을 받기까지 걸린 시간을
+동시 생성 수(concurrency)와 전송 순서(ordered)별로 비교합니다. concurrency=1이 이전의 순차 생성입니다.
+키워드마다 설명 길이가 달라 LLM 응답 시간이 --latency ~ 2 x --latency초로 다릅니다.
+
+    python -m benchmarks.bench_tag_explanations [--latency 1.0]
+"""
+import argparse
+import asyncio
+import time
+from typing import Any, Optional
+
+from benchmarks.fakes import TAGS, FakeLLM, report
+
+from app.chains.network_graph_fsm import stream_tag_explanations
+
+
+class UnevenLLM(FakeLLM):
+    """키워드마다 응답 시간이 다른 가짜 LLM"""
+
+    async def call_llm(self, prompt: str, priority: int = 0, on_token: Any = None, template: Optional[str] = None) -> str:
+        self.calls[template] += 1
+        index = next(i for i, tag in enumerate(TAGS) if tag in prompt)
+        # 뒤 키워드일수록 짧게 (순서대로 보내면 앞 키워드를 기다리게 됨)
+        await asyncio.sleep(self.latency * (1 + (len(TAGS) - 1 - index) / (len(TAGS) - 1)))
+        return self.text(template)
+
+
+async def measure(concurrency: int, ordered: bool) -> list:
+    start = time.perf_counter()
+    first = None
+    order = []
+    async for index, _ in stream_tag_explanations(TAGS, ordered=ordered, concurrency=concurrency):
+        if first is None:
+            first = time.perf_counter() - start
+        order.append(index + 1)
+    return [
+        concurrency,
+        "키워드 순서" if ordered else "완성 순서",
+        f"{first:.2f}",
+        f"{time.perf_counter() - start:.2f}",
+        ",".join(map(str, order))
+    ]
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=1.0)
+    args = parser.parse_args()
+
+    llm = UnevenLLM(latency=args.latency).install()
+    rows = [["concurrency", "전송 순서", "첫 설명 s", "전체 s", "받은 순서"]]
+    for concurrency, ordered in ((1, True), (4, True), (4, False), (len(TAGS), True), (len(TAGS), False)):
+        rows.append(await measure(concurrency, ordered))
+    report(f"키워드 {len(TAGS)}개 설명 (LLM {args.latency}~{2 * args.latency}s, 호출 {sum(llm.calls.values())}회)", rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
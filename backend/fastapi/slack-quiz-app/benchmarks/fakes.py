@@ -0,0 +1,322 @@
+"""
+벤치마크 공용 가짜 LLM / Slack API
+
+실제 OpenAI, Slack에 요청하지 않고 응답 지연만 흉내 냅니다.
+앱 모듈은 import 시점에 환경 변수를 읽으므로 이 모듈을 가장 먼저 import 합니다.
+
+    python -m benchmarks.bench_fsm_checkpoint    (slack-quiz-app 디렉터리에서 실행)
+"""
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "bench-key")
+os.environ.setdefault("SLACK_BOT_TOKEN", "xoxb-bench")
+os.environ.setdefault("SLACK_SIGNING_SECRET", "bench-secret")
+
+import asyncio
+import json
+import math
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from slack_sdk.web.async_client import AsyncWebClient
+from slack_sdk.web.async_slack_response import AsyncSlackResponse
+
+from app.chains import network_graph_fsm
+from app.services import openai_service
+from app.services.structured_output import structured_output
+
+TAGS = ["OSI 7계층", "TCP", "UDP", "IP 주소", "라우팅", "DNS", "HTTP"]
+
+
+def question(i: int) -> Dict[str, Any]:
+    if i % 2 == 0:
+        return {"type": "OX", "question": f"{i + 1}번 문제: TCP는 연결 지향 프로토콜이다.", "answer": "O"}
+    return {
+        "type": "객관식",
+        "question": f"{i + 1}번 문제: 전송 계층 프로토콜은?",
+        "options": ["TCP", "IP", "ARP", "ICMP"],
+        "answer": "A"
+    }
+
+
+def sample_session(i: int) -> Dict[str, Any]:
+    """수준 테스트를 푸는 중인 사용자의 세션 (handlers가 저장하는 필드)"""
+    return {
+        "mode": "level_test",
+        "topic": "TCP",
+        "user_level": "intermediate",
+        "tags": TAGS[:5],
+        "current_tag_index": i % 5,
+        "test_questions": [question(n) for n in range(5)],
+        "user_ox_answers": {"0": "O", "2": "X"},
+        "user_mc_answers": {"1": "A"},
+        "artifact_keys": {"tags": "TCP", "level_test": "TCP"}
+    }
+
+
+class FakeLLM:
+    """
+    응답 지연을 흉내 내는 가짜 LLM
+
+    - latency: 첫 조각이 올 때까지의 시간(초)
+    - chunks / chunk_delay: 응답을 chunks개 조각으로 나눠 chunk_delay초 간격으로 보냄
+      (스트리밍이 아니면 전체 응답이 끝날 때까지 기다렸다가 반환)
+    - blocking: True면 time.sleep으로 기다려 동기 LLM 호출처럼 이벤트 루프를 막음
+    """
+
+    def __init__(self, latency: float = 0.5, chunks: int = 20, chunk_delay: float = 0.02, blocking: bool = False):
+        self.latency = latency
+        self.chunks = chunks
+        self.chunk_delay = chunk_delay
+        self.blocking = blocking
+        self.calls: Counter = Counter()
+
+    def install(self) -> "FakeLLM":
+        """FSM 노드, OpenAI SDK 호출, 구조화된 출력이 이 가짜 LLM을 사용하도록 바꿉니다."""
+        network_graph_fsm.call_llm = self.call_llm
+        openai_service.get_completion = self.get_completion
+        structured_output.complete = self.complete
+        return self
+
+    def text(self, template: Optional[str]) -> str:
+        if template == "tag_extraction":
+            return "\n".join(f"- {tag}" for tag in TAGS)
+        if template in ("quiz", "level_test"):
+            return "```json\n" + json.dumps([question(i) for i in range(5)], ensure_ascii=False) + "\n```"
+        return "네트워크는 여러 장치가 데이터를 주고받는 구조입니다. " * 20
+
+    def items(self, name: str) -> List[Dict[str, Any]]:
+        if name == "subtopics":
+            return [{"title": f"세부 주제 {i}", "description": "설명 " * 20} for i in range(5)]
+        if name == "interview_questions":
+            return [{"basic": f"면접 질문 {i}", "followup": ["왜 그런가요?"], "answer": "모범 답안 " * 50} for i in range(5)]
+        return [question(i) for i in range(5)]
+
+    async def wait(self, seconds: float) -> None:
+        if self.blocking:
+            time.sleep(seconds)
+        else:
+            await asyncio.sleep(seconds)
+
+    async def respond(self, text: str, on_token: Optional[Callable[[str], None]]) -> str:
+        await self.wait(self.latency)
+        if on_token is None:
+            await self.wait(self.chunks * self.chunk_delay)
+            return text
+
+        size = math.ceil(len(text) / self.chunks)
+        for start in range(0, len(text), size):
+            on_token(text[start:start + size])
+            await self.wait(self.chunk_delay)
+        return text
+
+    async def call_llm(self, prompt: str, priority: int = 0, on_token: Any = None, template: Optional[str] = None) -> str:
+        self.calls[template] += 1
+        return await self.respond(self.text(template), on_token)
+
+    async def get_completion(self, prompt: str, *args: Any, on_token: Any = None, template: Optional[str] = None, **kwargs: Any) -> str:
+        self.calls[template] += 1
+        return await self.respond(self.text(template), on_token)
+
+    async def complete(self, schema: Any, prompt: str, temperature: float = 0.3) -> List[Dict[str, Any]]:
+        self.calls[schema.name] += 1
+        await self.respond("", None)
+        return self.items(schema.name)
+
+
+class FakeSlack:
+    """Slack Web API 호출마다 latency초 뒤 성공 응답을 돌려주는 가짜 API (호출 시각 기록)"""
+
+    def __init__(self, latency: float = 0.05):
+        self.latency = latency
+        self.calls: List[Dict[str, Any]] = []
+
+    def install(self) -> "FakeSlack":
+        fake = self
+
+        async def api_call(client: AsyncWebClient, api_method: str, *, http_verb: str = "POST", json: Any = None, params: Any = None, data: Any = None, **kwargs: Any):
+            return await fake.api_call(client, api_method, http_verb, json or data or params or {})
+
+        AsyncWebClient.api_call = api_call
+        return self
+
+    async def api_call(self, client: AsyncWebClient, api_method: str, http_verb: str, payload: Dict[str, Any]) -> AsyncSlackResponse:
+        await asyncio.sleep(self.latency)
+        self.calls.append({"method": api_method, "at": time.perf_counter(), **payload})
+        return AsyncSlackResponse(
+            client=client,
+            http_verb=http_verb,
+            api_url=f"https://slack.com/api/{api_method}",
+            req_args={},
+            data={"ok": True, "ts": f"{time.time():.6f}", "channel": payload.get("channel", "C1")},
+            headers={},
+            status_code=200
+        )
+
+
+# WATCH 충돌로 실행되지 않은 EXEC의 응답
+_NIL_ARRAY = object()
+
+
+class FakeRedis:
+    """
+    RESP 명령 일부(GET, SET EX, DEL, WATCH, MULTI, EXEC, UNWATCH)만 처리하는 프로세스 내 가짜 Redis 서버
+
+    RedisSessionStore를 실제 Redis 없이 실행할 때 사용합니다. (AUTH, SELECT, PING은 OK/PONG만 응답)
+    키마다 버전을 두고, WATCH한 키의 버전이 EXEC 전에 바뀌었으면 EXEC가 nil을 돌려줍니다.
+    set()은 다른 클라이언트가 쓴 것처럼 서버 밖에서 키를 바꿉니다.
+    """
+
+    def __init__(self):
+        self.data: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+        self.versions: Counter = Counter()
+        self.commands: Counter = Counter()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Dict[asyncio.Task, asyncio.StreamWriter] = {}
+
+    async def start(self) -> str:
+        """빈 포트에서 서버를 시작하고 접속 URL을 돌려줍니다."""
+        self._server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        port = self._server.sockets[0].getsockname()[1]
+        return f"redis://127.0.0.1:{port}/0"
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+        # 연결을 닫고 연결마다 도는 처리 코루틴이 끝날 때까지 기다림
+        for writer in self._connections.values():
+            writer.close()
+        await asyncio.gather(*self._connections)
+
+    def set(self, key: str, value: str) -> None:
+        self._write(key.encode(), value.encode(), None)
+
+    def _write(self, key: bytes, value: Optional[bytes], expire_at: Optional[float]) -> None:
+        if value is None:
+            self.data.pop(key, None)
+        else:
+            self.data[key] = (value, expire_at)
+        self.versions[key] += 1
+
+    def _live(self, key: bytes) -> Optional[bytes]:
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        value, expire_at = entry
+        if expire_at is not None and expire_at <= time.monotonic():
+            # 만료도 키 변경으로 보고 버전을 올림 (Redis와 같음)
+            self._write(key, None, None)
+            return None
+        return value
+
+    def _apply(self, args: List[bytes]) -> Any:
+        name = args[0].upper()
+        if name == b"GET":
+            return self._live(args[1])
+        if name == b"SET":
+            expire_at = None
+            if len(args) >= 5 and args[3].upper() == b"EX":
+                expire_at = time.monotonic() + int(args[4])
+            self._write(args[1], args[2], expire_at)
+            return "OK"
+        if name == b"DEL":
+            removed = [key for key in args[1:] if self._live(key) is not None]
+            for key in removed:
+                self._write(key, None, None)
+            return len(removed)
+        if name == b"PING":
+            return "PONG"
+        if name in (b"AUTH", b"SELECT"):
+            return "OK"
+        return ValueError(f"ERR unknown command '{name.decode()}'")
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        # WATCH와 MULTI 상태는 연결 단위
+        watched: Dict[bytes, int] = {}
+        queued: Optional[List[List[bytes]]] = None
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            while True:
+                args = await self._read_command(reader)
+                if args is None:
+                    break
+                name = args[0].upper()
+                self.commands[name.decode()] += 1
+
+                if name == b"MULTI":
+                    queued, reply = [], "OK"
+                elif name == b"EXEC":
+                    if queued is None:
+                        reply = ValueError("ERR EXEC without MULTI")
+                    elif any(self.versions[key] != version for key, version in watched.items()):
+                        reply = _NIL_ARRAY
+                    else:
+                        reply = [self._apply(command) for command in queued]
+                    watched.clear()
+                    queued = None
+                elif queued is not None:
+                    queued.append(args)
+                    reply = "QUEUED"
+                elif name == b"WATCH":
+                    for key in args[1:]:
+                        self._live(key)
+                        watched[key] = self.versions[key]
+                    reply = "OK"
+                elif name == b"UNWATCH":
+                    watched.clear()
+                    reply = "OK"
+                else:
+                    reply = self._apply(args)
+
+                writer.write(self._encode(reply))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            del self._connections[task]
+            writer.close()
+
+    @staticmethod
+    async def _read_command(reader: asyncio.StreamReader) -> Optional[List[bytes]]:
+        line = await reader.readline()
+        if not line:
+            return None
+        args = []
+        for _ in range(int(line[1:-2])):
+            length = int((await reader.readline())[1:-2])
+            args.append((await reader.readexactly(length + 2))[:-2])
+        return args
+
+    def _encode(self, reply: Any) -> bytes:
+        if reply is _NIL_ARRAY:
+            return b"*-1\r\n"
+        if reply is None:
+            return b"$-1\r\n"
+        if isinstance(reply, Exception):
+            return f"-{reply}\r\n".encode()
+        if isinstance(reply, str):
+            return f"+{reply}\r\n".encode()
+        if isinstance(reply, int):
+            return f":{reply}\r\n".encode()
+        if isinstance(reply, bytes):
+            return f"${len(reply)}\r\n".encode() + reply + b"\r\n"
+        return f"*{len(reply)}\r\n".encode() + b"".join(self._encode(item) for item in reply)
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """q(0~1) 분위수 (최근접 순위)"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+
+
+def report(title: str, rows: List[Sequence[Any]]) -> None:
+    """결과를 표 형식으로 출력합니다."""
+    print(f"\n## {title}")
+    widths = [max(len(str(row[i])) for row in rows) for i in range(len(rows[0]))]
+    for row in rows:
+        print("  ".join(str(cell).ljust(width) for cell, width in zip(row, widths)))
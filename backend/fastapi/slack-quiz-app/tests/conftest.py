@@ -0,0 +1,152 @@
+import os
+
+# app.core.config는 import 시점에 환경 변수를 읽으므로 앱 모듈보다 먼저 설정
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+os.environ.setdefault("SLACK_BOT_TOKEN", "xoxb-test")
+os.environ.setdefault("SLACK_SIGNING_SECRET", "test-secret")
+
+import asyncio
+import json
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlencode
+
+import pytest
+from slack_bolt.request.async_request import AsyncBoltRequest
+from slack_sdk.signature import SignatureVerifier
+from slack_sdk.web.async_slack_response import AsyncSlackResponse
+from slack_sdk.web.async_client import AsyncWebClient
+
+from app.chains import network_graph_fsm
+from app.core.config import SLACK_SIGNING_SECRET
+from app.services.structured_output import structured_output
+
+
+class FakeSlackAPI:
+    """Slack Web API 호출을 기록하고 성공 응답을 돌려주는 가짜 API"""
+
+    def __init__(self):
+        self.calls: List[Dict[str, Any]] = []
+
+    async def api_call(self, client: Any, api_method: str, *, http_verb: str = "POST", json: Any = None, params: Any = None, data: Any = None, **kwargs: Any):
+        payload = json or data or params or {}
+        self.calls.append({"method": api_method, **payload})
+        body = {"ok": True, "ts": str(time.time()), "channel": payload.get("channel", "C1")}
+        if api_method == "auth.test":
+            body.update(user_id="UBOT", bot_id="BBOT", team_id="T1")
+        return AsyncSlackResponse(
+            client=client,
+            http_verb=http_verb,
+            api_url=f"https://slack.com/api/{api_method}",
+            req_args={},
+            data=body,
+            headers={},
+            status_code=200
+        )
+
+
+@pytest.fixture
+def slack_api(monkeypatch):
+    api = FakeSlackAPI()
+
+    async def api_call(client, *args, **kwargs):
+        return await api.api_call(client, *args, **kwargs)
+
+    # Bolt는 요청마다 클라이언트를 복사하므로 클래스 메서드를 바꿈
+    monkeypatch.setattr(AsyncWebClient, "api_call", api_call)
+    return api
+
+
+def slack_request(payload: Dict[str, Any]) -> AsyncBoltRequest:
+    """서명된 Slack 이벤트 요청을 만듭니다."""
+    body = json.dumps(payload)
+    timestamp = str(int(time.time()))
+    signature = SignatureVerifier(SLACK_SIGNING_SECRET).generate_signature(timestamp=timestamp, body=body)
+    return AsyncBoltRequest(
+        body=body,
+        headers={
+            "content-type": ["application/json"],
+            "x-slack-request-timestamp": [timestamp],
+            "x-slack-signature": [signature]
+        }
+    )
+
+
+def message_event(user: str, text: str, event_id: str, extra: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    event = {"type": "message", "channel": "C1", "user": user, "text": text, "ts": str(time.time())}
+    event.update(extra or {})
+    return {
+        "type": "event_callback",
+        "team_id": "T1",
+        "api_app_id": "A1",
+        "event_id": event_id,
+        "event_time": int(time.time()),
+        "event": event
+    }
+
+
+def block_action(user: str, action_id: str, value: str, message_ts: str = "1.0") -> Dict[str, Any]:
+    return {
+        "type": "block_actions",
+        "team": {"id": "T1"},
+        "user": {"id": user},
+        "api_app_id": "A1",
+        "channel": {"id": "C1"},
+        "container": {"type": "message", "channel_id": "C1", "message_ts": message_ts},
+        "actions": [{"type": "button", "action_id": action_id, "value": value, "action_ts": str(time.time())}]
+    }
+
+
+def action_request(payload: Dict[str, Any]) -> AsyncBoltRequest:
+    """서명된 Slack 인터랙션 요청을 만듭니다."""
+    body = urlencode({"payload": json.dumps(payload)})
+    timestamp = str(int(time.time()))
+    signature = SignatureVerifier(SLACK_SIGNING_SECRET).generate_signature(timestamp=timestamp, body=body)
+    return AsyncBoltRequest(
+        body=body,
+        headers={
+            "content-type": ["application/x-www-form-urlencoded"],
+            "x-slack-request-timestamp": [timestamp],
+            "x-slack-signature": [signature]
+        }
+    )
+
+
+class FakeLLM:
+    """템플릿별 호출 수를 세고, delay초 뒤에 고정된 응답을 돌려주는 가짜 LLM"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls: Counter = Counter()
+
+    async def call_llm(self, prompt: str, priority: int = 0, on_token: Any = None, template: Optional[str] = None) -> str:
+        self.calls[template] += 1
+        await asyncio.sleep(self.delay)
+        if template == "tag_extraction":
+            return "- TCP\n- UDP\n- IP"
+        if on_token is not None:
+            on_token("설명")
+        return "설명"
+
+    async def complete(self, schema: Any, prompt: str, temperature: float = 0.3) -> List[Dict[str, Any]]:
+        self.calls[schema.name] += 1
+        await asyncio.sleep(self.delay)
+        if schema.name == "subtopics":
+            return [{"title": f"세부 주제 {i}", "description": "설명"} for i in range(3)]
+        return [{"basic": f"면접 질문 {i}", "answer": "모범 답안"} for i in range(3)]
+
+    async def stream(self, schema: Any, prompt: str, request: Any):
+        self.calls[schema.name] += 1
+        await asyncio.sleep(self.delay)
+        for i in range(3):
+            yield {"type": "OX", "question": f"문제 {i}", "answer": "O"}
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    llm = FakeLLM()
+    monkeypatch.setattr(network_graph_fsm, "call_llm", llm.call_llm)
+    monkeypatch.setattr(structured_output, "complete", llm.complete)
+    monkeypatch.setattr(structured_output, "stream", llm.stream)
+    return llm
@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from app.api.slack import handlers
+from app.api.slack.app import slack_app
+from app.services.job_runner import job_runner
+from app.services.session_store import MemorySessionStore, SQLiteSessionStore
+
+from tests.conftest import action_request, block_action
+
+USERS = [f"U_CLICK_{i}" for i in range(5)]
+CLICKS_PER_USER = 100
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+async def store(request, tmp_path):
+    if request.param == "memory":
+        store = MemorySessionStore()
+    else:
+        store = SQLiteSessionStore(db_path=str(tmp_path / "sessions.db"))
+    yield store
+    await store.close()
+
+
+def expected_answers():
+    return {str(i): "OX"[i % 2] for i in range(CLICKS_PER_USER)}
+
+
+async def test_set_answer_updates_are_not_lost(store):
+    for user in USERS:
+        await store.set(user, {"mode": "level_test"})
+
+    # 사용자들의 클릭이 서로 섞여서 동시에 저장되는 상황
+    await asyncio.gather(*(
+        store.update(user, handlers.set_answer("user_ox_answers", i, "OX"[i % 2]))
+        for i in range(CLICKS_PER_USER)
+        for user in USERS
+    ))
+
+    for user in USERS:
+        assert (await store.get(user))["user_ox_answers"] == expected_answers()
+
+
+async def test_button_clicks_are_not_lost(store, slack_api, monkeypatch):
+    monkeypatch.setattr(handlers, "session_store", store)
+    for user in USERS:
+        await store.set(user, {"mode": "level_test"})
+
+    # 버튼 중복 클릭 방지 키가 저장소마다 겹치지 않도록 메시지를 구분
+    message_ts = type(store).__name__
+    responses = await asyncio.gather(*(
+        slack_app.async_dispatch(action_request(block_action(user, f"ox_answer_{i}_{'OX'[i % 2]}", "OX"[i % 2], message_ts)))
+        for i in range(CLICKS_PER_USER)
+        for user in USERS
+    ))
+    assert all(response.status == 200 for response in responses)
+
+    # 사용자별 메일박스에 쌓인 작업이 모두 끝날 때까지 대기
+    await job_runner.shutdown(grace_period=30)
+
+    for user in USERS:
+        assert (await store.get(user))["user_ox_answers"] == expected_answers()
@@ -0,0 +1,55 @@
+from typing import TypedDict
+
+from langgraph.graph import END, START, StateGraph
+
+from app.services.fsm_checkpoint import FSMCheckpointer
+from app.services.session_store import MemorySessionStore
+
+
+class StepState(TypedDict):
+    count: int
+
+
+def build_graph(saver):
+    graph = StateGraph(StepState)
+    graph.add_node("step", lambda state: {"count": state["count"] + 1})
+    graph.add_edge(START, "step")
+    graph.add_edge("step", END)
+    return graph.compile(checkpointer=saver)
+
+
+async def run_steps(checkpointer, user, steps):
+    graph = build_graph(checkpointer.saver)
+    config = {"configurable": {"thread_id": user}}
+    for _ in range(steps):
+        saved = (await graph.aget_state(config)).values
+        await graph.ainvoke({"count": saved.get("count", 0)}, config, durability="exit")
+        await checkpointer.prune(user)
+    return graph, config
+
+
+async def test_memory_prune_keeps_only_latest_checkpoint():
+    checkpointer = FSMCheckpointer(backend="memory")
+    graph, config = await run_steps(checkpointer, "U1", 5)
+
+    history = [snapshot async for snapshot in graph.aget_state_history(config)]
+    assert len(history) == 1
+    assert history[0].values == {"count": 5}
+    # 지운 체크포인트의 채널 값도 남지 않음 (채널마다 마지막 버전 하나)
+    channels = [key[2] for key in checkpointer.saver.blobs if key[0] == "U1"]
+    assert len(channels) == len(set(channels))
+
+
+async def test_expired_sessions_discard_checkpoints():
+    checkpointer = FSMCheckpointer(backend="memory")
+    store = MemorySessionStore(max_entries=1)
+    store.on_expire(checkpointer.discard)
+
+    await store.set("U1", {"mode": "quiz"})
+    graph, config = await run_steps(checkpointer, "U1", 1)
+    assert (await graph.aget_state(config)).values == {"count": 1}
+
+    # 두 번째 사용자가 들어오면 U1 세션이 밀려나고 체크포인트도 지워짐
+    await store.set("U2", {"mode": "quiz"})
+    assert (await graph.aget_state(config)).values == {}
+    assert checkpointer.get_stats()["discarded"] == 1
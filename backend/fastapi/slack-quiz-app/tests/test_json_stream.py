@@ -0,0 +1,32 @@
+import pytest
+
+from app.services.json_stream import JsonArrayStream, loads_lenient
+
+
+def feed_chunks(text, size):
+    parser = JsonArrayStream()
+    items = []
+    for start in range(0, len(text), size):
+        items.extend(parser.feed(text[start:start + size]))
+    return parser, items
+
+
+@pytest.mark.parametrize("size", [1, 3, 1000])
+def test_brackets_in_top_level_strings(size):
+    parser, items = feed_chunks('["a]b", "c[d", "e\\"]", {"q": "x]"}, {"q": "y"}]', size)
+
+    assert items == [{"q": "x]"}, {"q": "y"}]
+    assert parser.done
+
+
+@pytest.mark.parametrize("size", [1, 7, 1000])
+def test_objects_with_brackets_and_escapes(size):
+    text = '```json\n[{"q": "OSI [7] 계층 \\"}\\" {"}, {"q": "끝", "a": [1, 2],}]\n```'
+    parser, items = feed_chunks(text, size)
+
+    assert items == [{"q": 'OSI [7] 계층 "}" {'}, {"q": "끝", "a": [1, 2]}]
+    assert parser.repaired == 1
+
+
+def test_loads_lenient_truncated_array():
+    assert loads_lenient('[{"q": "a]"}, {"q": "b"}, {"q": "c') == [{"q": "a]"}, {"q": "b"}]
@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+
+from app.services.llm_retry import CircuitBreaker, RetryPolicy
+
+
+class ServerError(Exception):
+    status_code = 503
+
+
+async def failing(exc, calls):
+    calls.append(1)
+    raise exc
+
+
+@pytest.fixture
+def policy():
+    return RetryPolicy(max_attempts=3, base_delay=0, max_delay=0)
+
+
+async def test_unknown_errors_are_not_retried_or_counted(policy):
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=60)
+    calls = []
+
+    for _ in range(5):
+        with pytest.raises(KeyError):
+            await policy.run(lambda: failing(KeyError("choices"), calls), breaker=breaker)
+
+    assert len(calls) == 5
+    assert breaker.state == "closed"
+    assert breaker.get_stats()["failures"] == 0
+
+
+@pytest.mark.parametrize("exc", [ServerError(), asyncio.TimeoutError(), ConnectionError()])
+async def test_provider_errors_are_retried_and_trip_breaker(policy, exc):
+    breaker = CircuitBreaker("test", failure_threshold=3, reset_timeout=60)
+    calls = []
+
+    with pytest.raises(type(exc)):
+        await policy.run(lambda: failing(exc, calls), breaker=breaker)
+
+    assert len(calls) == 3
+    assert breaker.state == "open"
+
+
+async def test_unknown_error_releases_half_open_probe(policy):
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0)
+    breaker.record_failure("server")
+    assert breaker.state == "open"
+
+    with pytest.raises(KeyError):
+        await policy.run(lambda: failing(KeyError("choices"), []), breaker=breaker)
+
+    # 다음 요청이 다시 시험 요청으로 나갈 수 있음
+    breaker.before_call()
+    assert breaker.state == "half_open"
@@ -0,0 +1,21 @@
+import asyncio
+
+from app.services.llm_scheduler import LLMScheduler, Priority
+
+
+async def run(scheduler, tokens, priority):
+    async with scheduler.slot(tokens, priority, user="U1"):
+        pass
+
+
+async def test_oversized_background_request_eventually_runs():
+    # 분당 600토큰 = 초당 10토큰, 백그라운드는 예산의 절반을 남겨야 시작
+    scheduler = LLMScheduler(rpm=1000, tpm=600, max_concurrency=4, background_reserve=0.5)
+    scheduler._tokens = 595
+
+    # 남길 예산을 빼면 한도(300)보다 큰 요청도 잠깐 기다린 뒤 실행되고, 뒤의 백그라운드 요청을 막지 않음
+    await asyncio.wait_for(
+        asyncio.gather(run(scheduler, 500, Priority.BACKGROUND), run(scheduler, 10, Priority.BACKGROUND)),
+        timeout=3
+    )
+    assert scheduler.get_stats()["wait_seconds"]["background"]["started"] == 2
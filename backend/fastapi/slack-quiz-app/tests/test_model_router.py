@@ -0,0 +1,22 @@
+from app.services.model_router import load_routes
+
+
+def test_default_routes_use_the_small_model_first():
+    routes = load_routes(None, "")
+
+    assert {route.primary for route in routes.values()} == {"gpt-4o-mini"}
+
+
+def test_heavy_model_is_an_explicit_override():
+    routes = load_routes(None, "advanced_topic, interview_questions", "gpt-4o")
+
+    assert routes["advanced_topic"].models == ["gpt-4o", "gpt-4o-mini"]
+    assert routes["interview_questions"].models == ["gpt-4o", "gpt-4o-mini"]
+    assert routes["quiz"].primary == "gpt-4o-mini"
+
+
+def test_json_overrides_take_precedence():
+    routes = load_routes('{"advanced_topic": {"primary": "gpt-4.1"}}', "advanced_topic", "gpt-4o")
+
+    assert routes["advanced_topic"].models == ["gpt-4.1", "gpt-4o-mini"]
+    assert load_routes("not json", "advanced_topic", "gpt-4o")["advanced_topic"].primary == "gpt-4o"
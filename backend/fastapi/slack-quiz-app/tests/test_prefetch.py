@@ -0,0 +1,71 @@
+import asyncio
+
+from app.services.llm_scheduler import JobPriority, LLMScheduler, Priority, current_priority
+from app.services.prefetch import Prefetcher
+from app.services.session_store import session_store
+from app.services.singleflight import SingleFlight
+
+
+def saturated_scheduler():
+    # 동시 요청 2개 중 백그라운드는 1개까지
+    scheduler = LLMScheduler(rpm=1000, tpm=1_000_000, max_concurrency=2, background_reserve=0.5)
+    release = asyncio.Event()
+
+    async def hold_background_slot():
+        current_priority.set(JobPriority(Priority.BACKGROUND))
+        async with scheduler.slot(100, user="U_OTHER"):
+            await release.wait()
+
+    return scheduler, release, asyncio.ensure_future(hold_background_slot())
+
+
+async def test_take_promotes_pending_prefetch_when_scheduler_is_saturated():
+    scheduler, release, blocker = saturated_scheduler()
+    await asyncio.sleep(0)
+
+    async def generate(session):
+        async with scheduler.slot(100, user="U_PREFETCH"):
+            return ["문제 1"]
+
+    prefetcher = Prefetcher(enabled=True, max_concurrent=10, timeout=30)
+    prefetcher.rule("learning_completed", "quiz", lambda session: session.get("topic", ""), generate)
+    session = {"mode": "learning_completed", "topic": "TCP"}
+    await session_store.set("U_PREFETCH", session)
+    prefetcher.on_transition("U_PREFETCH", session)
+    await asyncio.sleep(0.05)
+
+    # 백그라운드 자리가 모두 차 있어도 기다리는 사용자가 생기면 사용자 요청 자리로 실행
+    assert await asyncio.wait_for(prefetcher.take("U_PREFETCH", "quiz"), timeout=1) == ["문제 1"]
+    assert prefetcher.get_stats()["promoted"] == 1
+
+    release.set()
+    await blocker
+
+
+async def test_interactive_caller_promotes_coalesced_background_request():
+    scheduler, release, blocker = saturated_scheduler()
+    await asyncio.sleep(0)
+    flight = SingleFlight()
+
+    async def request():
+        async with scheduler.slot(100):
+            return "설명"
+
+    job = JobPriority(Priority.BACKGROUND)
+
+    async def background_caller():
+        current_priority.set(job)
+        return await flight.do("key", request)
+
+    leader = asyncio.ensure_future(background_caller())
+    await asyncio.sleep(0.05)
+    assert not leader.done()
+
+    # 사용자 요청이 합쳐지면 그 요청만 올라가고, 백그라운드 작업의 우선순위는 그대로
+    assert await asyncio.wait_for(flight.do("key", request), timeout=1) == "설명"
+    assert await leader == "설명"
+    assert job.value == Priority.BACKGROUND
+    assert flight.get_stats()["promoted"] == 1
+
+    release.set()
+    await blocker
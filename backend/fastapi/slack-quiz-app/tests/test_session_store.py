@@ -0,0 +1,100 @@
+import asyncio
+import json
+
+import pytest
+
+from app.services.session import UserSession
+from app.services.session_store import MemorySessionStore, RedisSessionStore, RespError
+from benchmarks.fakes import FakeRedis
+
+
+@pytest.fixture
+async def redis_store():
+    fake = FakeRedis()
+    store = RedisSessionStore(await fake.start(), pool_size=5, key_prefix="test-session:")
+    yield store, fake
+    await store.close()
+    await fake.close()
+
+
+async def test_redis_update_retries_when_key_changes_before_exec(redis_store):
+    store, fake = redis_store
+    await store.set("U1", {"mode": "level_test", "current_tag_index": 0})
+    attempts = []
+
+    def mutate(session):
+        attempts.append(dict(session))
+        if len(attempts) == 1:
+            # WATCH와 EXEC 사이에 다른 클라이언트가 세션을 바꿈
+            fake.set("test-session:U1", json.dumps({"mode": "level_test", "current_tag_index": 3}))
+        session["user_ox_answers"] = {"0": "O"}
+
+    session = await store.update("U1", mutate)
+
+    assert len(attempts) == 2
+    assert attempts[1]["current_tag_index"] == 3
+    assert session == {"mode": "level_test", "current_tag_index": 3, "user_ox_answers": {"0": "O"}}
+    assert await store.get("U1") == session
+    assert fake.commands["EXEC"] == 2
+
+
+async def test_redis_update_gives_up_after_max_attempts(redis_store):
+    store, fake = redis_store
+
+    def mutate(session):
+        fake.set("test-session:U2", json.dumps({"mode": "learning"}))
+
+    with pytest.raises(RespError):
+        await store.update("U2", mutate, max_attempts=3)
+    assert fake.commands["EXEC"] == 3
+
+
+async def test_redis_concurrent_updates_do_not_lose_writes(redis_store):
+    store, _ = redis_store
+    await store.set("U3", {"answered": 0})
+
+    def increment(session):
+        session["answered"] += 1
+
+    await asyncio.gather(*(store.update("U3", increment) for _ in range(20)))
+    assert (await store.get("U3"))["answered"] == 20
+
+
+def level_test_session(i):
+    questions = [{"type": "OX", "question": f"{i}번 사용자 {n}번 문제: TCP는 연결 지향이다.", "answer": "O"} for n in range(5)]
+    return {"mode": "level_test", "topic": "TCP", "test_questions": questions}
+
+
+async def test_memory_store_evicts_least_recent_sessions_past_byte_budget():
+    size = UserSession.from_dict(level_test_session(0)).approx_size()
+    store = MemorySessionStore(max_bytes=size * 3)
+    expired = []
+    store.on_expire(expired.append)
+
+    for i in range(3):
+        await store.set(f"U{i}", level_test_session(i))
+    # 읽은 세션은 최근 활동으로 보므로 U1이 가장 오래된 세션이 됨
+    await store.get("U0")
+    await store.set("U3", level_test_session(3))
+
+    assert expired == ["U1"]
+    assert await store.get("U1") == {}
+    assert (await store.get("U0"))["mode"] == "level_test"
+    stats = store.get_stats()
+    assert stats["evicted"] == 1
+    assert stats["sessions"] == 3
+    assert stats["bytes"] <= store.max_bytes
+
+    # 같은 사용자를 다시 저장하거나 지우면 크기 합도 함께 바뀜
+    await store.set("U0", {"mode": "learning"})
+    await store.delete("U2")
+    assert store.get_stats()["bytes"] == sum(session.approx_size() for session in store._sessions.values())
+
+
+async def test_memory_store_keeps_newest_session_larger_than_byte_budget():
+    store = MemorySessionStore(max_bytes=100)
+    await store.set("U1", level_test_session(1))
+    await store.set("U2", level_test_session(2))
+
+    assert await store.get("U1") == {}
+    assert (await store.get("U2"))["mode"] == "level_test"
@@ -0,0 +1,46 @@
+import asyncio
+import time
+
+from app.api.slack.app import slack_app
+from app.services.job_runner import job_runner
+from app.services.session_store import session_store
+
+from tests.conftest import message_event, slack_request
+
+# LLM 응답이 이만큼 걸려도 Slack에는 바로 응답해야 함
+LLM_DELAY = 10.0
+ACK_BUDGET = 0.1
+
+
+async def test_message_ack_does_not_wait_for_llm(slack_api, fake_llm):
+    fake_llm.delay = LLM_DELAY
+    await session_store.set("U_ACK", {"mode": "self_assessment", "topic": "네트워크"})
+
+    started_at = time.perf_counter()
+    response = await slack_app.async_dispatch(slack_request(message_event("U_ACK", "초급", "Ev_ACK_1")))
+    elapsed = time.perf_counter() - started_at
+
+    assert response.status == 200
+    assert elapsed < ACK_BUDGET
+    # LLM 호출은 백그라운드에서 계속 진행 중
+    await asyncio.sleep(0.05)
+    assert job_runner.get_stats()["running"] == 1
+    assert fake_llm.calls["tag_extraction"] == 1
+
+    await job_runner.shutdown(grace_period=0)
+
+
+async def test_message_subtypes_are_ignored(slack_api):
+    submitted = job_runner.stats["submitted"]
+
+    for index, extra in enumerate([
+        {"subtype": "message_changed"},
+        {"subtype": "message_deleted"},
+        {"subtype": "bot_message", "bot_id": "B2"},
+        {"subtype": "file_share"},
+        {"user": None}
+    ]):
+        response = await slack_app.async_dispatch(slack_request(message_event("U_SUB", "공부시작", f"Ev_SUB_{index}", extra)))
+        assert response.status == 200
+
+    assert job_runner.stats["submitted"] == submitted
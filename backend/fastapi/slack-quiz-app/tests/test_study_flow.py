@@ -0,0 +1,60 @@
+import time
+
+from app.services import study_mode
+
+TOPIC = "네트워크"
+
+
+async def run_full_flow(user):
+    await study_mode.run_network_learning_fsm(TOPIC, user=user)
+    steps, state = await study_mode.process_level_test_answers(
+        TOPIC, [{"user_answer": "O", "correct_answer": "O"}, {"user_answer": "X", "correct_answer": "O"}], user=user
+    )
+    await study_mode.study_advanced_topic(TOPIC, 1, state["user_level"], user=user)
+    await study_mode.start_interview_session(TOPIC, user_level=state["user_level"], user=user)
+    for index in range(1, 4):
+        await study_mode.get_next_interview_question(TOPIC, index, state["user_level"], user=user)
+    return steps, state
+
+
+async def test_full_flow_calls_each_llm_template_once(fake_llm):
+    steps, state = await run_full_flow("U_FLOW")
+
+    assert state["user_level"] == "intermediate"
+    assert any("세부 주제 1" in step for step in steps)
+    assert fake_llm.calls == {
+        "tag_extraction": 1,
+        "concept_explanation": 1,
+        "subtopics": 1,
+        "advanced_topic": 1,
+        "interview_questions": 1
+    }
+
+
+async def test_grading_does_not_generate_level_test(fake_llm):
+    await study_mode.process_level_test_answers(TOPIC, [{"user_answer": "O", "correct_answer": "O"}], user="U_GRADE")
+    await study_mode.process_level_test_answers(TOPIC, [{"user_answer": "X", "correct_answer": "O"}], user="U_GRADE")
+
+    assert "level_test" not in fake_llm.calls
+    assert fake_llm.calls["subtopics"] == 1
+
+
+async def test_prepare_next_steps_branches_and_is_reused(fake_llm):
+    fake_llm.delay = 0.2
+    started_at = time.perf_counter()
+    state = await study_mode.prepare_next_steps(TOPIC, "advanced", user="U_PREP")
+    elapsed = time.perf_counter() - started_at
+
+    # 세부 주제와 면접 질문을 동시에 생성
+    assert state["subtopics"] and state["interview_questions"]
+    assert elapsed < 0.35
+
+    # 면접과 심화 학습은 미리 만든 결과물을 사용
+    steps = await study_mode.start_interview_session(TOPIC, user_level="advanced", user="U_PREP")
+    await study_mode.study_advanced_topic(TOPIC, 0, "advanced", user="U_PREP")
+    assert "면접 질문 0" in "\n".join(steps)
+    assert fake_llm.calls == {"subtopics": 1, "interview_questions": 1, "advanced_topic": 1}
+
+    # 같은 수준으로 다시 준비해도 LLM을 호출하지 않음
+    await study_mode.prepare_next_steps(TOPIC, "advanced", user="U_PREP")
+    assert fake_llm.calls["subtopics"] == 1 and fake_llm.calls["interview_questions"] == 1